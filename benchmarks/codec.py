@@ -0,0 +1,104 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Compares the standard json module with the fast encoder used by
+# overlord.codec (if installed) using payloads similar to the ones handled
+# by the API server, the cache and the queue.
+#
+#   python benchmarks/codec.py --number 1000 --jails 300
+
+import timeit
+
+import click
+
+import overlord.codec
+
+def make_jails(count):
+    return {
+        "jails" : [f"jail{i}" for i in range(count)]
+    }
+
+def make_stats(count):
+    return {
+        f"jail{i}" : {
+            "cputime" : i,
+            "datasize" : i * 4096,
+            "memoryuse" : i * 1048576,
+            "maxproc" : 100,
+            "pcpu" : i % 100
+        } for i in range(count)
+    }
+
+def make_job(size):
+    project_file = "\n".join(f"  service{i}:\n    makejail: gh+AppJail-makejails/nginx" for i in range(size))
+
+    return {
+        "type" : "project",
+        "job_id" : 1,
+        "message" : {
+            "name" : "project",
+            "director_file" : f"options:\n  - virtualnet: ':<random> default'\nservices:\n{project_file}\n",
+            "environment" : { f"VAR{i}" : str(i) for i in range(size) },
+            "restart" : False,
+            "reserve_port" : {}
+        }
+    }
+
+def bench(name, number, encode, decode, data):
+    encoded = encode(data)
+
+    encode_time = timeit.timeit(lambda: encode(data), number=number)
+    decode_time = timeit.timeit(lambda: decode(encoded), number=number)
+
+    print(f"  {name}: encode={encode_time * 1000000 / number:.2f}us decode={decode_time * 1000000 / number:.2f}us size={len(encoded)}")
+
+@click.command()
+@click.option("--number", default=1000, type=int)
+@click.option("--jails", default=300, type=int)
+def main(number, jails):
+    payloads = {
+        "jails" : make_jails(jails),
+        "stats" : make_stats(jails),
+        "job" : make_job(jails)
+    }
+
+    backend = overlord.codec.get_backend()
+
+    print("backend:", backend)
+
+    for name, data in payloads.items():
+        print(f"{name}:")
+
+        bench("json", number, overlord.codec._encode, overlord.codec._decode, data)
+
+        if backend != "json":
+            bench(backend, number, overlord.codec.encode, overlord.codec.decode, data)
+
+if __name__ == "__main__":
+    main()
@@ -90,12 +90,17 @@ def projects(data):
 async def _async_vm(data):
     try:
         job_id = data.get("job_id")
+        unique_id = data.get("unique_id")
         message = data.get("message")
         vm = message.get("name")
 
         if ignore_project(vm):
             return
 
+        if is_processed(overlord.cache.get_project_status_up(vm), unique_id):
+            logger.debug("(vm:%s, job:%s, unique-id:%s) job already processed", vm, job_id, unique_id)
+            return
+
         try:
             makejailFromMetadata = message.get("makejailFromMetadata")
 
@@ -130,7 +135,7 @@ async def _async_vm(data):
                 "poweroff" : message.get("poweroff")
             }
 
-            await create_vm(job_id, **profile)
+            await create_vm(job_id, unique_id, **profile)
 
         except Exception as err:
             error = overlord.util.get_error(err)
@@ -146,7 +151,8 @@ async def _async_vm(data):
                     "message" : error_message
                 },
                 "last_update" : time.time(),
-                "job_id" : job_id
+                "job_id" : job_id,
+                "unique_id" : unique_id
             })
 
     except Exception as err:
@@ -159,7 +165,7 @@ async def _async_vm(data):
         sys.exit(EX_SOFTWARE)
 
 async def create_vm(
-    job_id, *,
+    job_id, unique_id, *,
     name,
     makejail,
     cloud_init,
@@ -228,7 +234,8 @@ async def create_vm(
     overlord.cache.save_project_status_up(vm, {
         "operation" : "RUNNING",
         "last_update" : time.time(),
-        "job_id" : job_id
+        "job_id" : job_id,
+        "unique_id" : unique_id
     })
 
     if director_file is None or overwrite:
@@ -310,6 +317,7 @@ async def create_vm(
                 "output" : result,
                 "last_update" : time.time(),
                 "job_id" : job_id,
+                "unique_id" : unique_id,
                 "restarted" : restarted
             })
 
@@ -324,7 +332,8 @@ async def create_vm(
             overlord.cache.save_project_status_up(vm, {
                 "operation" : "NOOP",
                 "last_update" : time.time(),
-                "job_id" : job_id
+                "job_id" : job_id,
+                "unique_id" : unique_id
             })
 
         if jail_path is None:
@@ -337,7 +346,8 @@ async def create_vm(
         overlord.cache.save_vm_status(vm, {
             "operation" : "RUNNING",
             "last_update" : time.time(),
-            "job_id" : job_id
+            "job_id" : job_id,
+            "unique_id" : unique_id
         })
 
         if len(cloud_init) > 0:
@@ -356,7 +366,8 @@ async def create_vm(
                     "operation" : "FAILED",
                     "output" : result,
                     "last_update" : time.time(),
-                    "job_id" : job_id
+                    "job_id" : job_id,
+                    "unique_id" : unique_id
                 })
 
                 return
@@ -390,7 +401,8 @@ async def create_vm(
                     "operation" : "FAILED",
                     "output" : result,
                     "last_update" : time.time(),
-                    "job_id" : job_id
+                    "job_id" : job_id,
+                    "unique_id" : unique_id
                 })
 
                 return
@@ -524,12 +536,14 @@ async def create_vm(
             "operation" : operation_status,
             "output" : result,
             "last_update" : time.time(),
-            "job_id" : job_id
+            "job_id" : job_id,
+            "unique_id" : unique_id
         })
 
 async def _async_projects(data):
     try:
         job_id = data.get("job_id")
+        unique_id = data.get("unique_id")
         message = data.get("message")
         project = message.get("name")
         reserve_port = message.get("reserve_port")
@@ -545,12 +559,17 @@ async def _async_projects(data):
             if ignore_project(project):
                 return
 
+            if is_processed(overlord.cache.get_project_status_up(project), unique_id):
+                logger.debug("(project:%s, job:%s, unique-id:%s) job already processed", project, job_id, unique_id)
+                return
+
             logger.debug("(project:%s) processing ...", project)
 
             overlord.cache.save_project_status_up(project, {
                 "operation" : "RUNNING",
                 "last_update" : time.time(),
-                "job_id" : job_id
+                "job_id" : job_id,
+                "unique_id" : unique_id
             })
 
             if reserve_port is not None:
@@ -569,6 +588,7 @@ async def _async_projects(data):
                             "operation" : "FAILED",
                             "last_update" : time.time(),
                             "job_id" : job_id,
+                            "unique_id" : unique_id,
                             "exception" : {
                                 "type" : error_type,
                                 "message" : error_message
@@ -583,6 +603,7 @@ async def _async_projects(data):
                             "operation" : "FAILED",
                             "last_update" : time.time(),
                             "job_id" : job_id,
+                            "unique_id" : unique_id,
                             "message" : f"no free port has been found for {interface} ({network})"
                         })
 
@@ -645,6 +666,7 @@ async def _async_projects(data):
                     "output" : result,
                     "last_update" : time.time(),
                     "job_id" : job_id,
+                    "unique_id" : unique_id,
                     "restarted" : restarted,
                     "labels" : special_labels_response
                 })
@@ -653,6 +675,10 @@ async def _async_projects(data):
             if ignore_project(project):
                 return
 
+            if is_processed(overlord.cache.get_project_status_down(project), unique_id):
+                logger.debug("(project:%s, job:%s, unique-id:%s) job already processed", project, job_id, unique_id)
+                return
+
             force = message.get("force", False)
 
             logger.debug("(project:%s, force:%s) destroying project ...", project, force)
@@ -663,6 +689,7 @@ async def _async_projects(data):
                 "operation" : "RUNNING",
                 "last_update" : time.time(),
                 "job_id" : job_id,
+                "unique_id" : unique_id,
                 "labels" : special_labels_response
             })
 
@@ -697,6 +724,7 @@ async def _async_projects(data):
                 "output" : result,
                 "last_update" : time.time(),
                 "job_id" : job_id,
+                "unique_id" : unique_id,
                 "labels" : special_labels_response
             })
 
@@ -739,6 +767,16 @@ def poweroff_if_vm(project):
 
     overlord.vm.poweroff(jail, jail)
 
+def is_processed(status, unique_id):
+    # Jobs are delivered at least once, so the same job may be seen again if a previous
+    # run has finished but its acknowledgment has been lost. The job ID cannot be used
+    # because beanstalkd starts counting again from 1 when it runs without a binlog.
+    if unique_id is None or status.get("unique_id") != unique_id:
+        return False
+
+    # A failed run is not final: watch-commands releases the job to retry it.
+    return status.get("operation") in ("COMPLETED", "INCOMPLETED", "NOOP")
+
 def ignore_project(project):
     if not overlord.director.check(project):
         return False
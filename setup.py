@@ -51,6 +51,9 @@ setup(
         "httpx-retries",
         "sysctl"
     ],
+    extras_require={
+        "fast-json" : ["orjson"]
+    },
     entry_points={
         "console_scripts" : [
             "overlord = overlord.__init__:cli"
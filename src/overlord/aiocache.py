@@ -0,0 +1,864 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025-2026, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import collections
+import logging
+import socket
+import time
+
+from pymemcache.client.base import normalize_server_spec
+from pymemcache.client.rendezvous import RendezvousHash
+
+import overlord.cache
+import overlord.codec
+import overlord.config
+import overlord.exceptions
+import overlord.util
+
+CLIENT = None
+GET_MANY_CHUNK_SIZE = 100
+# Timestamps written by update_refresh_for(), to write them at most once per interval.
+REFRESH = {}
+REFRESH_INTERVAL = 15
+# Local copy of the lists of jails and projects to check if an entity exists.
+MEMBERSHIP = {}
+MEMBERSHIP_TTL = 2
+# section: (keyword used by the cache, entity to refresh, default value)
+JAIL_DETAILS = {
+    "stats" : ("stats", "jail_stats", {}),
+    "info" : ("info", "jail_info", {}),
+    "cpuset" : ("cpuset", "cpuset", None),
+    "devfs" : ("devfs", "devfs", {}),
+    "expose" : ("expose", "expose", {}),
+    "healthcheck" : ("healthcheck", "healthcheck", {}),
+    "limits" : ("limits", "limits", {}),
+    "fstab" : ("fstab", "fstab", {}),
+    "labels" : ("label", "label", {}),
+    "nat" : ("nat", "nat", {}),
+    "volumes" : ("volume", "volume", {})
+}
+COUNTERS = {
+    "opened" : 0,
+    "reused" : 0
+}
+
+logger = logging.getLogger(__name__)
+
+# The same node names as pymemcache.HashClient, so a key is stored in the same
+# server regardless of which client (sync or async) has written it.
+def _make_node_key(server):
+    if isinstance(server, (list, tuple)) and len(server) == 2:
+        return "%s:%s" % server
+
+    return server
+
+def _check_error(line):
+    if line == b"ERROR" \
+            or line.startswith(b"CLIENT_ERROR") \
+            or line.startswith(b"SERVER_ERROR"):
+        raise overlord.exceptions.CacheError(line.decode(errors="replace"))
+
+async def _read_line(reader):
+    line = await reader.readuntil(b"\r\n")
+
+    return line[:-2]
+
+async def _parse_retrieval(reader):
+    values = {}
+
+    while True:
+        line = await _read_line(reader)
+
+        if line == b"END":
+            return values
+
+        _check_error(line)
+
+        # VALUE <key> <flags> <bytes> [<cas unique>]
+        (_, key, _, length) = line.split(b" ")[:4]
+
+        data = await reader.readexactly(int(length) + 2)
+
+        values[key.decode()] = data[:-2]
+
+async def _parse_storage(reader):
+    line = await _read_line(reader)
+
+    _check_error(line)
+
+    return line == b"STORED"
+
+async def _parse_deletion(reader):
+    line = await _read_line(reader)
+
+    _check_error(line)
+
+    return line == b"DELETED"
+
+async def _parse_incr(reader):
+    line = await _read_line(reader)
+
+    _check_error(line)
+
+    if line == b"NOT_FOUND":
+        return
+
+    return int(line)
+
+async def _parse_touch(reader):
+    line = await _read_line(reader)
+
+    _check_error(line)
+
+    return line == b"TOUCHED"
+
+class MemcacheConnection:
+    def __init__(self, server):
+        self.server = server
+        self.writer = None
+        self.pending = None
+        self.reader_task = None
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        if self.writer is not None:
+            COUNTERS["reused"] += 1
+            return
+
+        async with self.lock:
+            if self.writer is not None:
+                COUNTERS["reused"] += 1
+                return
+
+            if isinstance(self.server, tuple):
+                (host, port) = self.server
+
+                connection = asyncio.open_connection(host, port)
+
+            else:
+                connection = asyncio.open_unix_connection(self.server)
+
+            (reader, writer) = await asyncio.wait_for(connection, overlord.config.get_memcache_connect_timeout())
+
+            if isinstance(self.server, tuple) and overlord.config.get_memcache_no_delay():
+                sock = writer.get_extra_info("socket")
+
+                if sock is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            pending = collections.deque()
+            ready = asyncio.Event()
+
+            self.writer = writer
+            self.pending = (pending, ready)
+            self.reader_task = asyncio.create_task(self._read_responses(reader, pending, ready))
+
+            COUNTERS["opened"] += 1
+
+            logger.debug("(server:%s, opened:%d, reused:%d) connection established",
+                         _make_node_key(self.server), COUNTERS["opened"], COUNTERS["reused"])
+
+    async def execute(self, command, parser):
+        await self.connect()
+
+        (pending, ready) = self.pending
+
+        future = asyncio.get_running_loop().create_future()
+
+        # Commands are written in the same order in which their responses are read, so
+        # more than one command can be in flight on the same connection (pipelining).
+        pending.append((future, parser))
+        ready.set()
+
+        writer = self.writer
+        writer.write(command)
+
+        try:
+            await writer.drain()
+
+            return await asyncio.wait_for(future, overlord.config.get_memcache_timeout())
+
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            # The state of the stream is unknown, so nothing that comes after is reliable.
+            self.close(writer)
+
+            raise
+
+    async def _read_responses(self, reader, pending, ready):
+        try:
+            while True:
+                if len(pending) == 0:
+                    ready.clear()
+
+                    await ready.wait()
+
+                    continue
+
+                (future, parser) = pending[0]
+
+                try:
+                    result = await parser(reader)
+
+                except overlord.exceptions.CacheError as err:
+                    # The whole response has been consumed, the connection is still usable.
+                    pending.popleft()
+
+                    if not future.done():
+                        future.set_exception(err)
+
+                    continue
+
+                pending.popleft()
+
+                if not future.done():
+                    future.set_result(result)
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.warning("(server:%s, exception:%s) connection lost: %s",
+                           _make_node_key(self.server), error_type, error_message)
+
+            self.close()
+
+    def close(self, writer=None):
+        if writer is not None and writer is not self.writer:
+            # Already closed by another coroutine.
+            return
+
+        if self.writer is None:
+            return
+
+        self.writer.close()
+
+        if self.reader_task is not asyncio.current_task():
+            self.reader_task.cancel()
+
+        (pending, _) = self.pending
+
+        self.writer = None
+        self.pending = None
+        self.reader_task = None
+
+        while len(pending) > 0:
+            (future, _) = pending.popleft()
+
+            if not future.done():
+                future.set_exception(ConnectionError(f"Connection to {_make_node_key(self.server)} has been closed."))
+
+class AsyncMemcacheClient:
+    def __init__(self, servers):
+        self.hasher = RendezvousHash()
+        self.connections = {}
+
+        for server in servers:
+            server = normalize_server_spec(server)
+
+            node = _make_node_key(server)
+
+            self.hasher.add_node(node)
+            self.connections[node] = MemcacheConnection(server)
+
+    def _get_connection(self, key):
+        node = self.hasher.get_node(key)
+
+        return self.connections[node]
+
+    async def get(self, key):
+        conn = self._get_connection(key)
+
+        values = await conn.execute(b"get %s\r\n" % key.encode(), _parse_retrieval)
+
+        return values.get(key)
+
+    async def get_many(self, keys):
+        batches = collections.defaultdict(list)
+
+        for key in keys:
+            batches[self.hasher.get_node(key)].append(key)
+
+        requests = []
+
+        for node, keys in batches.items():
+            conn = self.connections[node]
+
+            # Keep each command line short, the batches are pipelined anyway.
+            for index in range(0, len(keys), GET_MANY_CHUNK_SIZE):
+                chunk = keys[index:index + GET_MANY_CHUNK_SIZE]
+
+                command = b"get %s\r\n" % b" ".join([key.encode() for key in chunk])
+
+                requests.append(conn.execute(command, _parse_retrieval))
+
+        values = {}
+
+        for result in await asyncio.gather(*requests):
+            values.update(result)
+
+        return values
+
+    async def set(self, key, value, expire=0):
+        if isinstance(value, str):
+            value = value.encode()
+
+        conn = self._get_connection(key)
+
+        command = b"set %s 0 %d %d\r\n%s\r\n" % (key.encode(), expire, len(value), value)
+
+        return await conn.execute(command, _parse_storage)
+
+    async def add(self, key, value, expire=0):
+        if isinstance(value, str):
+            value = value.encode()
+
+        conn = self._get_connection(key)
+
+        command = b"add %s 0 %d %d\r\n%s\r\n" % (key.encode(), expire, len(value), value)
+
+        return await conn.execute(command, _parse_storage)
+
+    async def incr(self, key, delta=1):
+        conn = self._get_connection(key)
+
+        return await conn.execute(b"incr %s %d\r\n" % (key.encode(), delta), _parse_incr)
+
+    async def touch(self, key, expire=0):
+        conn = self._get_connection(key)
+
+        return await conn.execute(b"touch %s %d\r\n" % (key.encode(), expire), _parse_touch)
+
+    async def delete(self, key):
+        conn = self._get_connection(key)
+
+        return await conn.execute(b"delete %s\r\n" % key.encode(), _parse_deletion)
+
+    def close(self):
+        for conn in self.connections.values():
+            conn.close()
+
+def get_counters():
+    return dict(COUNTERS)
+
+def connect():
+    global CLIENT
+
+    if CLIENT is not None:
+        return CLIENT
+
+    memcache_connections = overlord.config.get_memcache_connections()
+
+    CLIENT = AsyncMemcacheClient(memcache_connections)
+
+    return CLIENT
+
+async def save(key, value, *args, **kwargs):
+    while True:
+        try:
+            return await _save(key, value, *args, **kwargs)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _save(key, value, *args, **kwargs):
+    key = overlord.cache._get_key(key)
+
+    conn = connect()
+
+    return await conn.set(key, overlord.codec.encode(value), *args, **kwargs)
+
+async def get(key):
+    while True:
+        try:
+            return await _get(key)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _get(key):
+    data = await _get_raw(key)
+
+    if data is None:
+        return
+
+    return overlord.codec.decode(data)
+
+async def get_raw(key):
+    while True:
+        try:
+            return await _get_raw(key)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _get_raw(key):
+    key = overlord.cache._get_key(key)
+
+    conn = connect()
+
+    return await conn.get(key)
+
+async def get_many(keys):
+    while True:
+        try:
+            return await _get_many(keys)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _get_many(keys):
+    data = await _get_many_raw(keys)
+
+    return { key : overlord.codec.decode(value) for key, value in data.items() }
+
+async def get_many_raw(keys):
+    while True:
+        try:
+            return await _get_many_raw(keys)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _get_many_raw(keys):
+    keys = { overlord.cache._get_key(key) : key for key in keys }
+
+    if len(keys) == 0:
+        return {}
+
+    conn = connect()
+
+    data = await conn.get_many(list(keys))
+
+    return { keys[key] : value for key, value in data.items() }
+
+def decode(data, default=None):
+    if data is None:
+        return default
+
+    return overlord.codec.decode(data)
+
+async def delete(key):
+    while True:
+        try:
+            return await _delete(key)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _delete(key):
+    key = overlord.cache._get_key(key)
+
+    conn = connect()
+
+    return await conn.delete(key)
+
+async def incr(key, delta=1, expire=0):
+    while True:
+        try:
+            return await _incr(key, delta, expire)
+
+        except (overlord.exceptions.CacheError, asyncio.TimeoutError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            await asyncio.sleep(overlord.util.get_skew())
+
+async def _incr(key, delta=1, expire=0):
+    key = overlord.cache._get_key(key)
+
+    conn = connect()
+
+    # Only created when it doesn't exist, so concurrent increments are never lost.
+    await conn.add(key, "0", expire)
+
+    value = await conn.incr(key, delta)
+
+    if value is None:
+        # Expired right after being created.
+        return delta
+
+    # incr doesn't change the expiration time.
+    await conn.touch(key, expire)
+
+    return value
+
+async def get_jails():
+    data = await get("overlord_jails")
+
+    if data is None:
+        return []
+
+    return data
+
+async def get_jail_stats(jail):
+    data = await get(f"overlord_jail_stats_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jails_stats(jails):
+    data = await get_many([f"overlord_jail_stats_{jail}" for jail in jails])
+
+    return { jail : data.get(f"overlord_jail_stats_{jail}", {}) for jail in jails }
+
+async def get_jails_raw():
+    return await get_raw("overlord_jails")
+
+async def get_jails_stats_raw(jails):
+    data = await get_many_raw([f"overlord_jail_stats_{jail}" for jail in jails])
+
+    return { jail : data.get(f"overlord_jail_stats_{jail}") for jail in jails }
+
+async def get_jail_info_raw(jail):
+    return await get_raw(f"overlord_jail_info_{jail}")
+
+async def get_jails_details_raw(jails, sections):
+    keys = {}
+
+    for jail in jails:
+        for section in sections:
+            (keyword, _, _) = JAIL_DETAILS[section]
+
+            keys[(jail, section)] = f"overlord_jail_{keyword}_{jail}"
+
+    data = await get_many_raw(list(keys.values()))
+
+    return { jail_section : data.get(key) for jail_section, key in keys.items() }
+
+def decode_jails_details(details):
+    jails = {}
+
+    for (jail, section), value in details.items():
+        (_, _, default) = JAIL_DETAILS[section]
+
+        jails.setdefault(jail, {})[section] = decode(value, default)
+
+    return jails
+
+async def get_prerendered(name, compressed=False):
+    if compressed:
+        data = await get_raw(f"overlord_body_gzip_{name}")
+
+    else:
+        data = await get_raw(f"overlord_body_{name}")
+
+    if data is None:
+        return
+
+    (etag, _, body) = data.partition(b"\n")
+
+    return (etag.decode(), body)
+
+async def get_jail_info(jail):
+    data = await get(f"overlord_jail_info_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_cpuset(jail):
+    data = await get(f"overlord_jail_cpuset_{jail}")
+
+    if data is None:
+        return
+
+    return data
+
+async def get_jail_devfs(jail):
+    data = await get(f"overlord_jail_devfs_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_expose(jail):
+    data = await get(f"overlord_jail_expose_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_healthcheck(jail):
+    data = await get(f"overlord_jail_healthcheck_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_limits(jail):
+    data = await get(f"overlord_jail_limits_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_fstab(jail):
+    data = await get(f"overlord_jail_fstab_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_label(jail):
+    data = await get(f"overlord_jail_label_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_nat(jail):
+    data = await get(f"overlord_jail_nat_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_jail_volume(jail):
+    data = await get(f"overlord_jail_volume_{jail}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_projects():
+    data = await get("overlord_projects")
+
+    if data is None:
+        return []
+
+    return data
+
+async def get_project_info(project):
+    data = await get(f"overlord_project_info_{project}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_project_info_raw(project):
+    keys = {
+        "info" : f"overlord_project_info_{project}",
+        "up" : f"overlord_project_status_up_{project}",
+        "down" : f"overlord_project_status_down_{project}"
+    }
+
+    data = await get_many_raw(list(keys.values()))
+
+    return { name : data.get(key) for name, key in keys.items() }
+
+async def get_project_status_up(project):
+    data = await get(f"overlord_project_status_up_{project}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_project_status_down(project):
+    data = await get(f"overlord_project_status_down_{project}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_vm_status(vm):
+    data = await get(f"overlord_vm_status_{vm}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_project_status_autoscale(project):
+    data = await get(f"overlord_project_status_autoscale_{project}")
+
+    if data is None:
+        return {}
+
+    return data
+
+async def get_healthy_chains():
+    data = await get("overlord_healthy_chains")
+
+    if data is None:
+        return []
+
+    return data
+
+async def get_members(key):
+    current_time = time.monotonic()
+
+    cached = MEMBERSHIP.get(key)
+
+    if cached is not None:
+        (expire, members) = cached
+
+        if current_time < expire:
+            return members
+
+    data = await get(key)
+
+    if data is None:
+        members = frozenset()
+
+    else:
+        members = frozenset(data)
+
+    MEMBERSHIP[key] = (current_time + MEMBERSHIP_TTL, members)
+
+    return members
+
+async def check_jail(jail):
+    jails = await get_members("overlord_jails")
+
+    return jail in jails
+
+async def check_project(project):
+    projects = await get_members("overlord_projects")
+
+    return project in projects
+
+async def get_autodisable_counter(chain):
+    keys = (f"overlord_autodisable_{chain}", f"overlord_autodisable_failures_{chain}")
+
+    data = await get_many(keys)
+
+    last_failure = data.get(keys[0])
+    failures = data.get(keys[1])
+
+    if last_failure is None or failures is None:
+        return
+
+    return {
+        "failures" : failures,
+        "last-failure" : last_failure
+    }
+
+async def incr_autodisable_counter(chain, last_failure, expire=0):
+    (failures, _) = await asyncio.gather(
+        incr(f"overlord_autodisable_failures_{chain}", expire=expire),
+        save(f"overlord_autodisable_{chain}", last_failure, expire=expire)
+    )
+
+    return failures
+
+async def delete_autodisable_counter(chain):
+    await asyncio.gather(
+        delete(f"overlord_autodisable_{chain}"),
+        delete(f"overlord_autodisable_failures_{chain}")
+    )
+
+async def get_events_seq():
+    data = await get("overlord_events_seq")
+
+    if data is None:
+        return 0
+
+    return data
+
+async def get_events(first, last):
+    ids = range(first, last + 1)
+
+    data = await get_many([f"overlord_event_{id}" for id in ids])
+
+    # Events that have expired or have not been written yet are missing.
+    return [data[f"overlord_event_{id}"] for id in ids if f"overlord_event_{id}" in data]
+
+async def update_refresh_for(entity):
+    current_time = time.time()
+
+    # The pollers only need to know that the entity is still being requested within the
+    # poll window, not every time it is requested.
+    interval = min(REFRESH_INTERVAL, overlord.config.get_polling_adaptive_poll_window() / 2)
+
+    last_update = REFRESH.get(entity)
+
+    if last_update is not None and (current_time - last_update) < interval:
+        return
+
+    REFRESH[entity] = current_time
+
+    return await save(f"overlord_timestamp_{entity}", current_time)
@@ -27,23 +27,46 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json
+import gzip
+import hashlib
+import socket
 import time
 import logging
 
 import pymemcache
 
+import overlord.codec
 import overlord.config
 import overlord.util
 
 CLIENT = None
+LAST_HEALTH_CHECK = 0
+LAST_EVENTS = {}
+COUNTERS = {
+    "opened" : 0,
+    "reused" : 0
+}
 
 logger = logging.getLogger(__name__)
 
+# pymemcache creates its sockets through this module, which is the only reliable
+# place to know when a new connection is made instead of reusing one from the pool.
+class _SocketModule:
+    def __getattr__(self, name):
+        return getattr(socket, name)
+
+    def socket(self, *args, **kwargs):
+        COUNTERS["opened"] += 1
+
+        logger.debug("(opened:%d, reused:%d) opening a new connection to memcached",
+                     COUNTERS["opened"], COUNTERS["reused"])
+
+        return socket.socket(*args, **kwargs)
+
 def connect():
-    global CLIENT
+    global CLIENT, LAST_HEALTH_CHECK
 
-    if CLIENT is not None:
+    if CLIENT is not None and check_health():
         return CLIENT
 
     settings = {
@@ -55,6 +78,7 @@ def connect():
         "connect_timeout" : overlord.config.get_memcache_connect_timeout(),
         "timeout" : overlord.config.get_memcache_timeout(),
         "no_delay" : overlord.config.get_memcache_no_delay(),
+        "socket_module" : _SocketModule(),
         "use_pooling" : True
     }
 
@@ -62,8 +86,71 @@ def connect():
 
     CLIENT = pymemcache.HashClient(memcache_connections, **settings)
 
+    LAST_HEALTH_CHECK = time.time()
+
     return CLIENT
 
+def disconnect():
+    global CLIENT
+
+    if CLIENT is None:
+        return
+
+    client = CLIENT
+
+    CLIENT = None
+
+    # Unlike quit(), this does not open a new connection to send a command.
+    client.close()
+
+def check_health():
+    global LAST_HEALTH_CHECK
+
+    interval = overlord.config.get_memcache_health_check_interval()
+
+    if interval == 0:
+        return True
+
+    current_time = time.time()
+
+    if (current_time - LAST_HEALTH_CHECK) < interval:
+        return True
+
+    LAST_HEALTH_CHECK = current_time
+
+    for server, client in CLIENT.clients.items():
+        try:
+            client.version()
+
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, OSError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.warning("(server:%s, exception:%s) health check failed, reconnecting: %s",
+                           server, error_type, error_message)
+
+            disconnect()
+
+            return False
+
+    return True
+
+def get_counters():
+    return dict(COUNTERS)
+
+def _run(command, *args, **kwargs):
+    conn = connect()
+
+    opened = COUNTERS["opened"]
+
+    result = getattr(conn, command)(*args, **kwargs)
+
+    if COUNTERS["opened"] == opened:
+        COUNTERS["reused"] += 1
+
+    return result
+
 def _get_key(key):
     id = overlord.util.get_serverid()
 
@@ -84,18 +171,14 @@ def save(key, value, *args, **kwargs):
 
             logger.exception("(exception:%s) %s:", error_type, error_message)
 
+            disconnect()
+
             time.sleep(overlord.util.get_skew())
 
 def _save(key, value, *args, **kwargs):
     key = _get_key(key)
 
-    conn = connect()
-
-    result = conn.set(key, json.dumps(value), *args, **kwargs)
-
-    conn.quit()
-
-    return result
+    return _run("set", key, overlord.codec.encode(value), *args, **kwargs)
 
 def get(key):
     while True:
@@ -109,23 +192,19 @@ def get(key):
 
             logger.exception("(exception:%s) %s:", error_type, error_message)
 
+            disconnect()
+
             time.sleep(overlord.util.get_skew())
 
 def _get(key):
     key = _get_key(key)
 
-    conn = connect()
-
-    data = conn.get(key)
+    data = _run("get", key)
 
     if data is None:
-        result = None
-    else:
-        result = json.loads(data)
-
-    conn.quit()
+        return
 
-    return result
+    return overlord.codec.decode(data)
 
 def delete(key):
     while True:
@@ -139,24 +218,143 @@ def delete(key):
 
             logger.exception("(exception:%s) %s:", error_type, error_message)
 
+            disconnect()
+
             time.sleep(overlord.util.get_skew())
 
 def _delete(key):
     key = _get_key(key)
 
-    conn = connect()
+    return _run("delete", key)
 
-    result = conn.delete(key)
+def save_many(values, *args, **kwargs):
+    while True:
+        try:
+            return _save_many(values, *args, **kwargs)
 
-    conn.quit()
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, ConnectionRefusedError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
 
-    return result
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            disconnect()
+
+            time.sleep(overlord.util.get_skew())
+
+def _save_many(values, *args, **kwargs):
+    if len(values) == 0:
+        return []
+
+    keys = {}
+    data = {}
+
+    for key, value in values.items():
+        new_key = _get_key(key)
+
+        keys[new_key] = key
+        data[new_key] = overlord.codec.encode(value)
+
+    # Keys are grouped by server, so this is a single round trip per server.
+    failed = _run("set_many", data, *args, **kwargs)
+
+    return [keys[key] for key in failed]
+
+def save_many_raw(values, *args, **kwargs):
+    while True:
+        try:
+            return _save_many_raw(values, *args, **kwargs)
+
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, ConnectionRefusedError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            disconnect()
+
+            time.sleep(overlord.util.get_skew())
+
+def _save_many_raw(values, *args, **kwargs):
+    if len(values) == 0:
+        return []
+
+    keys = {}
+    data = {}
+
+    for key, value in values.items():
+        new_key = _get_key(key)
+
+        keys[new_key] = key
+        data[new_key] = value
+
+    failed = _run("set_many", data, *args, **kwargs)
+
+    return [keys[key] for key in failed]
+
+def get_many(keys):
+    while True:
+        try:
+            return _get_many(keys)
+
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, ConnectionRefusedError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            disconnect()
+
+            time.sleep(overlord.util.get_skew())
+
+def _get_many(keys):
+    keys = { _get_key(key) : key for key in keys }
+
+    if len(keys) == 0:
+        return {}
+
+    data = _run("get_many", list(keys))
+
+    return { keys[key] : overlord.codec.decode(value) for key, value in data.items() }
+
+def delete_many(keys):
+    while True:
+        try:
+            return _delete_many(keys)
+
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, ConnectionRefusedError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            disconnect()
+
+            time.sleep(overlord.util.get_skew())
+
+def _delete_many(keys):
+    keys = [_get_key(key) for key in keys]
+
+    if len(keys) == 0:
+        return True
+
+    # 'noreply' is the default, so deletions do not wait for each other.
+    return _run("delete_many", keys)
 
 def save_healthy_chains(chains):
     return save("overlord_healthy_chains", chains)
 
 def save_jails(jails):
-    return save("overlord_jails", jails)
+    result = save("overlord_jails", jails)
+
+    if overlord.config.get_prerender():
+        save_prerendered({ "jails" : { "jails" : jails } })
+
+    return result
 
 def save_jail_stats(jail, stats):
     return save(f"overlord_jail_stats_{jail}", stats)
@@ -194,25 +392,168 @@ def save_jail_volume(jail, volume):
 def save_jail_fstab(jail, fstab):
     return save(f"overlord_jail_fstab_{jail}", fstab)
 
+def save_jails_stats(stats):
+    result = save_many({ f"overlord_jail_stats_{jail}" : value for jail, value in stats.items() })
+
+    if overlord.config.get_prerender():
+        # The same as StatsHandler: the total covers every known jail, not only the
+        # ones polled successfully in this cycle.
+        jails = get_jails()
+
+        all_stats = get_many([f"overlord_jail_stats_{jail}" for jail in jails])
+
+        total = {}
+
+        for jail_stats in all_stats.values():
+            for key, value in jail_stats.items():
+                if key not in total:
+                    total[key] = 0
+
+                total[key] += value
+
+        save_prerendered({ "stats" : { "stats" : total } })
+
+    return result
+
+def save_jails_info(info):
+    result = save_many({ f"overlord_jail_info_{jail}" : value for jail, value in info.items() })
+
+    if overlord.config.get_prerender():
+        save_prerendered({ f"jail_info_{jail}" : { "info" : value } for jail, value in info.items() })
+
+    return result
+
+def save_prerendered(chunks):
+    values = {}
+
+    compress = overlord.config.get_compress_response()
+
+    for name, chunk in chunks.items():
+        # The same as JSONHandler.write_template().
+        response = {
+            "status_code" : 200
+        }
+
+        response.update(chunk)
+
+        body = overlord.codec.encode(response)
+
+        values[f"overlord_body_{name}"] = _prerender(body)
+
+        if compress:
+            values[f"overlord_body_gzip_{name}"] = _prerender(gzip.compress(body, compresslevel=6))
+
+    return save_many_raw(values)
+
+def _prerender(body):
+    # The ETag is stored along with the body, so it doesn't need to be computed on each request.
+    return hashlib.sha1(body).hexdigest().encode() + b"\n" + body
+
+def save_jails_extras(extras):
+    values = {}
+
+    for keyword, items in extras.items():
+        for jail, value in items.items():
+            values[f"overlord_jail_{keyword}_{jail}"] = value
+
+    return save_many(values)
+
 def save_projects(projects):
     return save("overlord_projects", projects)
 
 def save_project_info(project, info):
     return save(f"overlord_project_info_{project}", info)
 
+def save_projects_info(info):
+    return save_many({ f"overlord_project_info_{project}" : value for project, value in info.items() })
+
 def save_project_status_up(project, status):
-    return save(f"overlord_project_status_up_{project}", status)
+    result = save(f"overlord_project_status_up_{project}", status)
+
+    publish_event("project:up", project, status)
+
+    return result
 
 def save_project_status_down(project, status):
-    return save(f"overlord_project_status_down_{project}", status)
+    result = save(f"overlord_project_status_down_{project}", status)
+
+    publish_event("project:down", project, status)
+
+    return result
 
 def save_vm_status(vm, status):
-    return save(f"overlord_vm_status_{vm}", status)
+    result = save(f"overlord_vm_status_{vm}", status)
+
+    publish_event("vm", vm, status)
+
+    return result
 
 def save_project_status_autoscale(project, status):
     expire_time = overlord.config.get_autoscale_logs_expire_time()
 
-    return save(f"overlord_project_status_autoscale_{project}", status, expire=expire_time)
+    result = save(f"overlord_project_status_autoscale_{project}", status, expire=expire_time)
+
+    publish_event("autoscale", project, status)
+
+    return result
+
+def publish_event(type, name, status):
+    operation = status.get("operation")
+    job_id = status.get("job_id")
+
+    # Only transitions are published, not every time the same status is saved again.
+    if LAST_EVENTS.get((type, name)) == (operation, job_id):
+        return
+
+    # The bulky parts of the status ('output', 'logs') can be retrieved by the subscriber
+    # using the usual endpoints if needed.
+    event = {
+        "type" : type,
+        "name" : name,
+        "operation" : operation,
+        "job_id" : job_id,
+        "last_update" : status.get("last_update", time.time())
+    }
+
+    if "exception" in status:
+        event["exception"] = status["exception"]
+
+    while True:
+        try:
+            _publish_event(event)
+
+            break
+
+        except (pymemcache.exceptions.MemcacheError, ConnectionError, ConnectionRefusedError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) %s:", error_type, error_message)
+
+            disconnect()
+
+            time.sleep(overlord.util.get_skew())
+
+    LAST_EVENTS[(type, name)] = (operation, job_id)
+
+def _publish_event(event):
+    key = _get_key("overlord_events_seq")
+
+    while True:
+        _run("add", key, b"0", noreply=False)
+
+        id = _run("incr", key, 1)
+
+        # The sequence has been evicted between both commands.
+        if id is not None:
+            break
+
+    event["id"] = id
+
+    expire_time = overlord.config.get_events_expire_time()
+
+    _save(f"overlord_event_{id}", event, expire=expire_time)
 
 def save_haproxy_stats(type, name, stats):
     return save(f"overlord_haproxy_stats_{type}_{name}", stats)
@@ -386,25 +727,45 @@ def get_healthy_chains():
     return data
 
 def remove_jail(jail):
-    for keyword in ("info", "stats", "cpuset", "devfs", "expose", "healthcheck", "limits", "fstab", "label", "nat", "volume", "fstab"):
-        delete(f"overlord_jail_{keyword}_{jail}")
+    remove_jails([jail])
+
+def remove_jails(jails):
+    keys = []
 
-    delete(f"overlord_vm_status_{jail}")
+    for jail in jails:
+        for keyword in ("info", "stats", "cpuset", "devfs", "expose", "healthcheck", "limits", "fstab", "label", "nat", "volume"):
+            keys.append(f"overlord_jail_{keyword}_{jail}")
+
+        keys.append(f"overlord_vm_status_{jail}")
+        keys.append(f"overlord_body_jail_info_{jail}")
+        keys.append(f"overlord_body_gzip_jail_info_{jail}")
+
+    delete_many(keys)
 
 def remove_jail_stats(jail):
-    delete(f"overlord_jail_stats_{jail}")
+    remove_jails_stats([jail])
+
+def remove_jails_stats(jails):
+    delete_many([f"overlord_jail_stats_{jail}" for jail in jails])
 
 def remove_project(project):
-    for keyword in ("info", "status_up", "status_down", "status_autoscale"):
-        delete(f"overlord_project_{keyword}_{project}")
+    remove_projects([project])
+
+def remove_projects(projects):
+    keys = []
+
+    for project in projects:
+        for keyword in ("info", "status_up", "status_down", "status_autoscale"):
+            keys.append(f"overlord_project_{keyword}_{project}")
+
+    delete_many(keys)
 
 def gc_jails(jails):
     new = set(jails)
     old = set(get_jails())
     diff = old - new
 
-    for jail in diff:
-        remove_jail(jail)
+    remove_jails(diff)
 
     return save_jails(jails)
 
@@ -413,8 +774,7 @@ def gc_projects(projects):
     old = set(get_projects())
     diff = old - new
 
-    for project in diff:
-        remove_project(project)
+    remove_projects(diff)
 
     return save_projects(projects)
 
@@ -27,6 +27,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
+import collections
 import enum
 import logging
 import re
@@ -35,7 +37,9 @@ import ssl
 import httpx
 
 import overlord.chains
+import overlord.codec
 import overlord.config
+import overlord.default
 import overlord.director
 import overlord.jail
 import overlord.metadata
@@ -64,7 +68,7 @@ class OverlordAuth(httpx.Auth):
         yield request
 
 class OverlordClient(httpx.AsyncClient):
-    def __init__(self, base_url, access_token, pretty_exc=True, *args, **kwargs):
+    def __init__(self, base_url, access_token, pretty_exc=True, etag_cache_size=None, fan_out_concurrency=None, fan_out_timeout=None, *args, **kwargs):
         """
         Create a new instance of an Overlord client. This class inherits all the methods
         and properties of ``httpx.AsyncClient`` so you can take advantage of this.
@@ -75,10 +79,25 @@ class OverlordClient(httpx.AsyncClient):
             base_url (str): A URL to use as the base when building request URLs.
             access_token (str): Access token for the server to allow access to the client.
             pretty_exc (bool, optional): By throwing an HTTPX exception, make it look friendlier.
+            etag_cache_size (int, optional): Number of bodies of jails, stats and jail information
+                to remember for conditional requests. ``0`` disables this feature.
+            fan_out_concurrency (int, optional): Default maximum number of chains requested at the
+                same time by ``get_all_chains()`` and ``fan_out()``.
+            fan_out_timeout (int, optional): Default maximum number of seconds to wait for each chain
+                in ``get_all_chains()`` and ``fan_out()``. ``0`` disables it.
         """
 
         self.__pretty_exc = pretty_exc
 
+        if etag_cache_size is None:
+            etag_cache_size = overlord.default.CLIENT_ETAG_CACHE_SIZE
+
+        self.__etag_cache_size = etag_cache_size
+        self.__etags = collections.OrderedDict()
+
+        self.__fan_out_concurrency = fan_out_concurrency
+        self.__fan_out_timeout = fan_out_timeout
+
         auth = OverlordAuth(access_token)
 
         super().__init__(
@@ -277,52 +296,114 @@ class OverlordClient(httpx.AsyncClient):
 
         return parsed
 
-    async def get_projects_logs(self, chain=None):
+    async def get_projects_logs(self, date=None, service=None, chain=None):
         """
         Gets the logs created by Director.
 
         Args:
+            date (str, optional): Only get the logs created on this date.
+            service (str, optional): Only get the logs of this service.
             chain (str, optional):
                 The chain that the server(s) should use to redirect the request.
 
         Returns:
             dict: Dictionary stored as ``{date}/{service}/{log_name}`` where ``{date}`` is a
             dictionary and ``{service}`` is a list of strings containing the ``{log_name}``.
+            Dates and services without logs are not included.
 
         Raises:
             - overlord.exceptions.InvalidArguments
             - overlord.exceptions.APIError
         """
 
-        parsed = await self.__get_parsed("projects/logs", chain=chain)
+        parsed = await self.get_projects_logs_page(date, service, chain=chain)
         logs = parsed.get("logs", {})
 
         return logs
 
-    async def get_jails_logs(self, chain=None):
+    async def get_projects_logs_page(self, date=None, service=None, offset=None, limit=None, chain=None):
+        """
+        Gets a page of the logs created by Director.
+
+        Args:
+            date (str, optional): Only get the logs created on this date.
+            service (str, optional): Only get the logs of this service.
+            offset (int, optional): Number of logs to skip.
+            limit (int, optional): Maximum number of logs to get.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: ``logs`` as returned by ``get_projects_logs()`` and ``next_offset``, the
+            offset of the next page or ``None`` if this is the last one.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        params = self.__get_page_params(offset, limit, date=date, service=service)
+
+        parsed = await self.__get_parsed("projects/logs", params=params, chain=chain)
+
+        return parsed
+
+    async def get_jails_logs(self, type=None, entity=None, subtype=None, chain=None):
         """
         Gets the logs created by AppJail.
 
         Args:
+            type (str, optional): Only get the logs of this group of entities.
+            entity (str, optional): Only get the logs of this individual.
+            subtype (str, optional): Only get the logs of this group of logs.
             chain (str, optional):
                 The chain that the server(s) should use to redirect the request.
 
         Returns:
             dict: Dictionary stored as ``{type}/{entity}/{subtype}/{log_name}`` where ``{type}``
             is a dictionary containing each ``{entity}``, another dictionary containing each
-            ``{subtype}`, a list of strings containing ``{log_name}``.
+            ``{subtype}`, a list of strings containing ``{log_name}``. Types, entities and
+            subtypes without logs are not included.
 
         Raises:
             - overlord.exceptions.InvalidArguments
             - overlord.exceptions.APIError
         """
 
-        parsed = await self.__get_parsed("jails/logs", chain=chain)
+        parsed = await self.get_jails_logs_page(type, entity, subtype, chain=chain)
         logs = parsed.get("logs", {})
 
         return logs
 
-    async def get_project_log(self, date, service, log, chain=None):
+    async def get_jails_logs_page(self, type=None, entity=None, subtype=None, offset=None, limit=None, chain=None):
+        """
+        Gets a page of the logs created by AppJail.
+
+        Args:
+            type (str, optional): Only get the logs of this group of entities.
+            entity (str, optional): Only get the logs of this individual.
+            subtype (str, optional): Only get the logs of this group of logs.
+            offset (int, optional): Number of logs to skip.
+            limit (int, optional): Maximum number of logs to get.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: ``logs`` as returned by ``get_jails_logs()`` and ``next_offset``, the
+            offset of the next page or ``None`` if this is the last one.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        params = self.__get_page_params(offset, limit, type=type, entity=entity, subtype=subtype)
+
+        parsed = await self.__get_parsed("jails/logs", params=params, chain=chain)
+
+        return parsed
+
+    async def get_project_log(self, date, service, log, tail=None, offset=None, length=None, follow=False, chain=None):
         """
         Gets the content of a log created by Director.
 
@@ -330,6 +411,10 @@ class OverlordClient(httpx.AsyncClient):
             date (str): Date on which the log was created.
             service (str): Service owner of this log.
             log (str): Log file name.
+            tail (int, optional): Only get the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            length (int, optional): Maximum number of bytes to read.
+            follow (bool, optional): Wait for new data if there is nothing to read.
             chain (str, optional):
                 The chain that the server(s) should use to redirect the request.
 
@@ -341,17 +426,78 @@ class OverlordClient(httpx.AsyncClient):
             - overlord.exceptions.APIError
         """
 
-        if re.match(r"[/]", date) \
-                or re.match(r"[/]", service) \
-                or re.match(r"[/]", log):
-            raise overlord.exceptions.InvalidArguments("One or more arguments contains a character not allowed.")
+        if tail is not None \
+                or offset is not None \
+                or length is not None \
+                or follow:
+            chunk = await self.get_project_log_chunk(date, service, log, tail, offset, length, follow, chain=chain)
+
+            return chunk.get("log_content")
+
+        self.__check_log_arguments(date, service, log)
 
         parsed = await self.__get_parsed(f"projects/log/{date}/{service}/{log}", chain=chain)
         log_content = parsed.get("log_content")
 
         return log_content
 
-    async def get_jail_log(self, type, entity, subtype, log, chain=None):
+    async def get_project_log_chunk(self, date, service, log, tail=None, offset=None, length=None, follow=False, chain=None):
+        """
+        Gets a part of a log created by Director.
+
+        Args:
+            date (str): Date on which the log was created.
+            service (str): Service owner of this log.
+            log (str): Log file name.
+            tail (int, optional): Only get the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            length (int, optional): Maximum number of bytes to read.
+            follow (bool, optional): Wait for new data if there is nothing to read.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: ``log_content`` with the contents, ``offset`` where they start, ``next_offset``
+            where the next read should start and ``size`` of the log.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        self.__check_log_arguments(date, service, log)
+
+        params = self.__get_log_params(tail, offset, length, follow)
+
+        parsed = await self.__get_parsed(f"projects/log/{date}/{service}/{log}", params=params, chain=chain)
+
+        return parsed
+
+    async def follow_project_log(self, date, service, log, tail=None, offset=None, chain=None):
+        """
+        Yields the contents of a log created by Director as it grows, like ``tail -f``.
+
+        Args:
+            date (str): Date on which the log was created.
+            service (str): Service owner of this log.
+            log (str): Log file name.
+            tail (int, optional): Start with the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Yields:
+            str: New contents of the specified log.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        async for content in self.__follow_log(self.get_project_log_chunk, date, service, log, tail=tail, offset=offset, chain=chain):
+            yield content
+
+    async def get_jail_log(self, type, entity, subtype, log, tail=None, offset=None, length=None, follow=False, chain=None):
         """
         Gets the content of a log created by AppJail.
         
@@ -360,6 +506,10 @@ class OverlordClient(httpx.AsyncClient):
             entity (str): Individual in a group.
             subtype (str): Group of logs.
             log (str): Log file name.
+            tail (int, optional): Only get the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            length (int, optional): Maximum number of bytes to read.
+            follow (bool, optional): Wait for new data if there is nothing to read.
             chain (str, optional):
                 The chain that the server(s) should use to redirect the request.
 
@@ -371,17 +521,79 @@ class OverlordClient(httpx.AsyncClient):
             - overlord.exceptions.APIError
         """
 
-        if re.match(r"[/]", type) \
-                or re.match(r"[/]", entity) \
-                or re.match(r"[/]", subtype) \
-                or re.match(r"[/]", log):
-            raise overlord.exceptions.InvalidArguments("One or more arguments contains a character not allowed.")
+        if tail is not None \
+                or offset is not None \
+                or length is not None \
+                or follow:
+            chunk = await self.get_jail_log_chunk(type, entity, subtype, log, tail, offset, length, follow, chain=chain)
+
+            return chunk.get("log_content")
+
+        self.__check_log_arguments(type, entity, subtype, log)
 
         parsed = await self.__get_parsed(f"jail/log/{type}/{entity}/{subtype}/{log}", chain=chain)
         log_content = parsed.get("log_content")
 
         return log_content
 
+    async def get_jail_log_chunk(self, type, entity, subtype, log, tail=None, offset=None, length=None, follow=False, chain=None):
+        """
+        Gets a part of a log created by AppJail.
+
+        Args:
+            type (str): Group of entities.
+            entity (str): Individual in a group.
+            subtype (str): Group of logs.
+            log (str): Log file name.
+            tail (int, optional): Only get the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            length (int, optional): Maximum number of bytes to read.
+            follow (bool, optional): Wait for new data if there is nothing to read.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: ``log_content`` with the contents, ``offset`` where they start, ``next_offset``
+            where the next read should start and ``size`` of the log.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        self.__check_log_arguments(type, entity, subtype, log)
+
+        params = self.__get_log_params(tail, offset, length, follow)
+
+        parsed = await self.__get_parsed(f"jail/log/{type}/{entity}/{subtype}/{log}", params=params, chain=chain)
+
+        return parsed
+
+    async def follow_jail_log(self, type, entity, subtype, log, tail=None, offset=None, chain=None):
+        """
+        Yields the contents of a log created by AppJail as it grows, like ``tail -f``.
+
+        Args:
+            type (str): Group of entities.
+            entity (str): Individual in a group.
+            subtype (str): Group of logs.
+            log (str): Log file name.
+            tail (int, optional): Start with the last ``tail`` lines.
+            offset (int, optional): Byte offset to start reading from.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Yields:
+            str: New contents of the specified log.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        async for content in self.__follow_log(self.get_jail_log_chunk, type, entity, subtype, log, tail=tail, offset=offset, chain=chain):
+            yield content
+
     async def get_jails(self, chain=None):
         """
         Gets a list of jails.
@@ -398,11 +610,50 @@ class OverlordClient(httpx.AsyncClient):
             - overlord.exceptions.APIError
         """
 
-        parsed = await self.__get_parsed("jails", chain=chain)
+        parsed = await self.__get_parsed("jails", chain=chain, cached=True)
         jails = parsed.get("jails", [])
 
         return jails
 
+    async def get_jails_details(self, jails=None, sections=None, chain=None):
+        """
+        Gets several sections of many jails at once, instead of calling a method such as
+        ``get_stats()`` or ``get_info()`` for each jail.
+
+        Args:
+            jails (list(str), optional): Jails to get. All jails by default.
+            sections (list(str), optional): Sections to get: ``stats``, ``info``, ``cpuset``,
+                ``devfs``, ``expose``, ``healthcheck``, ``limits``, ``fstab``, ``labels``,
+                ``nat`` and ``volumes``. All sections by default.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: Dictionary stored as ``{jail}/{section}`` where ``{jail}`` is a dictionary
+            containing the value of each ``{section}``.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        params = {}
+
+        if jails is not None:
+            for jail in jails:
+                if not overlord.jail.check_jail_name(jail):
+                    raise overlord.exceptions.InvalidArguments(f"{jail}: Invalid jail name.")
+
+            params["jails"] = ",".join(jails)
+
+        if sections is not None:
+            params["sections"] = ",".join(sections)
+
+        parsed = await self.__get_parsed("jails/details", params=params, chain=chain, cached=True)
+        jails = parsed.get("jails", {})
+
+        return jails
+
     async def get_projects(self, chain=None):
         """
         Gets a list of projects.
@@ -466,6 +717,39 @@ class OverlordClient(httpx.AsyncClient):
 
         return chains
 
+    async def get_chains_tree(self, depth=None, chain=None):
+        """
+        Gets the tree of chains reachable from the server, which is built by the server
+        itself, so it is not necessary to request the chains of each chain.
+
+        Args:
+            depth (int, optional): Maximum number of levels to descend.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: The ``labels`` of the server and its ``chains``, where each chain is another
+            tree. A chain that could not be reached has ``error`` and ``message`` instead, and
+            a chain beyond ``depth`` has neither ``labels`` nor ``chains``.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        params = {}
+
+        if depth is not None:
+            if depth < 0:
+                raise overlord.exceptions.InvalidArguments(f"{depth}: Depth must be greater than or equal to 0.")
+
+            params["depth"] = depth
+
+        parsed = await self.__get_parsed("chains/tree", params=params, chain=chain)
+        tree = parsed.get("tree", {})
+
+        return tree
+
     async def get_info(self, name, type=OverlordEntityTypes.JAIL, chain=None):
         """
         Gets information from a jail or project.
@@ -495,7 +779,8 @@ class OverlordClient(httpx.AsyncClient):
             if not overlord.jail.check_jail_name(name):
                 raise overlord.exceptions.InvalidJailName(f"{name}: Invalid jail name.")
 
-        return await self.__get_entity_parsed(name, "info", {}, type, chain)
+        # The age of a project is relative to the time of the request, so it is never reused.
+        return await self.__get_entity_parsed(name, "info", {}, type, chain, cached=type == OverlordEntityTypes.JAIL)
 
     async def check(self, name, type=OverlordEntityTypes.JAIL, chain=None):
         if re.match(r"[/]", name):
@@ -557,11 +842,45 @@ class OverlordClient(httpx.AsyncClient):
             - overlord.exceptions.APIError
         """
 
-        parsed = await self.__get_parsed("stats", chain=chain)
+        parsed = await self.__get_parsed("stats", chain=chain, cached=True)
         stats = parsed.get("stats", {})
 
         return stats
 
+    async def get_cluster_stats(self, depth=None, chain=None):
+        """
+        List the metrics of the server and of all the chains reachable from it, which are
+        added up by each server with those of its chains.
+
+        Args:
+            depth (int, optional): Maximum number of levels to descend.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            dict: The ``stats`` of the server, the ``total`` of the server and its chains,
+            and its ``chains``, where each chain is another dictionary like this one. A chain
+            that could not be reached has ``error`` and ``message`` instead, and a chain beyond
+            ``depth`` has none of these keys.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        params = {}
+
+        if depth is not None:
+            if depth < 0:
+                raise overlord.exceptions.InvalidArguments(f"{depth}: Depth must be greater than or equal to 0.")
+
+            params["depth"] = depth
+
+        parsed = await self.__get_parsed("stats/cluster", params=params, chain=chain)
+        cluster = parsed.get("cluster", {})
+
+        return cluster
+
     async def ping(self, chain=None):
         """
         Ping a chain.
@@ -616,7 +935,7 @@ class OverlordClient(httpx.AsyncClient):
             if not overlord.jail.check_jail_name(name):
                 raise overlord.exceptions.InvalidJailName(f"{name}: Invalid jail name.")
 
-        return await self.__get_entity_parsed(name, "stats", {}, type, chain)
+        return await self.__get_entity_parsed(name, "stats", {}, type, chain, cached=True)
 
     async def get_cpuset(self, name, chain=None):
         """
@@ -825,9 +1144,115 @@ class OverlordClient(httpx.AsyncClient):
 
         return await self.__get_entity_parsed(name, "volumes", [], chain=chain)
 
-    async def get_all_chains(self, chain=None, on_fail=None):
+    async def iter_events(self, since=None, type=None, name=None, keepalive=False, reconnect=True, chain=None):
         """
-        Gets all chains recursively.
+        Yields the status changes of projects, VMs and autoscaled projects as they happen,
+        so it is not necessary to poll their status.
+
+        Args:
+            since (int, optional): Also yield the events after this ID that are still kept
+                by the server.
+            type (str, optional): Only yield the events of this type: ``project:up``,
+                ``project:down``, ``vm`` or ``autoscale``.
+            name (str, optional): Only yield the events of this project or VM.
+            keepalive (bool, optional): Yield ``None`` each time the server sends a keepalive.
+            reconnect (bool, optional): Reconnect, without losing events, when the server
+                closes the stream.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Yields:
+            dict: ``id``, ``type``, ``name``, ``operation``, ``job_id`` and ``last_update``
+            of each event, and ``exception`` when it has failed.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.APIError
+        """
+
+        url = self.__get_url("events", chain)
+
+        while True:
+            params = {}
+
+            if since is not None:
+                params["since"] = since
+
+            if type is not None:
+                params["type"] = type
+
+            if name is not None:
+                params["name"] = name
+
+            async with self.stream("GET", url, params=params) as response:
+                if response.status_code != 200:
+                    await response.aread()
+
+                self.__raise_for_status(response)
+
+                data = []
+
+                async for line in response.aiter_lines():
+                    if line == "":
+                        if len(data) > 0:
+                            event = overlord.codec.decode("\n".join(data))
+
+                            since = event.get("id", since)
+
+                            yield event
+
+                        data = []
+
+                    elif line.startswith(":"):
+                        if keepalive:
+                            yield None
+
+                    elif line.startswith("data:"):
+                        data.append(line[5:].strip())
+
+            if not reconnect:
+                break
+
+    async def batch(self, requests, chain=None):
+        """
+        Executes several requests concurrently on the server using a single request, which
+        is useful when the server is reached through a long chain.
+
+        Args:
+            requests (list(dict)): Each request is a dictionary with ``method`` (``GET`` by default),
+                ``path`` (e.g. ``jail/stats/<jail>``) and, optionally, ``params`` and ``body``.
+            chain (str, optional):
+                The chain that the server(s) should use to redirect the request.
+
+        Returns:
+            list(dict): The response of each request in the same order, including its ``status_code``.
+            A request that fails doesn't cause the others to fail.
+
+        Raises:
+            - overlord.exceptions.InvalidArguments
+            - overlord.exceptions.ResourceNotFound: The server does not support batches.
+            - overlord.exceptions.APIError
+        """
+
+        if not isinstance(requests, list):
+            raise overlord.exceptions.InvalidArguments("A list of requests was expected.")
+
+        for request in requests:
+            if not isinstance(request, dict) or not isinstance(request.get("path"), str):
+                raise overlord.exceptions.InvalidArguments("Each request must be a dictionary with a path.")
+
+        parsed = await self.__post_parsed("batch", chain=chain, json={
+            "requests" : requests
+        })
+        responses = parsed.get("responses", [])
+
+        return responses
+
+    async def get_all_chains(self, chain=None, on_fail=None, concurrency=None, timeout=None):
+        """
+        Gets all chains recursively. The tree of chains is requested from the server and
+        only the chains it couldn't explore are requested from the client. These are requested
+        concurrently, so they are yielded as they arrive and not in a depth-first order.
 
         Args:
             chain (list(str), optional):
@@ -836,40 +1261,133 @@ class OverlordClient(httpx.AsyncClient):
                 Function called when an error is detected. The first argument is the chain (str),
                 the second is the type of error (str), the third is the error description (str)
                 and the fourth is the exception (object).
+            concurrency (int, optional):
+                Maximum number of chains requested at the same time.
+            timeout (int, optional):
+                Maximum number of seconds to wait for each chain. ``0`` disables it.
 
         Yields:
             str: The next chain.
         """
 
+        (concurrency, timeout) = self.__get_fan_out_settings(concurrency, timeout)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def discover(chain):
+            async with semaphore:
+                try:
+                    chains = await _wait_for(self.get_chains(chain=chain), timeout)
+
+                except Exception as err:
+                    error = overlord.util.get_error(err)
+                    error_type = error.get("type")
+                    error_message = error.get("message")
+
+                    if on_fail is not None:
+                        on_fail(chain, error_type, error_message, err)
+
+                    logger.warning("(entrypoint:%s, chain:%s, exception:%s) error obtaining the chains: %s",
+                                   self.base_url, chain, error_type, error_message)
+
+                    return []
+
+            if chain is None:
+                first_chain = []
+
+            else:
+                first_chain = [chain]
+
+            return [overlord.chains.join_chain(first_chain + [_chain]) for _chain in chains]
+
+        tasks = set()
+
         try:
-            chains = await self.get_chains(chain=chain)
-            
-        except Exception as err:
-            error = overlord.util.get_error(err)
-            error_type = error.get("type")
-            error_message = error.get("message")
+            try:
+                tree = await _wait_for(self.get_chains_tree(chain=chain), timeout)
 
-            if on_fail is not None:
-                on_fail(chain, error_type, error_message, err)
+            except Exception as err:
+                error = overlord.util.get_error(err)
+                error_type = error.get("type")
+                error_message = error.get("message")
 
-            logger.warning("(entrypoint:%s, chain:%s, exception:%s) error obtaining the chains: %s",
-                           self.base_url, chain, error_type, error_message)
+                logger.debug("(entrypoint:%s, chain:%s, exception:%s) tree of chains not available: %s",
+                             self.base_url, chain, error_type, error_message)
 
-            return
+                tree = None
 
-        if chain is None:
-            first_chain = []
+            if tree is None:
+                tasks.add(asyncio.create_task(discover(chain)))
 
-        else:
-            first_chain = [chain]
+            else:
+                for (_chain, node) in walk_chains_tree(tree, chain):
+                    if "chains" not in node:
+                        # Not reachable by the server or too deep, so it is tried as before.
+                        tasks.add(asyncio.create_task(discover(_chain)))
+
+                    yield _chain
+
+            while tasks:
+                (done, tasks) = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
 
-        for chain in chains:
-            chain = overlord.chains.join_chain(first_chain + [chain])
+                for task in done:
+                    for chain in task.result():
+                        tasks.add(asyncio.create_task(discover(chain)))
 
-            yield chain
+                        yield chain
 
-            async for chain in self.get_all_chains(chain=chain, on_fail=on_fail):
-                yield chain
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fan_out(self, func, chains, *args, concurrency=None, timeout=None, **kwargs):
+        """
+        Calls ``func`` for each chain concurrently and yields the results as they arrive.
+
+        Any other arguments or parameters are passed to ``func``, which receives the chain
+        through the ``chain`` parameter.
+
+        Args:
+            func (callable):
+                Coroutine function to call, such as ``client.get_api_labels``.
+            chains (list(str)):
+                Chains to call ``func`` with.
+            concurrency (int, optional):
+                Maximum number of chains processed at the same time.
+            timeout (int, optional):
+                Maximum number of seconds to wait for each chain. ``0`` disables it.
+
+        Yields:
+            tuple(str, object, Exception): The chain, the result (``None`` on error) and the
+            exception raised by ``func`` (``None`` on success).
+        """
+
+        (concurrency, timeout) = self.__get_fan_out_settings(concurrency, timeout)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(chain):
+            async with semaphore:
+                try:
+                    result = await _wait_for(func(*args, chain=chain, **kwargs), timeout)
+
+                except Exception as err:
+                    return (chain, None, err)
+
+            return (chain, result, None)
+
+        tasks = {asyncio.create_task(call(chain)) for chain in chains}
+
+        try:
+            while tasks:
+                (done, tasks) = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    yield task.result()
+
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def namespace_set(self, name, mapping, chain=None):
         """
@@ -1242,16 +1760,72 @@ class OverlordClient(httpx.AsyncClient):
 
         return metadata
 
+    def __get_fan_out_settings(self, concurrency, timeout):
+        if concurrency is None:
+            concurrency = self.__fan_out_concurrency
+
+        if timeout is None:
+            timeout = self.__fan_out_timeout
+
+        return _get_fan_out_settings(concurrency, timeout)
+
+    def __check_log_arguments(self, *args):
+        for arg in args:
+            if re.match(r"[/]", arg):
+                raise overlord.exceptions.InvalidArguments("One or more arguments contains a character not allowed.")
+
+    def __get_page_params(self, offset, limit, **filters):
+        params = { key : value for key, value in filters.items() if value is not None }
+
+        if offset is not None:
+            params["offset"] = offset
+
+        if limit is not None:
+            params["limit"] = limit
+
+        return params
+
+    def __get_log_params(self, tail, offset, length, follow):
+        params = {}
+
+        if tail is not None:
+            params["tail"] = tail
+
+        if offset is not None:
+            params["offset"] = offset
+
+        if length is not None:
+            params["length"] = length
+
+        if follow:
+            params["follow"] = 1
+
+        return params
+
+    async def __follow_log(self, func, *args, tail=None, offset=None, chain=None):
+        if tail is None and offset is None:
+            offset = 0
+
+        chunk = await func(*args, tail=tail, offset=offset, chain=chain)
+
+        while True:
+            content = chunk.get("log_content")
+
+            if content:
+                yield content
+
+            chunk = await func(*args, offset=chunk["next_offset"], follow=True, chain=chain)
+
     async def __post_parsed(self, path, *args, chain=None, **kwargs):
         return await self.__parsed("post", path, *args, chain=chain, **kwargs)
 
     async def __put_parsed(self, path, *args, chain=None, **kwargs):
         return await self.__parsed("put", path, *args, chain=chain, **kwargs)
 
-    async def __get_parsed(self, path, *args, chain=None, **kwargs):
-        return await self.__parsed("get", path, *args, chain=chain, **kwargs)
+    async def __get_parsed(self, path, *args, chain=None, cached=False, **kwargs):
+        return await self.__parsed("get", path, *args, chain=chain, cached=cached, **kwargs)
 
-    async def __parsed(self, method, path, *args, chain=None, **kwargs):
+    def __get_url(self, path, chain=None):
         if chain is None:
             url = f"/v1/{path}"
 
@@ -1261,7 +1835,16 @@ class OverlordClient(httpx.AsyncClient):
 
             url = f"/v1/chain/{chain}/{path}"
 
+        return url
+
+    async def __parsed(self, method, path, *args, chain=None, cached=False, **kwargs):
+        url = self.__get_url(path, chain)
+
         if method == "get":
+            # Only small representations that are requested often are worth remembering.
+            if cached:
+                return await self.__get_cached(url, *args, **kwargs)
+
             method = self.__get
 
         elif method == "post":
@@ -1274,7 +1857,54 @@ class OverlordClient(httpx.AsyncClient):
 
         return request.json()
 
-    async def __get_entity(self, name, command=None, type=OverlordEntityTypes.JAIL, chain=None):
+    async def __get_cached(self, url, *args, **kwargs):
+        if self.__etag_cache_size <= 0:
+            request = await self.__get(url, *args, **kwargs)
+
+            return request.json()
+
+        # Each combination of parameters is a different representation.
+        params = kwargs.pop("params", None)
+
+        if params:
+            url = str(httpx.URL(url, params=params))
+
+        cached = self.__etags.get(url)
+
+        if cached is not None:
+            (etag, content) = cached
+
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["If-None-Match"] = etag
+
+            kwargs["headers"] = headers
+
+        request = await self.__get(url, *args, **kwargs)
+
+        if request.status_code == 304:
+            if cached is None:
+                raise overlord.exceptions.APIError(f"(status:304, url:{url}) Not Modified, but there is no cached body to use.")
+
+            self.__etags.move_to_end(url)
+
+            # The body is decoded every time because callers are free to modify the result.
+            return overlord.codec.decode(content)
+
+        etag = request.headers.get("Etag")
+
+        if etag is None:
+            self.__etags.pop(url, None)
+
+        else:
+            self.__etags[url] = (etag, request.content)
+            self.__etags.move_to_end(url)
+
+            while len(self.__etags) > self.__etag_cache_size:
+                self.__etags.popitem(last=False)
+
+        return request.json()
+
+    async def __get_entity(self, name, command=None, type=OverlordEntityTypes.JAIL, chain=None, cached=False):
         if type == OverlordEntityTypes.JAIL:
             entity = "jail"
 
@@ -1297,15 +1927,15 @@ class OverlordClient(httpx.AsyncClient):
             raise overlord.exceptions.InvalidArguments(f"{name}: Entity name contains a character not allowed.")
         
         if command is None:
-            result = await self.__get_parsed(f"{entity}/{name}", chain=chain)
+            result = await self.__get_parsed(f"{entity}/{name}", chain=chain, cached=cached)
 
         else:
-            result = await self.__get_parsed(f"{entity}/{command}/{name}", chain=chain)
+            result = await self.__get_parsed(f"{entity}/{command}/{name}", chain=chain, cached=cached)
 
         return result
 
-    async def __get_entity_parsed(self, name, key=None, default=None, type=OverlordEntityTypes.JAIL, chain=None):
-        parsed = await self.__get_entity(name, key, type, chain)
+    async def __get_entity_parsed(self, name, key=None, default=None, type=OverlordEntityTypes.JAIL, chain=None, cached=False):
+        parsed = await self.__get_entity(name, key, type, chain, cached)
         
         return parsed.get(key, default)
 
@@ -1321,17 +1951,66 @@ class OverlordClient(httpx.AsyncClient):
     async def __request(self, *args, method, **kwargs):
         request = await getattr(self, method)(*args, **kwargs)
 
+        if request.status_code == 304:
+            # Not Modified is only returned for conditional requests, so the caller knows what to do.
+            return request
+
+        self.__raise_for_status(request)
+
+        return request
+
+    def __raise_for_status(self, request):
         if self.__pretty_exc:
             try:
                 request.raise_for_status()
 
             except httpx.HTTPStatusError:
-                raise overlord.exceptions.APIError("(status:%d, reason:%s) %s" % (request.status_code, request.reason_phrase, request.text))
+                message = "(status:%d, reason:%s) %s" % (request.status_code, request.reason_phrase, request.text)
+
+                if request.status_code == 404:
+                    raise overlord.exceptions.ResourceNotFound(message)
+
+                raise overlord.exceptions.APIError(message)
 
         else:
             request.raise_for_status()
 
-        return request
+def _get_fan_out_settings(concurrency, timeout):
+    if concurrency is None:
+        concurrency = overlord.default.CLIENT_FAN_OUT_CONCURRENCY
+
+    if timeout is None:
+        timeout = overlord.default.CLIENT_FAN_OUT_TIMEOUT
+
+    if concurrency < 1:
+        raise overlord.exceptions.InvalidArguments(f"{concurrency}: Concurrency must be greater than 0.")
+
+    return (concurrency, timeout)
+
+def walk_chains_tree(tree, chain=None):
+    if chain is None:
+        first_chain = []
+
+    else:
+        first_chain = [chain]
+
+    nodes = collections.deque([(first_chain, tree)])
+
+    while nodes:
+        (parent, node) = nodes.popleft()
+
+        for _chain, child in node.get("chains", {}).items():
+            _chain = parent + [_chain]
+
+            yield (overlord.chains.join_chain(_chain), child)
+
+            nodes.append((_chain, child))
+
+async def _wait_for(aw, timeout):
+    if timeout:
+        return await asyncio.wait_for(aw, timeout)
+
+    return await aw
 
 def get_chain(chain):
     limits_settings = {
@@ -0,0 +1,81 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import re
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+# Both json.JSONDecodeError and orjson.JSONDecodeError are subclasses of it,
+# as is UnicodeDecodeError.
+DecodeError = ValueError
+
+# orjson turns integers that don't fit in 64 bits into floats, so anything with that
+# many digits in a row (even inside a string) is decoded by the standard library.
+REGEX_LONG_NUMBER = re.compile(r"[0-9]{19}")
+REGEX_LONG_NUMBER_BYTES = re.compile(rb"[0-9]{19}")
+
+def get_backend():
+    if orjson is None:
+        return "json"
+
+    return "orjson"
+
+def encode(value):
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+        except TypeError:
+            # e.g.: integers that don't fit in 64 bits.
+            pass
+
+    return _encode(value)
+
+def decode(data):
+    if orjson is not None and not has_long_number(data):
+        return orjson.loads(data)
+
+    return _decode(data)
+
+def has_long_number(data):
+    if isinstance(data, str):
+        return REGEX_LONG_NUMBER.search(data) is not None
+
+    return REGEX_LONG_NUMBER_BYTES.search(data) is not None
+
+def _encode(value):
+    return json.dumps(value).encode()
+
+def _decode(data):
+    return json.loads(data)
@@ -158,6 +158,8 @@ async def _apply(file, restart, mako_directories):
                 access_token,
                 limits=httpx.Limits(**limits_settings),
                 timeout=httpx.Timeout(**timeout_settings),
+                fan_out_concurrency=overlord.spec.get_datacenter_fan_out_concurrency(main_entrypoint),
+                fan_out_timeout=overlord.spec.get_datacenter_fan_out_timeout(main_entrypoint),
                 **kwargs
             )
 
@@ -166,11 +168,9 @@ async def _apply(file, restart, mako_directories):
             async for _chain in client.get_all_chains(chain=chain):
                 chains.append(_chain)
 
-            for chain in chains:
-                try:
-                    entrypoint_labels = await client.get_api_labels(chain=chain)
-
-                except Exception as err:
+            # API labels are requested concurrently and processed as they arrive.
+            async for (chain, entrypoint_labels, err) in client.fan_out(client.get_api_labels, chains):
+                if err is not None:
                     error = overlord.util.get_error(err)
                     error_type = error.get("type")
                     error_message = error.get("message")
@@ -157,6 +157,8 @@ async def _cancel(file, filter_chain, mako_directories):
                 access_token,
                 limits=httpx.Limits(**limits_settings),
                 timeout=httpx.Timeout(**timeout_settings),
+                fan_out_concurrency=overlord.spec.get_datacenter_fan_out_concurrency(main_entrypoint),
+                fan_out_timeout=overlord.spec.get_datacenter_fan_out_timeout(main_entrypoint),
                 **kwargs
             )
 
@@ -165,6 +167,8 @@ async def _cancel(file, filter_chain, mako_directories):
             async for _chain in client.get_all_chains(chain=chain):
                 chains.append(_chain)
 
+            filtered_chains = []
+
             for chain in chains:
                 if len(filter_chain) > 0 \
                         and chain not in filter_chain:
@@ -172,10 +176,13 @@ async def _cancel(file, filter_chain, mako_directories):
                                  datacenter, chain, filter_chain)
                     continue
 
-                try:
-                    entrypoint_labels = await client.get_api_labels(chain=chain)
+                filtered_chains.append(chain)
 
-                except Exception as err:
+            chains = filtered_chains
+
+            # API labels are requested concurrently and processed as they arrive.
+            async for (chain, entrypoint_labels, err) in client.fan_out(client.get_api_labels, chains):
+                if err is not None:
                     error = overlord.util.get_error(err)
                     error_type = error.get("type")
                     error_message = error.get("message")
@@ -150,6 +150,8 @@ async def _destroy(file, force, filter_chain, filter_root_chain, mako_directorie
                 access_token,
                 limits=httpx.Limits(**limits_settings),
                 timeout=httpx.Timeout(**timeout_settings),
+                fan_out_concurrency=overlord.spec.get_datacenter_fan_out_concurrency(main_entrypoint),
+                fan_out_timeout=overlord.spec.get_datacenter_fan_out_timeout(main_entrypoint),
                 **kwargs
             )
 
@@ -158,6 +160,8 @@ async def _destroy(file, force, filter_chain, filter_root_chain, mako_directorie
             async for _chain in client.get_all_chains(chain=chain):
                 chains.append(_chain)
 
+            filtered_chains = []
+
             for chain in chains:
                 if len(filter_chain) > 0:
                     if chain is None:
@@ -170,10 +174,13 @@ async def _destroy(file, force, filter_chain, filter_root_chain, mako_directorie
                                      datacenter, chain, filter_chain)
                         continue
 
-                try:
-                    entrypoint_labels = await client.get_api_labels(chain=chain)
+                filtered_chains.append(chain)
+
+            chains = filtered_chains
 
-                except Exception as err:
+            # API labels are requested concurrently and processed as they arrive.
+            async for (chain, entrypoint_labels, err) in client.fan_out(client.get_api_labels, chains):
+                if err is not None:
                     error = overlord.util.get_error(err)
                     error_type = error.get("type")
                     error_message = error.get("message")
@@ -50,18 +50,31 @@ from overlord.sysexits import EX_OK, EX_NOINPUT, EX_SOFTWARE, EX_USAGE
 
 logger = logging.getLogger(__name__)
 
+# Options that filter or paginate the logs. Each one is only valid for these types.
+LOG_OPTIONS = {
+    "projects:logs" : ("date", "service", "offset", "limit"),
+    "jails:logs" : ("log-type", "entity", "log-subtype", "offset", "limit")
+}
+
 @overlord.commands.cli.command(add_help_option=False)
 @click.option("-f", "--file", required=True)
-@click.option("-t", "--type", required=True, type=click.Choice(("jails", "projects", "chains", "chains:tree", "chains:stats", "projects:logs", "jails:logs", "metadata", "namespaces", "autoscale", "vm")))
+@click.option("-t", "--type", required=True, type=click.Choice(("jails", "projects", "chains", "chains:tree", "chains:stats", "cluster:stats", "projects:logs", "jails:logs", "metadata", "namespaces", "autoscale", "vm")))
 @click.option("--jail-item", multiple=True, default=[], type=click.Choice(["stats", "info", "cpuset", "devfs", "expose", "healthcheck", "limits", "fstab", "labels", "nat", "volumes"]))
 @click.option("--all-labels", is_flag=True, default=False)
 @click.option("--filter", default=[], multiple=True)
 @click.option("--filter-per-project", is_flag=True, default=False)
 @click.option("--use-autoscale-labels", is_flag=True, default=False)
+@click.option("--date", default=None)
+@click.option("--service", default=None)
+@click.option("--log-type", default=None)
+@click.option("--entity", default=None)
+@click.option("--log-subtype", default=None)
+@click.option("--offset", default=None, type=click.IntRange(min=0))
+@click.option("--limit", default=None, type=click.IntRange(min=1))
 def get_info(*args, **kwargs):
     asyncio.run(_get_info(*args, **kwargs))
 
-async def _get_info(file, type, jail_item, all_labels, filter, filter_per_project, use_autoscale_labels):
+async def _get_info(file, type, jail_item, all_labels, filter, filter_per_project, use_autoscale_labels, date, service, log_type, entity, log_subtype, offset, limit):
     try:
         tree_chain = {}
 
@@ -77,6 +90,18 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
         else:
             labels = overlord.spec.get_deployIn_labels()
 
+        filter = get_filter(type, filter, filter_per_project)
+
+        check_log_options(type, {
+            "date" : date,
+            "service" : service,
+            "log-type" : log_type,
+            "entity" : entity,
+            "log-subtype" : log_subtype,
+            "offset" : offset,
+            "limit" : limit
+        })
+
         entrypoints = overlord.spec.get_deployIn_entrypoints()
 
         for entrypoint in entrypoints:
@@ -123,15 +148,19 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
                 pretty_exc=False,
                 limits=httpx.Limits(**limits_settings),
                 timeout=httpx.Timeout(**timeout_settings),
+                fan_out_concurrency=overlord.spec.get_datacenter_fan_out_concurrency(datacenter),
+                fan_out_timeout=overlord.spec.get_datacenter_fan_out_timeout(datacenter),
                 **kwargs
             )
 
             chains = [chain]
 
-            async for _chain in client.get_all_chains(chain=chain):
-                chains.append(_chain)
+            # Each server adds up the stats of its own chains, so they are not discovered here.
+            if type != "cluster:stats":
+                async for _chain in client.get_all_chains(chain=chain):
+                    chains.append(_chain)
 
-            for chain in chains:
+            async def process_chain(chain):
                 entrypoint_labels = []
 
                 if not all_labels:
@@ -145,7 +174,7 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
 
                         logger.warning("(datacenter:%s, chain:%s, exception:%s) error obtaining API labels: %s",
                                        datacenter, chain, error_type, error_message)
-                        continue
+                        return
 
                     exclude = False
 
@@ -159,7 +188,7 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
                             break
 
                     if exclude:
-                        continue
+                        return
 
                     match = False
 
@@ -173,7 +202,7 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
                             break
 
                     if not match:
-                        continue
+                        return
 
                 info = {
                     "datacenter" : entrypoint,
@@ -182,57 +211,32 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
                     "labels" : entrypoint_labels
                 }
 
+                # Each function below collects everything it needs before printing
+                # anything, so the output of concurrent chains is not interleaved.
                 if type == "jails":
                     await print_info_jails(client, chain, info, jail_item, filter)
 
                 elif type == "chains:stats":
                     if not match_pattern(chain, filter):
-                        continue
+                        return
 
                     await print_info_chains_stats(client, chain, info)
 
-                elif type == "projects":
-                    if filter_per_project:
-                        kind = overlord.spec.get_kind()
-
-                        if kind == overlord.spec.OverlordKindTypes.PROJECT.value:
-                            projectName = overlord.spec.director_project.get_projectName()
-
-                            if projectName is None:
-                                logger.warning("Project is not specified in the deployment file!")
-                                sys.exit(EX_OK)
-
-                            filter = [projectName]
-
-                        elif kind == overlord.spec.OverlordKindTypes.VMJAIL.value:
-                            vmName = overlord.spec.vm_jail.get_vmName()
-
-                            if vmName is None:
-                                logger.warning("VM name is not specified in the deployment file!")
-                                sys.exit(EX_OK)
-
-                            filter = [vmName]
-
-                        elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
-                            appName = overlord.spec.app_config.get_appName()
-
-                            if appName is None:
-                                logger.warning("Application name is not specified in the deployment file!")
-                                sys.exit(EX_OK)
-
-                            filter = [appName]
+                elif type == "cluster:stats":
+                    await print_info_cluster_stats(client, chain, info)
 
+                elif type == "projects":
                     await print_info_projects(client, chain, info, filter)
 
                 elif type == "chains":
                     if not match_pattern(chain, filter):
-                        continue
+                        return
 
                     print_header(info)
 
                 elif type == "chains:tree":
                     if chain is None:
-                        continue
+                        return
 
                     if entrypoint not in tree_chain:
                         tree_chain[entrypoint] = {}
@@ -246,102 +250,168 @@ async def _get_info(file, type, jail_item, all_labels, filter, filter_per_projec
                         _root = _root[_chain]
 
                 elif type == "projects:logs":
-                    await print_info_projects_logs(client, chain, info, filter)
+                    await print_info_projects_logs(client, chain, info, filter, date, service, offset, limit)
 
                 elif type == "jails:logs":
-                    await print_info_jails_logs(client, chain, info, filter)
+                    await print_info_jails_logs(client, chain, info, filter, log_type, entity, log_subtype, offset, limit)
 
                 elif type == "metadata":
-                    if len(filter) == 0:
-                        metadata = overlord.spec.metadata.get_metadata()
+                    await print_info_metadata(client, chain, info, filter)
 
-                        if metadata is None:
-                            filter = []
+                elif type == "namespaces":
+                    await print_info_namespaces(client, chain, info, filter)
 
-                        else:
-                            filter = list(metadata)
-                            filter = [escape_filter(x) for x in filter]
+                elif type == "autoscale":
+                    await print_info_autoscale(client, chain, info, filter)
 
-                    await print_info_metadata(client, chain, info, filter)
+                elif type == "vm":
+                    await print_info_vm(client, chain, info, filter)
 
-                elif type == "namespaces":
-                    if len(filter) == 0:
-                        namespace_struct = overlord.spec.metadata.get_namespace()
+            # The work done for each chain can take a while with many jails or
+            # projects, so there is no time limit other than the client's.
+            async for (chain, _, err) in client.fan_out(process_chain, chains, timeout=0):
+                if err is None:
+                    continue
 
-                        if namespace_struct is None:
-                            filter = []
+                error = overlord.util.get_error(err)
+                error_type = error.get("type")
+                error_message = error.get("message")
 
-                        else:
-                            namespace = escape_filter(namespace_struct["name"])
-                            filter = [namespace]
+                logger.warning("(datacenter:%s, chain:%s, exception:%s) error obtaining the information: %s",
+                               datacenter, chain, error_type, error_message)
 
-                    await print_info_namespaces(client, chain, info, filter)
+        if tree_chain:
+            tree = asciitree.LeftAligned()
 
-                elif type == "autoscale":
-                    if filter_per_project:
-                        kind = overlord.spec.get_kind()
+            print(tree(tree_chain))
 
-                        if kind == overlord.spec.OverlordKindTypes.PROJECT.value:
-                            projectName = overlord.spec.director_project.get_projectName()
+    except Exception as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
 
-                            if projectName is None:
-                                logger.warning("Project is not specified in the deployment file!")
-                                sys.exit(EX_OK)
+        logger.exception("(exception:%s) %s:", error_type, error_message)
 
-                            filter = [projectName]
+        sys.exit(EX_SOFTWARE)
 
-                        elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
-                            appName = overlord.spec.app_config.get_appName()
+def check_log_options(type, options):
+    for option, value in options.items():
+        if value is None:
+            continue
 
-                            if appName is None:
-                                logger.warning("Application name is not specified in the deployment file!")
-                                sys.exit(EX_OK)
+        if option not in LOG_OPTIONS.get(type, ()):
+            logger.error("--%s cannot be used with the type '%s'!", option, type)
+            sys.exit(EX_USAGE)
 
-                            filter = [appName]
+def get_filter(type, filter, filter_per_project):
+    if type == "projects":
+        if filter_per_project:
+            kind = overlord.spec.get_kind()
 
-                    if len(filter) == 0:
-                        logger.error("Autoscale requires you define at least one filter!")
-                        sys.exit(EX_USAGE)
+            if kind == overlord.spec.OverlordKindTypes.PROJECT.value:
+                projectName = overlord.spec.director_project.get_projectName()
 
-                    await print_info_autoscale(client, chain, info, filter)
+                if projectName is None:
+                    logger.warning("Project is not specified in the deployment file!")
+                    sys.exit(EX_OK)
 
-                elif type == "vm":
-                    if filter_per_project:
-                        kind = overlord.spec.get_kind()
+                filter = [projectName]
 
-                        if kind == overlord.spec.OverlordKindTypes.VMJAIL.value:
-                            vmName = overlord.spec.vm_jail.get_vmName()
+            elif kind == overlord.spec.OverlordKindTypes.VMJAIL.value:
+                vmName = overlord.spec.vm_jail.get_vmName()
 
-                            if vmName is None:
-                                logger.warning("VM name is not specified in the deployment file!")
-                                sys.exit(EX_OK)
+                if vmName is None:
+                    logger.warning("VM name is not specified in the deployment file!")
+                    sys.exit(EX_OK)
 
-                            filter = [vmName]
+                filter = [vmName]
 
-                        elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
-                            appName = overlord.spec.app_config.get_appName()
+            elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
+                appName = overlord.spec.app_config.get_appName()
 
-                            if appName is None:
-                                logger.warning("Application name is not specified in the deployment file!")
-                                sys.exit(EX_OK)
+                if appName is None:
+                    logger.warning("Application name is not specified in the deployment file!")
+                    sys.exit(EX_OK)
 
-                            filter = [appName]
+                filter = [appName]
 
-                    await print_info_vm(client, chain, info, filter)
+    elif type == "metadata":
+        if len(filter) == 0:
+            metadata = overlord.spec.metadata.get_metadata()
 
-        if tree_chain:
-            tree = asciitree.LeftAligned()
+            if metadata is None:
+                filter = []
 
-            print(tree(tree_chain))
+            else:
+                filter = list(metadata)
+                filter = [escape_filter(x) for x in filter]
 
-    except Exception as err:
-        error = overlord.util.get_error(err)
-        error_type = error.get("type")
-        error_message = error.get("message")
+    elif type == "cluster:stats":
+        # The total is computed by the servers, so the chains that make it up cannot be chosen.
+        if len(filter) > 0 or filter_per_project:
+            logger.error("The stats of the cluster cannot be filtered!")
+            sys.exit(EX_USAGE)
 
-        logger.exception("(exception:%s) %s:", error_type, error_message)
+    elif type == "namespaces":
+        if len(filter) == 0:
+            namespace_struct = overlord.spec.metadata.get_namespace()
 
-        sys.exit(EX_SOFTWARE)
+            if namespace_struct is None:
+                filter = []
+
+            else:
+                namespace = escape_filter(namespace_struct["name"])
+                filter = [namespace]
+
+    elif type == "autoscale":
+        if filter_per_project:
+            kind = overlord.spec.get_kind()
+
+            if kind == overlord.spec.OverlordKindTypes.PROJECT.value:
+                projectName = overlord.spec.director_project.get_projectName()
+
+                if projectName is None:
+                    logger.warning("Project is not specified in the deployment file!")
+                    sys.exit(EX_OK)
+
+                filter = [projectName]
+
+            elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
+                appName = overlord.spec.app_config.get_appName()
+
+                if appName is None:
+                    logger.warning("Application name is not specified in the deployment file!")
+                    sys.exit(EX_OK)
+
+                filter = [appName]
+
+        if len(filter) == 0:
+            logger.error("Autoscale requires you define at least one filter!")
+            sys.exit(EX_USAGE)
+
+    elif type == "vm":
+        if filter_per_project:
+            kind = overlord.spec.get_kind()
+
+            if kind == overlord.spec.OverlordKindTypes.VMJAIL.value:
+                vmName = overlord.spec.vm_jail.get_vmName()
+
+                if vmName is None:
+                    logger.warning("VM name is not specified in the deployment file!")
+                    sys.exit(EX_OK)
+
+                filter = [vmName]
+
+            elif kind == overlord.spec.OverlordKindTypes.APPCONFIG.value:
+                appName = overlord.spec.app_config.get_appName()
+
+                if appName is None:
+                    logger.warning("Application name is not specified in the deployment file!")
+                    sys.exit(EX_OK)
+
+                filter = [appName]
+
+    return filter
 
 def match_pattern(value, patterns):
     if not patterns:
@@ -420,6 +490,43 @@ async def print_info_chains_stats(client, chain, api_info):
 
         print(f"    {name}: {value}")
 
+async def print_info_cluster_stats(client, chain, api_info):
+    info = {}
+    info.update(api_info)
+
+    cluster = await _safe_client(client, "get_cluster_stats", chain=chain)
+
+    if cluster is None:
+        return
+
+    print_header(info)
+
+    print("  total:")
+
+    for name, value in cluster.get("total", {}).items():
+        value = _get_rctl_humanvalue(name, value)
+
+        print(f"    {name}: {value}")
+
+    print_chains = True
+
+    for (_chain, node) in overlord.client.walk_chains_tree(cluster, chain):
+        if print_chains:
+            print("  chains:")
+
+            print_chains = False
+
+        print(f"    {_chain}:")
+
+        if "error" in node:
+            print(f"      error: {node['error']}: {node.get('message')}")
+            continue
+
+        for name, value in node.get("stats", {}).items():
+            value = _get_rctl_humanvalue(name, value)
+
+            print(f"      {name}: {value}")
+
 async def print_info_vm(client, chain, api_info, projects):
     info = {}
     info.update(api_info)
@@ -632,22 +739,54 @@ async def print_info_jails(client, chain, api_info, items, patterns):
     if jails is None:
         return
 
-    for jail in jails:
-        if not match_pattern(jail, patterns):
-            continue
+    jails = [jail for jail in jails if match_pattern(jail, patterns)]
 
-        info["jails"][jail] = {}
+    if not items:
+        sections = ["stats", "info", "cpuset", "devfs", "expose", "healthcheck", "limits", "fstab", "labels", "nat", "volumes"]
 
-        functions = []
+    else:
+        sections = list(items)
 
-        if not items:
-            functions.extend(["get_stats", "get_info", "get_cpuset", "get_devfs", "get_expose", "get_healthcheck", "get_limits", "get_fstab", "get_labels", "get_nat", "get_volumes"])
+    details = None
+
+    if len(jails) > 0:
+        # Without patterns, the server already returns all the jails, so there is no need to
+        # send a long list of names.
+        if len(patterns) > 0:
+            details_jails = jails
 
         else:
-            for item in items:
-                functions.append(f"get_{item}")
+            details_jails = None
+
+        try:
+            details = await client.get_jails_details(details_jails, sections, chain=chain)
+
+        except Exception as err:
+            # The server (or a chain in between) doesn't know about details yet, so
+            # each section is requested separately.
+            if not isinstance(err, httpx.HTTPStatusError) \
+                    or err.response.status_code != 404:
+                error = overlord.util.get_error(err)
+                error_type = error.get("type")
+                error_message = error.get("message")
+
+                logger.warning("(function:get_jails_details, exception:%s) error executing the remote call: %s",
+                               error_type, error_message)
+                return
+
+    for jail in jails:
+        info["jails"][jail] = {}
+
+        if details is not None:
+            for section, result in details.get(jail, {}).items():
+                if result is not None:
+                    info["jails"][jail][f"get_{section}"] = result
+
+            continue
+
+        for section in sections:
+            func = f"get_{section}"
 
-        for func in functions:
             result = await _safe_client(client, func, jail, chain=chain)
 
             if result is not None:
@@ -870,12 +1009,14 @@ async def print_info_projects(client, chain, api_info, projects):
                     else:
                         print(f"        {key}: {value}")
 
-async def print_info_projects_logs(client, chain, api_info, patterns):
-    logs = await _safe_client(client, "get_projects_logs", chain=chain)
+async def print_info_projects_logs(client, chain, api_info, patterns, date=None, service=None, offset=None, limit=None):
+    page = await _safe_client(client, "get_projects_logs_page", date=date, service=service, offset=offset, limit=limit, chain=chain)
 
-    if logs is None:
+    if page is None:
         return
 
+    logs = page.get("logs", {})
+
     files = []
 
     for date, services in logs.items():
@@ -888,7 +1029,9 @@ async def print_info_projects_logs(client, chain, api_info, patterns):
 
                 files.append(log_file)
 
-    if len(files) == 0:
+    next_offset = page.get("next_offset")
+
+    if len(files) == 0 and next_offset is None:
         logger.debug("(datacenter:%s, chain:%s) nothing to show.",
                      api_info.get("datacenter"), api_info.get("chain"))
         return
@@ -900,12 +1043,17 @@ async def print_info_projects_logs(client, chain, api_info, patterns):
     for log_file in files:
         print(f"    - {log_file}")
 
-async def print_info_jails_logs(client, chain, api_info, patterns):
-    logs = await _safe_client(client, "get_jails_logs", chain=chain)
+    if next_offset is not None:
+        print(f"  next_offset: {next_offset}")
+
+async def print_info_jails_logs(client, chain, api_info, patterns, type=None, entity=None, subtype=None, offset=None, limit=None):
+    page = await _safe_client(client, "get_jails_logs_page", type=type, entity=entity, subtype=subtype, offset=offset, limit=limit, chain=chain)
 
-    if logs is None:
+    if page is None:
         return
 
+    logs = page.get("logs", {})
+
     files = []
 
     for type, entities in logs.items():
@@ -919,7 +1067,9 @@ async def print_info_jails_logs(client, chain, api_info, patterns):
 
                     files.append(log_file)
 
-    if len(files) == 0:
+    next_offset = page.get("next_offset")
+
+    if len(files) == 0 and next_offset is None:
         logger.debug("(datacenter:%s, chain:%s) nothing to show.",
                      api_info.get("datacenter"), api_info.get("chain"))
         return
@@ -931,6 +1081,9 @@ async def print_info_jails_logs(client, chain, api_info, patterns):
     for log_file in files:
         print(f"    - {log_file}")
 
+    if next_offset is not None:
+        print(f"  next_offset: {next_offset}")
+
 def print_header(info):
     datacenter = info.get("datacenter")
     entrypoint = info.get("entrypoint")
@@ -50,11 +50,13 @@ logger = logging.getLogger(__name__)
 @click.option("-d", "--date", required=True)
 @click.option("-s", "--service", required=True)
 @click.option("-l", "--log", required=True)
+@click.option("--tail", type=int, default=None)
+@click.option("--follow", is_flag=True, default=False)
 @click.argument("entrypoint")
 def get_project_log(*args, **kwargs):
     asyncio.run(_get_project_log(*args, **kwargs))
 
-async def _get_project_log(file, date, service, log, entrypoint):
+async def _get_project_log(file, date, service, log, tail, follow, entrypoint):
     try:
         overlord.process.init()
 
@@ -105,9 +107,19 @@ async def _get_project_log(file, date, service, log, entrypoint):
             **kwargs
         )
 
-        log_content = await client.get_project_log(date, service, log, chain=chain)
+        if follow:
+            async for log_content in client.follow_project_log(date, service, log, tail=tail, chain=chain):
+                print(log_content, end="", flush=True)
 
-        print(log_content)
+        elif tail is not None:
+            log_content = await client.get_project_log(date, service, log, tail=tail, chain=chain)
+
+            print(log_content, end="")
+
+        else:
+            log_content = await client.get_project_log(date, service, log, chain=chain)
+
+            print(log_content)
 
     except Exception as err:
         error = overlord.util.get_error(err)
@@ -124,11 +136,13 @@ async def _get_project_log(file, date, service, log, entrypoint):
 @click.option("-e", "--entity", required=True)
 @click.option("-s", "--subtype", required=True)
 @click.option("-l", "--log", required=True)
+@click.option("--tail", type=int, default=None)
+@click.option("--follow", is_flag=True, default=False)
 @click.argument("entrypoint", type=str)
 def get_jail_log(*args, **kwargs):
     asyncio.run(_get_jail_log(*args, **kwargs))
 
-async def _get_jail_log(file, type, entity, subtype, log, entrypoint):
+async def _get_jail_log(file, type, entity, subtype, log, tail, follow, entrypoint):
     try:
         overlord.process.init()
 
@@ -169,9 +183,19 @@ async def _get_jail_log(file, type, entity, subtype, log, entrypoint):
             timeout=httpx.Timeout(**timeout_settings)
         )
 
-        log_content = await client.get_jail_log(type, entity, subtype, log, chain=chain)
+        if follow:
+            async for log_content in client.follow_jail_log(type, entity, subtype, log, tail=tail, chain=chain):
+                print(log_content, end="", flush=True)
+
+        elif tail is not None:
+            log_content = await client.get_jail_log(type, entity, subtype, log, tail=tail, chain=chain)
+
+            print(log_content, end="")
+
+        else:
+            log_content = await client.get_jail_log(type, entity, subtype, log, chain=chain)
 
-        print(log_content)
+            print(log_content)
 
     except Exception as err:
         error = overlord.util.get_error(err)
@@ -28,6 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import asyncio
+import concurrent.futures
 import hashlib
 import json
 import logging
@@ -57,6 +58,8 @@ logger = logging.getLogger(__name__)
 
 AUTOSCALE_CHANGES = {}
 AUTOSCALE_LOGS = {}
+# The same as overlord-serve.
+BATCH_MAX_REQUESTS = 100
 
 @overlord.commands.cli.command(add_help_option=False)
 def poll_heartbeat(*args, **kwargs):
@@ -328,12 +331,12 @@ async def scale_project(client, project_name, options, force):
     async for _chain in client.get_all_chains(on_fail=count_fails):
         chains.append(_chain)
 
-    for chain in chains:
+    async def check_chain(chain):
         try:
             if not await match_label(client, chain, labels):
                 logger.debug("(chain:%s, project:%s, labels:%s) ignoring ...",
                              chain, project_name, labels)
-                continue
+                return
 
         except Exception as err:
             count_fails()
@@ -344,10 +347,10 @@ async def scale_project(client, project_name, options, force):
 
             logger.exception("(chain:%s, project:%s, exception:%s) %s",
                              chain, project_name, error_type, error_message)
-            continue
+            return
 
         try:
-            (context, health) = await check_project(client, project_name, chain)
+            return await check_project(client, project_name, chain)
 
         except Exception as err:
             count_fails()
@@ -358,8 +361,23 @@ async def scale_project(client, project_name, options, force):
 
             logger.exception("(chain:%s, project:%s, exception:%s) %s", chain, project_name, error_type, error_message)
 
+    async for (chain, result, err) in client.fan_out(check_chain, chains):
+        if err is not None:
+            count_fails()
+
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.warning("(chain:%s, project:%s, exception:%s) %s", chain, project_name, error_type, error_message)
+
             continue
 
+        if result is None:
+            continue
+
+        (context, health) = result
+
         if health:
             good["count"] += 1
             good["nodes"].append(chain)
@@ -654,6 +672,11 @@ async def scale_project(client, project_name, options, force):
 
         logger.debug("(project:%s) processing rules ...", project_name)
 
+        cluster_stats = None
+
+        if economy is not None:
+            cluster_stats = await get_cluster_stats(client)
+
         for chain in good["nodes"]:
             try:
                 test = True
@@ -671,7 +694,7 @@ async def scale_project(client, project_name, options, force):
                     log.append(response)
 
                 if test and economy is not None:
-                    test = await test_economy(client, project_name, chain, economy)
+                    test = await test_economy(client, project_name, chain, economy, cluster_stats)
 
                     response = {
                         "project" : project_name,
@@ -1004,8 +1027,38 @@ def test_load_balancer_rule(project_name, current, name, value, each):
 
     return result
 
-async def test_economy(client, project_name, chain, rules):
-    stats = await client.get_server_stats(chain=chain)
+async def get_cluster_stats(client):
+    try:
+        # The stats of every chain in a single request instead of one for each chain.
+        cluster = await client.get_cluster_stats()
+
+    except Exception as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
+
+        logger.debug("(exception:%s) cluster stats not available, falling back to individual requests: %s",
+                     error_type, error_message)
+
+        return {}
+
+    cluster_stats = {}
+
+    if "stats" in cluster:
+        cluster_stats[None] = cluster["stats"]
+
+    for (chain, node) in overlord.client.walk_chains_tree(cluster):
+        if "stats" in node:
+            cluster_stats[chain] = node["stats"]
+
+    return cluster_stats
+
+async def test_economy(client, project_name, chain, rules, cluster_stats=None):
+    if cluster_stats is not None and chain in cluster_stats:
+        stats = cluster_stats[chain]
+
+    else:
+        stats = await client.get_server_stats(chain=chain)
 
     if len(stats) == 0:
         return False
@@ -1023,6 +1076,52 @@ async def test_economy(client, project_name, chain, rules):
 
     return True
 
+async def get_jails_stats(client, jails, chain):
+    jails_stats = {}
+
+    for index in range(0, len(jails), BATCH_MAX_REQUESTS):
+        batch_jails = jails[index:index + BATCH_MAX_REQUESTS]
+
+        try:
+            # A single request instead of two for each jail.
+            responses = await client.batch([{ "path" : f"jail/stats/{jail}" } for jail in batch_jails], chain=chain)
+
+        except overlord.exceptions.ResourceNotFound as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            # Only servers that don't know about batches. Any other error would only get
+            # worse with more requests.
+            logger.debug("(chain:%s, exception:%s) batch not available, falling back to individual requests: %s",
+                         chain, error_type, error_message)
+
+            return await get_jails_stats_individually(client, jails, chain)
+
+        for jail, response in zip(batch_jails, responses):
+            status_code = response.get("status_code")
+
+            if status_code == 404:
+                return
+
+            elif status_code != 200:
+                raise overlord.exceptions.APIError(f"Error {status_code}: {response.get('message')}")
+
+            jails_stats[jail] = response.get("stats", {})
+
+    return jails_stats
+
+async def get_jails_stats_individually(client, jails, chain):
+    jails_stats = {}
+
+    for jail in jails:
+        if not await client.check(jail, chain=chain):
+            return
+
+        jails_stats[jail] = await client.get_stats(jail, chain=chain)
+
+    return jails_stats
+
 async def test_rctl(client, project_name, chain, type, value, rules):
     if not await client.check(project_name, type=overlord.client.OverlordEntityTypes.PROJECT, chain=chain):
         return False
@@ -1047,12 +1146,13 @@ async def test_rctl(client, project_name, chain, type, value, rules):
         if service_status != 0:
             return False
 
-        service_jail = service_info["jail"]
+    jails_stats = await get_jails_stats(client, [service_info["jail"] for service_info in services], chain)
 
-        if not await client.check(service_jail, chain=chain):
-            return False
+    if jails_stats is None:
+        return False
 
-        stats = await client.get_stats(service_jail, chain=chain)
+    for service_info in services:
+        stats = jails_stats[service_info["jail"]]
 
         if len(stats) == 0:
             return False
@@ -1308,6 +1408,8 @@ def poll_jail_info():
     try:
         overlord.process.init()
 
+        executor = concurrent.futures.ThreadPoolExecutor(overlord.config.get_polling_concurrency())
+
         while True:
             interval = overlord.config.get_polling_jail_info() + overlord.util.get_skew()
 
@@ -1317,14 +1419,20 @@ def poll_jail_info():
 
             jails = overlord.cache.get_jails()
 
-            for jail in jails:
-                (rc, info) = overlord.jail.info(jail)
+            jails_info = {}
 
+            # Each jail requires running at least one process, so they are run
+            # concurrently to complete a full sweep in a fraction of the interval.
+            results = executor.map(overlord.jail.info, jails)
+
+            for jail, (rc, info) in zip(jails, results):
                 if rc != 0:
                     logger.warning("(status:%d, jail:%s) error when retrieving information about the jail", rc, jail)
                     continue
 
-                overlord.cache.save_jail_info(jail, info)
+                jails_info[jail] = info
+
+            overlord.cache.save_jails_info(jails_info)
 
             time.sleep(interval)
 
@@ -1381,6 +1489,11 @@ def poll_jail_extras(item):
         while True:
             jails = overlord.cache.get_jails()
 
+            extras = {}
+
+            for item in flags:
+                extras[item] = {}
+
             for jail in jails:
                 if flags.get("cpuset") \
                         and check_adaptive_polling("cpuset", data=adaptive["cpuset"]) \
@@ -1391,7 +1504,7 @@ def poll_jail_extras(item):
                         logger.warning("(status:%d, jail:%s) error when retrieving CPU sets", rc, jail)
 
                     else:
-                        overlord.cache.save_jail_cpuset(jail, cpuset)
+                        extras["cpuset"][jail] = cpuset
 
                 if flags.get("devfs") \
                         and check_adaptive_polling("devfs", data=adaptive["devfs"]):
@@ -1408,7 +1521,7 @@ def poll_jail_extras(item):
 
                             data.append(devfs)
 
-                        overlord.cache.save_jail_devfs(jail, data)
+                        extras["devfs"][jail] = data
 
                 if flags.get("expose") \
                         and check_adaptive_polling("expose", data=adaptive["expose"]):
@@ -1425,7 +1538,7 @@ def poll_jail_extras(item):
 
                             data.append(expose)
 
-                        overlord.cache.save_jail_expose(jail, data)
+                        extras["expose"][jail] = data
 
                 if flags.get("healthcheck") \
                         and check_adaptive_polling("healthcheck", data=adaptive["healthcheck"]):
@@ -1442,7 +1555,7 @@ def poll_jail_extras(item):
 
                             data.append(healthcheck)
 
-                        overlord.cache.save_jail_healthcheck(jail, data)
+                        extras["healthcheck"][jail] = data
 
                 if flags.get("limits") \
                         and check_adaptive_polling("limits", data=adaptive["limits"]):
@@ -1459,7 +1572,7 @@ def poll_jail_extras(item):
 
                             data.append(limits)
 
-                        overlord.cache.save_jail_limits(jail, data)
+                        extras["limits"][jail] = data
 
                 if flags.get("fstab") \
                         and check_adaptive_polling("fstab", data=adaptive["fstab"]):
@@ -1476,7 +1589,7 @@ def poll_jail_extras(item):
 
                             data.append(fstab)
 
-                        overlord.cache.save_jail_fstab(jail, data)
+                        extras["fstab"][jail] = data
 
                 if flags.get("label") \
                         and check_adaptive_polling("label", data=adaptive["label"]):
@@ -1493,7 +1606,7 @@ def poll_jail_extras(item):
 
                             data.append(label)
 
-                        overlord.cache.save_jail_label(jail, data)
+                        extras["label"][jail] = data
 
                 if flags.get("nat") \
                         and check_adaptive_polling("nat", data=adaptive["nat"]):
@@ -1510,7 +1623,7 @@ def poll_jail_extras(item):
 
                             data.append(entries)
 
-                        overlord.cache.save_jail_nat(jail, data)
+                        extras["nat"][jail] = data
 
                 if flags.get("volume") \
                         and check_adaptive_polling("volume", data=adaptive["volume"]):
@@ -1527,7 +1640,9 @@ def poll_jail_extras(item):
 
                             data.append(entries)
 
-                        overlord.cache.save_jail_volume(jail, data)
+                        extras["volume"][jail] = data
+
+            overlord.cache.save_jails_extras(extras)
 
             time.sleep(overlord.config.get_polling_jail_extras() + overlord.util.get_skew())
 
@@ -1551,6 +1666,8 @@ def poll_jail_stats():
     try:
         overlord.process.init()
 
+        executor = concurrent.futures.ThreadPoolExecutor(overlord.config.get_polling_concurrency())
+
         while True:
             interval = overlord.config.get_polling_jail_stats() + overlord.util.get_skew()
 
@@ -1560,18 +1677,30 @@ def poll_jail_stats():
 
             jails = overlord.cache.get_jails()
 
-            for jail in jails:
-                if overlord.jail.status(jail) != 0:
-                    overlord.cache.remove_jail_stats(jail)
-                    continue
+            jails_stats = {}
+            stopped = []
+
+            running = overlord.jail.get_running()
 
-                (rc, stats) = overlord.jail.stats(jail)
+            if running is None:
+                results = executor.map(get_jail_stats, jails)
+
+            else:
+                results = executor.map(lambda jail: get_jail_stats(jail, running), jails)
+
+            for jail, (is_running, rc, stats) in zip(jails, results):
+                if not is_running:
+                    stopped.append(jail)
+                    continue
 
                 if rc != 0:
                     logger.warning("(status:%d, jail:%s) error when retrieving the metrics", rc, jail)
                     continue
 
-                overlord.cache.save_jail_stats(jail, stats)
+                jails_stats[jail] = stats
+
+            overlord.cache.remove_jails_stats(stopped)
+            overlord.cache.save_jails_stats(jails_stats)
 
             time.sleep(interval)
 
@@ -1584,6 +1713,18 @@ def poll_jail_stats():
 
         sys.exit(EX_SOFTWARE)
 
+def get_jail_stats(jail, running=None):
+    if running is None:
+        if overlord.jail.status(jail) != 0:
+            return (False, 0, None)
+
+    elif jail not in running:
+        return (False, 0, None)
+
+    (rc, stats) = overlord.jail.stats(jail)
+
+    return (True, rc, stats)
+
 @overlord.commands.cli.command(add_help_option=False)
 def poll_projects():
     check_director()
@@ -1637,6 +1778,8 @@ def poll_project_info():
 
             projects = overlord.cache.get_projects()
 
+            projects_info = {}
+
             for project in projects:
                 (rc, info) = overlord.director.describe(project)
 
@@ -1644,7 +1787,9 @@ def poll_project_info():
                     logger.warning("(status:%d, project:%s) error when retrieving information about the project", rc, project)
                     continue
 
-                overlord.cache.save_project_info(project, info)
+                projects_info[project] = info
+
+            overlord.cache.save_projects_info(projects_info)
 
             time.sleep(interval)
 
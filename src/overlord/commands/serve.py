@@ -28,10 +28,15 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import asyncio
+import contextlib
+import copy
+import functools
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import re
 import time
 import shutil
 import ssl
@@ -40,13 +45,21 @@ import aiofiles
 import click
 import httpx
 import tornado
+import tornado.httpserver
+import tornado.iostream
+import tornado.netutil
+import tornado.process
 
-import overlord.cache
+import overlord.aiocache
 import overlord.chains
 import overlord.client
+import overlord.codec
 import overlord.commands
 import overlord.config
+import overlord.default
+import overlord.logindex
 import overlord.metadata
+import overlord.process
 import overlord.queue
 import overlord.spec
 import overlord.tornado
@@ -58,10 +71,216 @@ CHAINS = {}
 METADATA = {}
 NAMESPACES = {}
 DISABLE_COUNTERS = {}
+# Chains whose counter in memcached may have been seen or changed by this worker.
+DIRTY_COUNTERS = set()
+CHAIN_CALLS = {}
+CHAIN_RESPONSES = {}
+WORKERS = 1
+LOG_BLOCK_SIZE = 64 * 1024
+LOG_FOLLOW_INTERVAL = 0.25
+SUBSCRIBERS = set()
+EVENTS_TASK = None
+EVENTS_QUEUE_SIZE = 1024
+EVENTS_REPLAY_MAX = 1000
+EVENTS_GAP_TIMEOUT = 5
+# Must be lower than the read timeout of the chains relaying the events.
+EVENTS_KEEPALIVE = 5
+BATCH_MAX_REQUESTS = 100
+BATCH_CONCURRENCY = 10
+BATCH_METHODS = ("GET", "POST", "PUT", "DELETE")
+# Resources that never end or that would execute a batch inside another batch.
+BATCH_EXCLUDE = re.compile(r"^(chain/[^/]+/)?(batch|events)(/|$)")
+LOOPBACK = None
+CHAINS_TREE_MAX_DEPTH = 16
+STREAM_REQUEST_HEADERS = ("Content-Type", "If-None-Match")
+STREAM_RESPONSE_HEADERS = ("Content-Type", "Content-Encoding", "Etag", "Cache-Control")
 
 class InternalHandler(overlord.tornado.JSONAuthHandler):
-    def check_jail(self, jail):
-        if overlord.cache.check_jail(jail):
+    async def write_prerendered(self, name):
+        if not overlord.config.get_prerender():
+            return False
+
+        # The same condition used by Tornado to compress the response.
+        compressed = overlord.config.get_compress_response() \
+                and "gzip" in self.request.headers.get("Accept-Encoding", "")
+
+        prerendered = await overlord.aiocache.get_prerendered(name, compressed)
+
+        if prerendered is None:
+            # Not written by the pollers yet.
+            return False
+
+        (etag, body) = prerendered
+
+        self.set_header("Etag", f'"{etag}"')
+
+        if self.check_etag_header():
+            self.set_status(304)
+
+            return True
+
+        if compressed:
+            # Tornado doesn't compress responses that already have a Content-Encoding.
+            self.set_header("Content-Encoding", "gzip")
+
+        self.write(body)
+
+        return True
+
+    def check_cached_etag(self, *values):
+        # A strong validator derived from the raw cached values, so it only changes when a poller
+        # writes something different, and the response doesn't need to be rendered to compute it.
+        hasher = hashlib.sha1()
+
+        for value in values:
+            if value is None:
+                hasher.update(b"-")
+
+            else:
+                hasher.update(b"%d:" % len(value))
+                hasher.update(value)
+
+        self.set_header("Etag", f'"{hasher.hexdigest()}"')
+
+        if self.check_etag_header():
+            self.set_status(304)
+
+            return True
+
+        return False
+
+    def get_details_arguments(self):
+        jails = self.get_query_argument("jails", None)
+        sections = self.get_query_argument("sections", None)
+
+        if jails is not None:
+            jails = [jail for jail in jails.split(",") if jail != ""]
+
+        if sections is None:
+            sections = list(overlord.aiocache.JAIL_DETAILS)
+
+        else:
+            sections = [section for section in sections.split(",") if section != ""]
+
+            for section in sections:
+                if section not in overlord.aiocache.JAIL_DETAILS:
+                    raise tornado.web.HTTPError(400, reason=f"'{section}' is not a valid section.")
+
+        return (jails, sections)
+
+    def get_batch_arguments(self):
+        requests = self.get_json_argument("requests", valid_func=lambda v: isinstance(v, list) and len(v) > 0)
+
+        if len(requests) > BATCH_MAX_REQUESTS:
+            raise tornado.web.HTTPError(400, reason=f"No more than {BATCH_MAX_REQUESTS} requests can be executed at the same time.")
+
+        batch = []
+
+        for index, request in enumerate(requests):
+            if not isinstance(request, dict):
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} must be a dictionary.")
+
+            method = request.get("method", "GET")
+            path = request.get("path")
+            params = request.get("params", {})
+            body = request.get("body")
+
+            if method not in BATCH_METHODS:
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} has an invalid method.")
+
+            if not isinstance(path, str):
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} has an invalid path.")
+
+            path = path.strip("/")
+
+            if path.startswith("v1/"):
+                path = path[3:]
+
+            if path == "" or ".." in path.split("/") or "?" in path or "#" in path \
+                    or BATCH_EXCLUDE.match(path):
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} has an invalid path.")
+
+            if not isinstance(params, dict):
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} has invalid parameters.")
+
+            if body is not None and not isinstance(body, dict):
+                raise tornado.web.HTTPError(400, reason=f"Request #{index} has an invalid body.")
+
+            batch.append({
+                "method" : method,
+                "path" : path,
+                "params" : params,
+                "body" : body
+            })
+
+        return batch
+
+    def get_page_arguments(self):
+        offset = self.get_query_argument("offset", 0, value_type=int, valid_func=lambda v: v >= 0)
+        limit = self.get_query_argument("limit", None, value_type=int, valid_func=lambda v: v > 0)
+
+        return (offset, limit)
+
+    def get_log_arguments(self):
+        tail = self.get_query_argument("tail", None, value_type=int, valid_func=lambda v: v >= 0)
+        offset = self.get_query_argument("offset", None, value_type=int, valid_func=lambda v: v >= 0)
+        length = self.get_query_argument("length", None, value_type=int, valid_func=lambda v: v > 0)
+        follow = self.get_query_argument("follow", 0, value_type=int, valid_func=lambda v: v in (0, 1))
+
+        if tail is not None and offset is not None:
+            raise tornado.web.HTTPError(400, reason="'tail' and 'offset' cannot be used at the same time.")
+
+        if tail is None and offset is None and length is None and not follow:
+            # The whole log is returned as before.
+            return
+
+        return {
+            "tail" : tail,
+            "offset" : offset,
+            "length" : length,
+            "follow" : bool(follow)
+        }
+
+    async def write_log(self, pathname):
+        arguments = self.get_log_arguments()
+
+        if arguments is None:
+            async with aiofiles.open(pathname, "r") as fd:
+                content = await fd.read()
+
+            content = overlord.util.sansi(content)
+
+            self.write_template({
+                "log_content" : content
+            })
+
+            return
+
+        chunk = await read_log(pathname, **arguments)
+
+        self.write_template(chunk)
+
+    def start_events(self):
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+
+    def get_events_arguments(self):
+        return {
+            "since" : self.get_query_argument("since", None, value_type=int, valid_func=lambda v: v >= 0),
+            "type" : self.get_query_argument("type", None),
+            "name" : self.get_query_argument("name", None)
+        }
+
+    def write_event(self, event):
+        data = overlord.codec.encode(event).decode()
+
+        self.write(f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n")
+
+    def write_keepalive(self):
+        self.write(": keepalive\n\n")
+
+    async def check_jail(self, jail):
+        if await overlord.aiocache.check_jail(jail):
             return True
 
         else:
@@ -71,8 +290,8 @@ class InternalHandler(overlord.tornado.JSONAuthHandler):
 
             return False
 
-    def check_project(self, project):
-        if overlord.cache.check_project(project):
+    async def check_project(self, project):
+        if await overlord.aiocache.check_project(project):
             return True
 
         else:
@@ -108,9 +327,170 @@ class InternalHandler(overlord.tornado.JSONAuthHandler):
             return False
 
 class ChainInternalHandler(InternalHandler):
+    # Handlers that need to decode the response of the next hop must set this to False.
+    STREAM = True
+    # Small JSON resources set this to True, so concurrent identical reads share a single
+    # buffered response when streaming. The others are relayed chunk by chunk.
+    COALESCE = False
+
+    async def prepare(self):
+        await super().prepare()
+
+        if self._finished or not self.STREAM or not overlord.config.get_stream_chains():
+            return
+
+        if self.request.method == "OPTIONS":
+            return
+
+        (chain, *_) = self.path_args
+
+        await self.stream_call(chain)
+
+        if not self._finished:
+            self.finish()
+
     def get_chain(self, chain):
         return CHAINS.get(chain)
 
+    async def stream_call(self, chain):
+        (next_entrypoint, next_chain) = overlord.chains.get_chain(chain)
+
+        chain_cli = self.get_chain(next_entrypoint)
+
+        if chain_cli is None:
+            raise tornado.web.HTTPError(404, reason=f"Next entrypoint '{next_entrypoint}' cannot be found.")
+
+        # The resource is the same for the next hop, only the chain is shorter.
+        resource = self.request.path.split("/", 4)[4]
+
+        if len(next_chain) == 0:
+            tail = True
+
+            new_chain = None
+
+            url = f"/v1/{resource}"
+
+        else:
+            tail = False
+
+            new_chain = overlord.chains.join_chain(next_chain)
+
+            url = f"/v1/chain/{new_chain}/{resource}"
+
+        if self.request.query:
+            url = f"{url}?{self.request.query}"
+
+        headers = {
+            # The body is relayed as is, so it can only be compressed if the client accepts it.
+            "Accept-Encoding" : self.request.headers.get("Accept-Encoding", "identity")
+        }
+
+        for header in STREAM_REQUEST_HEADERS:
+            value = self.request.headers.get(header)
+
+            if value is not None:
+                headers[header] = value
+
+        logger.debug("(method:%s, resource:%s, entrypoint:%s, chain:%s) streaming ...",
+                     self.request.method, resource, next_entrypoint, new_chain)
+
+        # Reads are idempotent, so identical concurrent requests can share the same call, but
+        # the response must be buffered to relay it to each of them.
+        buffered = self.COALESCE and self.request.method == "GET"
+
+        if tail and overlord.config.get_autodisable_strict() and \
+                await check_autodisable_chain(next_entrypoint):
+            call = None
+
+        else:
+            call = functools.partial(self.relay_call, chain_cli, url, headers, buffered)
+
+        call = functools.partial(call_chain_relay, next_entrypoint, tail, call)
+
+        try:
+            if buffered:
+                key = ("stream", chain, resource, self.request.query, tuple(sorted(headers.items())))
+
+                # Responses are relayed as is, so they are not kept after the call.
+                relayed = await coalesce_chain_call(key, call, ttl=0)
+
+                self.write_relayed(relayed)
+
+            else:
+                await call()
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(method:%s, resource:%s, entrypoint:%s, chain:%s, exception:%s) error streaming the remote call: %s",
+                             self.request.method, resource, next_entrypoint, new_chain, error_type, error_message)
+
+            # Once the headers have been sent, the client can only notice the error by the
+            # incomplete body.
+            if not self._headers_written:
+                self.clear()
+
+                self.write_template({
+                    "resource" : resource,
+                    "entrypoint" : next_entrypoint,
+                    "chain" : new_chain,
+                    "error" : error_type,
+                    "message" : error_message
+                }, status_code=503)
+
+    async def relay_call(self, chain_cli, url, headers, buffered=False):
+        request = chain_cli.build_request(
+            self.request.method,
+            url,
+            headers=headers,
+            content=self.request.body or None
+        )
+
+        response = await chain_cli.send(request, stream=True)
+
+        try:
+            relayed = {
+                "status_code" : response.status_code,
+                "reason" : response.reason_phrase,
+                "headers" : {},
+                "body" : None
+            }
+
+            for header in STREAM_RESPONSE_HEADERS:
+                value = response.headers.get(header)
+
+                if value is not None:
+                    relayed["headers"][header] = value
+
+            if buffered:
+                relayed["body"] = b"".join([chunk async for chunk in response.aiter_raw()])
+
+                return relayed
+
+            self.write_relayed(relayed)
+
+            async for chunk in response.aiter_raw():
+                self.write(chunk)
+
+                await self.flush()
+
+            return relayed
+
+        finally:
+            await response.aclose()
+
+    def write_relayed(self, relayed):
+        self.set_status(relayed["status_code"], relayed["reason"])
+
+        for header, value in relayed["headers"].items():
+            self.set_header(header, value)
+
+        # Tornado refuses to send a body, even an empty one, with some status codes such as 304.
+        if relayed["body"]:
+            self.write(relayed["body"])
+
     async def remote_call(self, chain, func, *args, **kwargs):
         (next_entrypoint, next_chain) = overlord.chains.get_chain(chain)
 
@@ -126,11 +506,11 @@ class ChainInternalHandler(InternalHandler):
                          func, next_entrypoint)
 
             if overlord.config.get_autodisable_strict() and \
-                    check_autodisable_chain(next_entrypoint):
-                result = None
+                    await check_autodisable_chain(next_entrypoint):
+                call = None
 
             else:
-                result = getattr(chain_cli, func)(*args, **kwargs)
+                call = functools.partial(getattr(chain_cli, func), *args, **kwargs)
 
         else:
             tail = False
@@ -140,50 +520,26 @@ class ChainInternalHandler(InternalHandler):
             logger.debug("(function:%s, entrypoint:%s, chain:%s) connecting ...",
                          func, next_entrypoint, new_chain)
 
-            result = getattr(chain_cli, func)(*args, chain=new_chain, **kwargs)
+            call = functools.partial(getattr(chain_cli, func), *args, chain=new_chain, **kwargs)
+
+        call = functools.partial(call_chain, next_entrypoint, tail, call)
 
         try:
-            if result is None:
-                raise overlord.exceptions.UnavailableChain("Chain disabled by smart timeouts")
+            if self.request.method == "GET":
+                # Reads are idempotent, so identical concurrent requests can share the same call.
+                key = (chain, func, repr(args), repr(sorted(kwargs.items())))
 
-            return await result
+                return await coalesce_chain_call(key, call)
 
-        except Exception as err:
-            ignore_smart_timeout = False
+            else:
+                return await call()
 
+        except Exception as err:
             status_code = 503
 
             if isinstance(err, httpx.HTTPStatusError):
                 status_code = err.response.status_code
 
-                if status_code >= 400 and status_code < 500:
-                    ignore_smart_timeout = True
-
-            # This makes sense because if a chain fails but the entry point does not, the entry point
-            # will be put on the "smart timeout" list, and perhaps other chains will not represent a
-            # failure. The last entry point (the tail) will be disabled causing something similar to a
-            # propagation.
-
-            if tail and not ignore_smart_timeout:
-                if next_entrypoint not in DISABLE_COUNTERS:
-                    DISABLE_COUNTERS[next_entrypoint] = {
-                        "failures" : 0,
-                        "increase" : 0
-                    }
-
-                else:
-                    if DISABLE_COUNTERS[next_entrypoint]["increase"] < overlord.config.get_autodisable_max_increase():
-                        DISABLE_COUNTERS[next_entrypoint]["increase"] += overlord.config.get_autodisable_increase()
-
-                DISABLE_COUNTERS[next_entrypoint]["failures"] += 1
-                DISABLE_COUNTERS[next_entrypoint]["last-failure"] = time.time()
-
-                logger.debug("(entrypoint:%s, failures:%d, increase:%d, last-failure:%f) smart timeouts",
-                             next_entrypoint,
-                             DISABLE_COUNTERS[next_entrypoint]["failures"],
-                             DISABLE_COUNTERS[next_entrypoint]["increase"],
-                             DISABLE_COUNTERS[next_entrypoint]["last-failure"])
-
             error = overlord.util.get_error(err)
             error_type = error.get("type")
             error_message = error.get("message")
@@ -202,10 +558,6 @@ class ChainInternalHandler(InternalHandler):
             }, status_code=status_code)
             self.finish()
 
-        else:
-            if next_entrypoint in DISABLE_COUNTERS:
-                del DISABLE_COUNTERS[next_entrypoint]
-
 class PingHandler(InternalHandler):
     async def get(self):
         self.write_template({
@@ -214,54 +566,88 @@ class PingHandler(InternalHandler):
 
 class JailsHandler(InternalHandler):
     async def get(self):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
+
+        if await self.write_prerendered("jails"):
+            return
+
+        jails = await overlord.aiocache.get_jails_raw()
+
+        if self.check_cached_etag(jails):
+            return
 
         self.write_template({
-            "jails" : overlord.cache.get_jails()
+            "jails" : overlord.aiocache.decode(jails, [])
         })
 
-class JailsLogsHandler(InternalHandler):
+class BatchHandler(InternalHandler):
+    async def post(self):
+        requests = self.get_batch_arguments()
+
+        # The same credentials are used for each request.
+        authentication = self.request.headers.get("Authentication")
+
+        self.write_template({
+            "responses" : await execute_batch(requests, authentication)
+        })
+
+class JailsDetailsHandler(InternalHandler):
     async def get(self):
-        logsdir = overlord.config.get_appjail_logs()
+        (jails, sections) = self.get_details_arguments()
 
-        if not os.path.isdir(logsdir):
-            self.write_template({ "logs" : {} })
-            return
+        refresh = ["jails"]
 
-        logs = {}
+        for section in sections:
+            (_, entity, _) = overlord.aiocache.JAIL_DETAILS[section]
 
-        for type in os.listdir(logsdir):
-            if type not in logs:
-                logs[type] = {}
+            refresh.append(entity)
 
-            typedir = os.path.join(logsdir, type)
+        await asyncio.gather(*[overlord.aiocache.update_refresh_for(entity) for entity in refresh])
 
-            if not os.path.isdir(typedir):
-                continue
+        jails_raw = await overlord.aiocache.get_jails_raw()
 
-            for entity in os.listdir(typedir):
-                if entity not in logs[type]:
-                    logs[type][entity] = {}
+        existing = overlord.aiocache.decode(jails_raw, [])
 
-                entitydir = os.path.join(typedir, entity)
+        if jails is None:
+            jails = existing
 
-                if not os.path.isdir(entitydir):
-                    continue
+        else:
+            jails = [jail for jail in jails if jail in existing]
+
+        details = await overlord.aiocache.get_jails_details_raw(jails, sections)
+
+        if self.check_cached_etag(jails_raw, *details.values()):
+            return
+
+        result = overlord.aiocache.decode_jails_details(details)
+
+        # Jails without any section selected are also returned.
+        for jail in jails:
+            result.setdefault(jail, {})
+
+        self.write_template({
+            "jails" : result
+        })
 
-                for subtype in os.listdir(entitydir):
-                    if entity not in logs[type][entity]:
-                        logs[type][entity][subtype] = []
+class JailsLogsHandler(InternalHandler):
+    async def get(self):
+        logsdir = overlord.config.get_appjail_logs()
 
-                    subtypedir = os.path.join(entitydir, subtype)
-                
-                    if not os.path.isdir(subtypedir):
-                        continue
+        (offset, limit) = self.get_page_arguments()
 
-                    for logfile in os.listdir(subtypedir):
-                        logs[type][entity][subtype].append(logfile)
+        (logs, next_offset) = await asyncio.to_thread(
+            overlord.logindex.list_jails_logs,
+            logsdir,
+            type=self.get_query_argument("type", None),
+            entity=self.get_query_argument("entity", None),
+            subtype=self.get_query_argument("subtype", None),
+            offset=offset,
+            limit=limit
+        )
 
         self.write_template({
-            "logs" : logs
+            "logs" : logs,
+            "next_offset" : next_offset
         })
 
 class JailLogHandler(InternalHandler):
@@ -278,67 +664,88 @@ class JailLogHandler(InternalHandler):
             }, status_code=404)
             return
 
-        async with aiofiles.open(pathname, "r") as fd:
-            content = await fd.read()
-
-        content = overlord.util.sansi(content)
-
-        self.write_template({
-            "log_content" : content
-        })
+        await self.write_log(pathname)
 
 class StatsHandler(InternalHandler):
     async def get(self):
         # These aren't exactly jail stats, but we need recent data that reflects reality.
-        overlord.cache.update_refresh_for("jail_stats")
+        await overlord.aiocache.update_refresh_for("jail_stats")
+
+        if await self.write_prerendered("stats"):
+            return
 
         stats = {}
 
-        jails = overlord.cache.get_jails()
+        jails_raw = await overlord.aiocache.get_jails_raw()
 
-        for jail in jails:
-            jail_stats = overlord.cache.get_jail_stats(jail)
+        jails = overlord.aiocache.decode(jails_raw, [])
 
-            for key, value in jail_stats.items():
-                if key not in stats:
-                    stats[key] = 0
+        all_stats = await overlord.aiocache.get_jails_stats_raw(jails)
+
+        if self.check_cached_etag(jails_raw, *all_stats.values()):
+            return
 
-                stats[key] += value
+        for jail_stats in all_stats.values():
+            sum_stats(stats, overlord.aiocache.decode(jail_stats, {}))
 
         self.write_template({
             "stats" : stats
         })
 
+class ClusterStatsHandler(InternalHandler):
+    async def get(self):
+        depth = self.get_query_argument("depth", CHAINS_TREE_MAX_DEPTH, value_type=int,
+                                        valid_func=lambda v: v >= 0 and v <= CHAINS_TREE_MAX_DEPTH)
+
+        await overlord.aiocache.update_refresh_for("jail_stats")
+
+        cluster = await coalesce_chain_call(
+            ("cluster_stats", depth),
+            functools.partial(build_cluster_stats, depth)
+        )
+
+        self.write_template({
+            "cluster" : cluster
+        })
+
 class JailStatsHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("jail_stats")
+        await overlord.aiocache.update_refresh_for("jail_stats")
 
         self.write_template({
-            "stats" : overlord.cache.get_jail_stats(jail)
+            "stats" : await overlord.aiocache.get_jail_stats(jail)
         })
 
 class JailInfoHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("jail_info")
+        await overlord.aiocache.update_refresh_for("jail_info")
+
+        if await self.write_prerendered(f"jail_info_{jail}"):
+            return
+
+        info = await overlord.aiocache.get_jail_info_raw(jail)
+
+        if self.check_cached_etag(info):
+            return
         
         self.write_template({
-            "info" : overlord.cache.get_jail_info(jail)
+            "info" : overlord.aiocache.decode(info, {})
         })
 
     async def head(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if overlord.cache.check_jail(jail):
+        if await overlord.aiocache.check_jail(jail):
             self.set_status(200)
 
         else:
@@ -346,150 +753,158 @@ class JailInfoHandler(InternalHandler):
 
 class JailCPUSetHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("cpuset")
+        await overlord.aiocache.update_refresh_for("cpuset")
 
         self.write_template({
-            "cpuset" : overlord.cache.get_jail_cpuset(jail)
+            "cpuset" : await overlord.aiocache.get_jail_cpuset(jail)
         })
 
 class JailDEVFSHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("devfs")
+        await overlord.aiocache.update_refresh_for("devfs")
 
         self.write_template({
-            "devfs" : overlord.cache.get_jail_devfs(jail)
+            "devfs" : await overlord.aiocache.get_jail_devfs(jail)
         })
 
 class JailExposeHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("expose")
+        await overlord.aiocache.update_refresh_for("expose")
 
         self.write_template({
-            "expose" : overlord.cache.get_jail_expose(jail)
+            "expose" : await overlord.aiocache.get_jail_expose(jail)
         })
 
 class JailHealthcheckHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("healthcheck")
+        await overlord.aiocache.update_refresh_for("healthcheck")
 
         self.write_template({
-            "healthcheck" : overlord.cache.get_jail_healthcheck(jail)
+            "healthcheck" : await overlord.aiocache.get_jail_healthcheck(jail)
         })
 
 class JailLimitsHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("limits")
+        await overlord.aiocache.update_refresh_for("limits")
 
         self.write_template({
-            "limits" : overlord.cache.get_jail_limits(jail)
+            "limits" : await overlord.aiocache.get_jail_limits(jail)
         })
 
 class JailFstabHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("fstab")
+        await overlord.aiocache.update_refresh_for("fstab")
 
         self.write_template({
-            "fstab" : overlord.cache.get_jail_fstab(jail)
+            "fstab" : await overlord.aiocache.get_jail_fstab(jail)
         })
 
 class JailLabelsHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("label")
+        await overlord.aiocache.update_refresh_for("label")
 
         self.write_template({
-            "labels" : overlord.cache.get_jail_label(jail)
+            "labels" : await overlord.aiocache.get_jail_label(jail)
         })
 
 class JailNATHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("nat")
+        await overlord.aiocache.update_refresh_for("nat")
 
         self.write_template({
-            "nat" : overlord.cache.get_jail_nat(jail)
+            "nat" : await overlord.aiocache.get_jail_nat(jail)
         })
 
 class JailVolumesHandler(InternalHandler):
     async def get(self, jail):
-        overlord.cache.update_refresh_for("jails")
+        await overlord.aiocache.update_refresh_for("jails")
 
-        if not self.check_jail(jail):
+        if not await self.check_jail(jail):
             return
 
-        overlord.cache.update_refresh_for("volume")
+        await overlord.aiocache.update_refresh_for("volume")
 
         self.write_template({
-            "volumes" : overlord.cache.get_jail_volume(jail)
+            "volumes" : await overlord.aiocache.get_jail_volume(jail)
         })
 
 class ProjectsHandler(InternalHandler):
     async def get(self):
-        overlord.cache.update_refresh_for("projects")
+        await overlord.aiocache.update_refresh_for("projects")
 
         self.write_template({
-            "projects" : overlord.cache.get_projects()
+            "projects" : await overlord.aiocache.get_projects()
         })
 
 class ProjectInfoHandler(InternalHandler):
     async def get(self, project):
-        overlord.cache.update_refresh_for("project_info")
+        await overlord.aiocache.update_refresh_for("project_info")
 
         result = {}
 
-        info = overlord.cache.get_project_info(project)
+        project_info = await overlord.aiocache.get_project_info_raw(project)
+
+        (info, up_info, down_info) = (
+            project_info["info"],
+            project_info["up"],
+            project_info["down"]
+        )
+
+        # No validator is derived from the cached values here: 'last_update' is relative to
+        # the time of the request, so the body changes even when they don't.
+        info = overlord.aiocache.decode(info, {})
+        up_info = overlord.aiocache.decode(up_info, {})
+        down_info = overlord.aiocache.decode(down_info, {})
 
         if len(info) > 0:
             result.update(info)
 
-        up_info = overlord.cache.get_project_status_up(project)
-
         if len(up_info) > 0:
             result["up"] = up_info
 
             if "last_update" in result["up"]:
                 result["up"]["last_update"] = time.time() - result["up"]["last_update"]
 
-        down_info = overlord.cache.get_project_status_down(project)
-
         if len(down_info) > 0:
             result["down"] = down_info
 
@@ -507,14 +922,71 @@ class ProjectInfoHandler(InternalHandler):
         })
 
     async def head(self, project):
-        overlord.cache.update_refresh_for("projects")
+        await overlord.aiocache.update_refresh_for("projects")
 
-        if overlord.cache.check_project(project):
+        if await overlord.aiocache.check_project(project):
             self.set_status(200)
 
         else:
             self.set_status(404)
 
+class EventsHandler(InternalHandler):
+    async def get(self):
+        arguments = self.get_events_arguments()
+
+        since = arguments["since"]
+        type = arguments["type"]
+        name = arguments["name"]
+
+        self.start_events()
+
+        queue = await subscribe_events()
+
+        try:
+            replayed = 0
+
+            if since is not None:
+                current = await overlord.aiocache.get_events_seq()
+
+                first = max(since + 1, current - EVENTS_REPLAY_MAX + 1)
+
+                for event in await overlord.aiocache.get_events(first, current):
+                    replayed = event["id"]
+
+                    if match_event(event, type, name):
+                        self.write_event(event)
+
+            await self.flush()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENTS_KEEPALIVE)
+
+                except asyncio.TimeoutError:
+                    self.write_keepalive()
+
+                    await self.flush()
+
+                    continue
+
+                # Too slow to consume the events, so the client must reconnect.
+                if event is None:
+                    break
+
+                if event["id"] <= replayed \
+                        or not match_event(event, type, name):
+                    continue
+
+                self.write_event(event)
+
+                await self.flush()
+
+        except tornado.iostream.StreamClosedError:
+            pass
+
+        finally:
+            unsubscribe_events(queue)
+
 class ProjectUpHandler(InternalHandler):
     async def post(self, project):
         director_file = self.get_json_argument("director_file", value_type=str, strip=False)
@@ -588,7 +1060,7 @@ class ProjectCancelHandler(InternalHandler):
 
 class ProjectAutoScaleHandler(InternalHandler):
     async def get(self, project):
-        result = overlord.cache.get_project_status_autoscale(project)
+        result = await overlord.aiocache.get_project_status_autoscale(project)
 
         if len(result) == 0:
             self.write_template({
@@ -607,28 +1079,20 @@ class ProjectsLogsHandler(InternalHandler):
     async def get(self):
         logsdir = overlord.config.get_director_logs()
 
-        if not os.path.isdir(logsdir):
-            self.write_template({ "logs" : {} })
-            return
-
-        logs = {}
-
-        for date_logdir in os.listdir(logsdir):
-            logs[date_logdir] = {}
-
-            for service_logdir in os.listdir(os.path.join(logsdir, date_logdir)):
-                log_path = os.path.join(logsdir, date_logdir, service_logdir)
-
-                if os.path.isfile(log_path):
-                    continue # ignore 'exception.log'
-
-                logs[date_logdir][service_logdir] = []
+        (offset, limit) = self.get_page_arguments()
 
-                for log in os.listdir(log_path):
-                    logs[date_logdir][service_logdir].append(log)
+        (logs, next_offset) = await asyncio.to_thread(
+            overlord.logindex.list_projects_logs,
+            logsdir,
+            date=self.get_query_argument("date", None),
+            service=self.get_query_argument("service", None),
+            offset=offset,
+            limit=limit
+        )
 
         self.write_template({
-            "logs" : logs
+            "logs" : logs,
+            "next_offset" : next_offset
         })
 
 class ProjectsLogHandler(InternalHandler):
@@ -645,14 +1109,7 @@ class ProjectsLogHandler(InternalHandler):
             }, status_code=404)
             return
 
-        async with aiofiles.open(pathname, "r") as fd:
-            content = await fd.read()
-
-        content = overlord.util.sansi(content)
-
-        self.write_template({
-            "log_content" : content
-        })
+        await self.write_log(pathname)
 
 class NamespaceHandler(InternalHandler):
     async def get(self, name):
@@ -771,28 +1228,15 @@ class NamespaceHandler(InternalHandler):
 
                 pathname = clear_path(namespace, pathname)
 
-                if metadata not in METADATA:
-                    METADATA[metadata] = asyncio.Lock()
-
-                metadata_lock = METADATA[metadata]
-
-                async with metadata_lock:
+                async with lock_metadata(metadata):
                     content = await overlord.metadata.get(metadata)
 
-                if name not in NAMESPACES:
-                    NAMESPACES[name] = {}
-
-                if pathname not in NAMESPACES[name]:
-                    NAMESPACES[name][pathname] = asyncio.Lock()
-
-                namespace_lock = NAMESPACES[name][pathname]
-
                 rootdir = os.path.dirname(pathname)
 
                 if not os.path.isdir(rootdir):
                     os.makedirs(rootdir, exist_ok=True)
 
-                async with namespace_lock:
+                async with lock_namespace(name, pathname):
                     async with aiofiles.open(pathname, "w") as fd:
                         await fd.write(content)
                         await fd.flush()
@@ -856,13 +1300,8 @@ class MetadataHandler(InternalHandler):
 
         value = self.get_json_argument("value", value_type=str, strip=False)
 
-        if key not in METADATA:
-            METADATA[key] = asyncio.Lock()
-
-        lock = METADATA[key]
-
         try:
-            async with lock:
+            async with lock_metadata(key):
                 await overlord.metadata.set(key, value)
 
         except overlord.exceptions.MetadataTooLong as err:
@@ -881,13 +1320,8 @@ class MetadataHandler(InternalHandler):
 
         value = self.get_json_argument("value", value_type=str, strip=False)
 
-        if key not in METADATA:
-            METADATA[key] = asyncio.Lock()
-
-        lock = METADATA[key]
-
         try:
-            async with lock:
+            async with lock_metadata(key):
                 current_value = await overlord.metadata.get(key)
 
                 if current_value != value:
@@ -931,7 +1365,7 @@ class MetadataListHandler(InternalHandler):
 
 class VMHandler(InternalHandler):
     async def get(self, name):
-        result = overlord.cache.get_vm_status(name)
+        result = await overlord.aiocache.get_vm_status(name)
 
         if len(result) == 0:
             self.write_template({
@@ -1051,26 +1485,26 @@ class LabelsHandler(InternalHandler):
         })
 
 class ChainsHandler(ChainInternalHandler):
-    async def get(self):
-        autodisable_enabled = overlord.config.get_autodisable_enabled()
+    STREAM = False
 
-        if not autodisable_enabled:
-            self.write_template({
-                "chains" : list(CHAINS)
-            })
-            return
-
-        chains = []
+    async def get(self):
+        self.write_template({
+            "chains" : await get_active_chains()
+        })
 
-        for chain in CHAINS:
-            if check_autodisable_chain(chain):
-                logger.debug("(chain:%s) excluding chain due to smart timeouts", chain)
-                continue
+class ChainsTreeHandler(InternalHandler):
+    async def get(self):
+        depth = self.get_query_argument("depth", CHAINS_TREE_MAX_DEPTH, value_type=int,
+                                        valid_func=lambda v: v >= 0 and v <= CHAINS_TREE_MAX_DEPTH)
 
-            chains.append(chain)
+        tree = await coalesce_chain_call(
+            ("chains_tree", depth),
+            functools.partial(build_chains_tree, depth),
+            overlord.config.get_chains_tree_ttl()
+        )
 
         self.write_template({
-            "chains" : chains
+            "tree" : tree
         })
 
 class ChainNamespaceHandler(ChainInternalHandler):
@@ -1172,6 +1606,8 @@ class ChainMetadataListHandler(ChainInternalHandler):
         })
 
 class ChainVMHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, name):
         result = await self.remote_call(chain, "get_status_vm", name)
 
@@ -1292,6 +1728,8 @@ class ChainVMHandler(ChainInternalHandler):
         self.write_template(result)
 
 class ChainChainsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "get_chains")
 
@@ -1299,7 +1737,22 @@ class ChainChainsHandler(ChainInternalHandler):
             "chains" : result
         })
 
+class ChainChainsTreeHandler(ChainInternalHandler):
+    COALESCE = True
+
+    async def get(self, chain):
+        depth = self.get_query_argument("depth", CHAINS_TREE_MAX_DEPTH, value_type=int,
+                                        valid_func=lambda v: v >= 0 and v <= CHAINS_TREE_MAX_DEPTH)
+
+        result = await self.remote_call(chain, "get_chains_tree", depth)
+
+        self.write_template({
+            "tree" : result
+        })
+
 class ChainLabelsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "get_api_labels")
 
@@ -1308,6 +1761,8 @@ class ChainLabelsHandler(ChainInternalHandler):
         })
 
 class ChainPingHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "ping")
 
@@ -1316,6 +1771,8 @@ class ChainPingHandler(ChainInternalHandler):
         })
 
 class ChainJailsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "get_jails")
 
@@ -1323,15 +1780,48 @@ class ChainJailsHandler(ChainInternalHandler):
             "jails" : result
         })
 
+class ChainBatchHandler(ChainInternalHandler):
+    async def post(self, chain):
+        requests = self.get_batch_arguments()
+
+        result = await self.remote_call(chain, "batch", requests)
+
+        self.write_template({
+            "responses" : result
+        })
+
+class ChainJailsDetailsHandler(ChainInternalHandler):
+    async def get(self, chain):
+        (jails, sections) = self.get_details_arguments()
+
+        result = await self.remote_call(chain, "get_jails_details", jails, sections)
+
+        self.write_template({
+            "jails" : result
+        })
+
 class ChainJailsLogsHandler(ChainInternalHandler):
     async def get(self, chain):
-        result = await self.remote_call(chain, "get_jails_logs")
+        (offset, limit) = self.get_page_arguments()
+
+        result = await self.remote_call(
+            chain,
+            "get_jails_logs_page",
+            type=self.get_query_argument("type", None),
+            entity=self.get_query_argument("entity", None),
+            subtype=self.get_query_argument("subtype", None),
+            offset=offset,
+            limit=limit
+        )
 
         self.write_template({
-            "logs" : result
+            "logs" : result.get("logs", {}),
+            "next_offset" : result.get("next_offset")
         })
 
 class ChainStatsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "get_server_stats")
 
@@ -1339,15 +1829,39 @@ class ChainStatsHandler(ChainInternalHandler):
             "stats" : result
         })
 
-class ChainJailLogHandler(ChainInternalHandler):
-    async def get(self, chain, type, entity, subtype, log):
-        result = await self.remote_call(chain, "get_jail_log", type, entity, subtype, log)
+class ChainClusterStatsHandler(ChainInternalHandler):
+    COALESCE = True
+
+    async def get(self, chain):
+        depth = self.get_query_argument("depth", CHAINS_TREE_MAX_DEPTH, value_type=int,
+                                        valid_func=lambda v: v >= 0 and v <= CHAINS_TREE_MAX_DEPTH)
+
+        result = await self.remote_call(chain, "get_cluster_stats", depth)
 
         self.write_template({
-            "log_content" : result
+            "cluster" : result
         })
 
+class ChainJailLogHandler(ChainInternalHandler):
+    async def get(self, chain, type, entity, subtype, log):
+        arguments = self.get_log_arguments()
+
+        if arguments is None:
+            result = await self.remote_call(chain, "get_jail_log", type, entity, subtype, log)
+
+            self.write_template({
+                "log_content" : result
+            })
+
+            return
+
+        result = await self.remote_call(chain, "get_jail_log_chunk", type, entity, subtype, log, **arguments)
+
+        self.write_template(result)
+
 class ChainJailStatsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_stats", jail)
 
@@ -1356,6 +1870,8 @@ class ChainJailStatsHandler(ChainInternalHandler):
         })
 
 class ChainJailInfoHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_info", jail)
 
@@ -1373,6 +1889,8 @@ class ChainJailInfoHandler(ChainInternalHandler):
             self.set_status(404)
 
 class ChainJailCPUSetHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_cpuset", jail)
 
@@ -1381,6 +1899,8 @@ class ChainJailCPUSetHandler(ChainInternalHandler):
         })
 
 class ChainJailDEVFSHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_devfs", jail)
 
@@ -1389,6 +1909,8 @@ class ChainJailDEVFSHandler(ChainInternalHandler):
         })
 
 class ChainJailExposeHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_expose", jail)
 
@@ -1397,6 +1919,8 @@ class ChainJailExposeHandler(ChainInternalHandler):
         })
 
 class ChainJailHealthcheckHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_healthcheck", jail)
 
@@ -1405,6 +1929,8 @@ class ChainJailHealthcheckHandler(ChainInternalHandler):
         })
 
 class ChainJailLimitsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_limits", jail)
 
@@ -1413,6 +1939,8 @@ class ChainJailLimitsHandler(ChainInternalHandler):
         })
 
 class ChainJailFstabHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_fstab", jail)
 
@@ -1421,6 +1949,8 @@ class ChainJailFstabHandler(ChainInternalHandler):
         })
 
 class ChainJailLabelsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_labels", jail)
 
@@ -1429,6 +1959,8 @@ class ChainJailLabelsHandler(ChainInternalHandler):
         })
 
 class ChainJailNATHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_nat", jail)
 
@@ -1437,6 +1969,8 @@ class ChainJailNATHandler(ChainInternalHandler):
         })
 
 class ChainJailVolumesHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, jail):
         result = await self.remote_call(chain, "get_volumes", jail)
 
@@ -1445,6 +1979,8 @@ class ChainJailVolumesHandler(ChainInternalHandler):
         })
 
 class ChainProjectsHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain):
         result = await self.remote_call(chain, "get_projects")
 
@@ -1453,6 +1989,8 @@ class ChainProjectsHandler(ChainInternalHandler):
         })
 
 class ChainProjectInfoHandler(ChainInternalHandler):
+    COALESCE = True
+
     async def get(self, chain, project):
         result = await self.remote_call(chain, "get_info", project, type=overlord.client.OverlordEntityTypes.PROJECT)
 
@@ -1469,6 +2007,60 @@ class ChainProjectInfoHandler(ChainInternalHandler):
         else:
             self.set_status(404)
 
+class ChainEventsHandler(ChainInternalHandler):
+    # The events are already relayed as they arrive.
+    STREAM = False
+
+    async def get(self, chain):
+        arguments = self.get_events_arguments()
+
+        (next_entrypoint, next_chain) = overlord.chains.get_chain(chain)
+
+        chain_cli = self.get_chain(next_entrypoint)
+
+        if chain_cli is None:
+            raise tornado.web.HTTPError(404, reason=f"Next entrypoint '{next_entrypoint}' cannot be found.")
+
+        if len(next_chain) == 0:
+            new_chain = None
+
+        else:
+            new_chain = overlord.chains.join_chain(next_chain)
+
+        self.start_events()
+
+        try:
+            # The stream ends when the next hop closes it, so the client will reconnect
+            # as if it were connected directly.
+            async for event in chain_cli.iter_events(**arguments, keepalive=True, reconnect=False, chain=new_chain):
+                if event is None:
+                    self.write_keepalive()
+
+                else:
+                    self.write_event(event)
+
+                await self.flush()
+
+        except tornado.iostream.StreamClosedError:
+            pass
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(entrypoint:%s, chain:%s, exception:%s) error relaying the events: %s",
+                             next_entrypoint, new_chain, error_type, error_message)
+
+            if not self._headers_written:
+                self.write_template({
+                    "function" : "iter_events",
+                    "entrypoint" : next_entrypoint,
+                    "chain" : new_chain,
+                    "error" : error_type,
+                    "message" : error_message
+                }, status_code=503)
+
 class ChainProjectUpHandler(ChainInternalHandler):
     async def post(self, chain, project):
         director_file = self.get_json_argument("director_file", value_type=str, strip=False)
@@ -1505,28 +2097,645 @@ class ChainProjectAutoScaleHandler(ChainInternalHandler):
 
 class ChainProjectsLogsHandler(ChainInternalHandler):
     async def get(self, chain):
-        result = await self.remote_call(chain, "get_projects_logs")
+        (offset, limit) = self.get_page_arguments()
+
+        result = await self.remote_call(
+            chain,
+            "get_projects_logs_page",
+            date=self.get_query_argument("date", None),
+            service=self.get_query_argument("service", None),
+            offset=offset,
+            limit=limit
+        )
 
         self.write_template({
-            "logs" : result
+            "logs" : result.get("logs", {}),
+            "next_offset" : result.get("next_offset")
         })
 
 class ChainProjectsLogHandler(ChainInternalHandler):
     async def get(self, chain, date, service, log):
-        result = await self.remote_call(chain, "get_project_log", date, service, log)
+        arguments = self.get_log_arguments()
 
-        self.write_template({
-            "log_content" : result
-        })
+        if arguments is None:
+            result = await self.remote_call(chain, "get_project_log", date, service, log)
 
-def check_autodisable_chain(chain):
-    if not check_heartbeat_chain(chain):
-        return True
+            self.write_template({
+                "log_content" : result
+            })
 
-    if chain not in DISABLE_COUNTERS:
+            return
+
+        result = await self.remote_call(chain, "get_project_log_chunk", date, service, log, **arguments)
+
+        self.write_template(result)
+
+def match_event(event, type=None, name=None):
+    if type is not None and event.get("type") != type:
+        return False
+
+    if name is not None and event.get("name") != name:
         return False
 
-    chain_info = DISABLE_COUNTERS[chain]
+    return True
+
+async def subscribe_events():
+    global EVENTS_TASK
+
+    queue = asyncio.Queue(EVENTS_QUEUE_SIZE)
+
+    SUBSCRIBERS.add(queue)
+
+    # A single task per process checks memcached regardless of the number of subscribers.
+    if EVENTS_TASK is None or EVENTS_TASK.done():
+        # The task starts from here, before the subscriber reads the sequence to replay the
+        # events, so no event can fall between the two.
+        last = await overlord.aiocache.get_events_seq()
+
+        # Another subscriber may have started it in the meantime.
+        if EVENTS_TASK is None or EVENTS_TASK.done():
+            EVENTS_TASK = asyncio.create_task(watch_events(last))
+
+    return queue
+
+def unsubscribe_events(queue):
+    SUBSCRIBERS.discard(queue)
+
+def dispatch_event(event):
+    for queue in list(SUBSCRIBERS):
+        try:
+            queue.put_nowait(event)
+
+        except asyncio.QueueFull:
+            SUBSCRIBERS.discard(queue)
+
+            while not queue.empty():
+                queue.get_nowait()
+
+            queue.put_nowait(None)
+
+async def watch_events(last):
+    stalled = None
+
+    while len(SUBSCRIBERS) > 0:
+        await asyncio.sleep(overlord.config.get_polling_events())
+
+        try:
+            current = await overlord.aiocache.get_events_seq()
+
+            # The sequence has been evicted or memcached has been restarted.
+            if current < last:
+                last = 0
+
+            if current == last:
+                continue
+
+            upto = min(current, last + EVENTS_REPLAY_MAX)
+
+            events = await overlord.aiocache.get_events(last + 1, upto)
+
+            # The next event may still be being written, but it may also have expired, so it's
+            # only skipped after a while.
+            if len(events) == 0 or events[0]["id"] != last + 1:
+                if stalled is None:
+                    stalled = time.time()
+
+                if (time.time() - stalled) < EVENTS_GAP_TIMEOUT:
+                    continue
+
+                if len(events) == 0:
+                    last = upto
+
+                else:
+                    last = events[0]["id"] - 1
+
+            stalled = None
+
+            for event in events:
+                # Another gap, which is handled in the next iteration.
+                if event["id"] != last + 1:
+                    break
+
+                last = event["id"]
+
+                dispatch_event(event)
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.exception("(exception:%s) error watching the events: %s", error_type, error_message)
+
+async def read_log(pathname, tail=None, offset=None, length=None, follow=False):
+    async with aiofiles.open(pathname, "rb") as fd:
+        size = await fd.seek(0, os.SEEK_END)
+
+        if tail is not None:
+            offset = await get_log_tail_offset(fd, size, tail)
+
+        elif offset is None:
+            offset = 0
+
+        # The log has been truncated or rotated since the last read.
+        elif offset > size:
+            offset = 0
+
+        if follow:
+            timeout = time.time() + overlord.config.get_log_follow_timeout()
+
+            while size <= offset and time.time() < timeout:
+                await asyncio.sleep(LOG_FOLLOW_INTERVAL)
+
+                size = await fd.seek(0, os.SEEK_END)
+
+        offset = min(offset, size)
+
+        if length is None:
+            length = size - offset
+
+        else:
+            length = min(length, size - offset)
+
+        await fd.seek(offset)
+
+        data = await fd.read(length)
+
+    # Only complete lines are returned when there is more data to read (or it is still being
+    # written), so neither an escape sequence nor a multibyte character is split between chunks.
+    if follow or offset + len(data) < size:
+        index = data.rfind(b"\n")
+
+        if index != -1:
+            data = data[:index + 1]
+
+    return {
+        "log_content" : overlord.util.sansi_chunk(data.decode(errors="replace")),
+        "offset" : offset,
+        "next_offset" : offset + len(data),
+        "size" : size
+    }
+
+async def get_log_tail_offset(fd, size, lines):
+    if lines == 0:
+        return size
+
+    position = size
+    found = 0
+
+    while position > 0:
+        block_size = min(LOG_BLOCK_SIZE, position)
+
+        position -= block_size
+
+        await fd.seek(position)
+
+        block = await fd.read(block_size)
+
+        end = len(block)
+
+        # The newline that terminates the last line doesn't start a new one.
+        if position + end == size and block.endswith(b"\n"):
+            end -= 1
+
+        while True:
+            index = block.rfind(b"\n", 0, end)
+
+            if index == -1:
+                break
+
+            found += 1
+
+            if found == lines:
+                return position + index + 1
+
+            end = index
+
+    return 0
+
+@contextlib.asynccontextmanager
+async def lock_metadata(key):
+    if key not in METADATA:
+        METADATA[key] = asyncio.Lock()
+
+    async with METADATA[key]:
+        async with lock_workers("metadata", key):
+            yield
+
+@contextlib.asynccontextmanager
+async def lock_namespace(name, pathname):
+    if name not in NAMESPACES:
+        NAMESPACES[name] = {}
+
+    if pathname not in NAMESPACES[name]:
+        NAMESPACES[name][pathname] = asyncio.Lock()
+
+    async with NAMESPACES[name][pathname]:
+        async with lock_workers("namespace", name, pathname):
+            yield
+
+@contextlib.asynccontextmanager
+async def lock_workers(*names):
+    # asyncio locks only work within a process, so other workers must be
+    # excluded using a file lock.
+    if WORKERS > 1:
+        async with overlord.util.file_lock(*names):
+            yield
+
+    else:
+        yield
+
+async def get_disable_counter(chain):
+    if WORKERS > 1:
+        counter = await overlord.aiocache.get_autodisable_counter(chain)
+
+        if counter is None:
+            return
+
+        DIRTY_COUNTERS.add(chain)
+
+        counter["increase"] = get_disable_increase(counter["failures"])
+
+        return counter
+
+    return DISABLE_COUNTERS.get(chain)
+
+def get_disable_increase(failures):
+    increase = overlord.config.get_autodisable_increase()
+    max_increase = overlord.config.get_autodisable_max_increase()
+
+    if increase <= 0:
+        return 0
+
+    # The same as adding `increase` after each failure but the first one, as long as it
+    # is lower than `max_increase`.
+    steps = min(failures - 1, -(-max_increase // increase))
+
+    return max(steps, 0) * increase
+
+def get_loopback():
+    global LOOPBACK
+
+    if LOOPBACK is None:
+        # Same as poll-autoscale, the unencrypted port is always available.
+        limits_settings = {
+            "max_keepalive_connections" : overlord.default.CHAIN_MAX_KEEPALIVE_CONNECTIONS,
+            "max_connections" : overlord.default.CHAIN_MAX_CONNECTIONS,
+            "keepalive_expiry" : overlord.default.CHAIN_KEEPALIVE_EXPIRY
+        }
+        timeout_settings = {
+            "timeout" : overlord.default.CHAIN_TIMEOUT,
+            "read" : overlord.default.CHAIN_READ_TIMEOUT,
+            "write" : overlord.default.CHAIN_WRITE_TIMEOUT,
+            "connect" : overlord.default.CHAIN_CONNECT_TIMEOUT,
+            "pool" : overlord.default.CHAIN_POOL_TIMEOUT
+        }
+
+        LOOPBACK = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{overlord.config.get_port()}",
+            limits=httpx.Limits(**limits_settings),
+            timeout=httpx.Timeout(**timeout_settings)
+        )
+
+    return LOOPBACK
+
+async def execute_batch(requests, authentication):
+    loopback = get_loopback()
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def execute(request):
+        method = request["method"]
+        path = request["path"]
+
+        async with semaphore:
+            try:
+                response = await loopback.request(
+                    method,
+                    f"/v1/{path}",
+                    params=request["params"],
+                    json=request["body"],
+                    headers={
+                        "Authentication" : authentication
+                    }
+                )
+
+            except Exception as err:
+                error = overlord.util.get_error(err)
+                error_type = error.get("type")
+                error_message = error.get("message")
+
+                logger.exception("(method:%s, path:%s, exception:%s) error executing the request: %s",
+                                 method, path, error_type, error_message)
+
+                return {
+                    "status_code" : 503,
+                    "error" : error_type,
+                    "message" : error_message
+                }
+
+        try:
+            # Every response of the API already includes its status code.
+            return response.json()
+
+        except ValueError:
+            return {
+                "status_code" : response.status_code,
+                "message" : response.text
+            }
+
+    return await asyncio.gather(*[execute(request) for request in requests])
+
+async def call_chain(entrypoint, tail, call):
+    try:
+        if call is None:
+            raise overlord.exceptions.UnavailableChain("Chain disabled by smart timeouts")
+
+        result = await call()
+
+    except Exception as err:
+        ignore_smart_timeout = False
+
+        if isinstance(err, httpx.HTTPStatusError):
+            status_code = err.response.status_code
+
+            if status_code >= 400 and status_code < 500:
+                ignore_smart_timeout = True
+
+        # This makes sense because if a chain fails but the entry point does not, the entry point
+        # will be put on the "smart timeout" list, and perhaps other chains will not represent a
+        # failure. The last entry point (the tail) will be disabled causing something similar to a
+        # propagation.
+
+        if tail and not ignore_smart_timeout:
+            await increase_disable_counter(entrypoint)
+
+        raise
+
+    await delete_disable_counter(entrypoint)
+
+    return result
+
+async def call_chain_relay(entrypoint, tail, call):
+    # The same as call_chain(), but the response is relayed as is, so its status code is
+    # checked instead of expecting an exception. Client errors are not chain failures.
+    try:
+        if call is None:
+            raise overlord.exceptions.UnavailableChain("Chain disabled by smart timeouts")
+
+        relayed = await call()
+
+    except Exception:
+        if tail:
+            await increase_disable_counter(entrypoint)
+
+        raise
+
+    status_code = relayed["status_code"]
+
+    if status_code >= 500:
+        if tail:
+            await increase_disable_counter(entrypoint)
+
+    elif status_code < 400:
+        await delete_disable_counter(entrypoint)
+
+    return relayed
+
+async def coalesce_chain_call(key, call, ttl=None):
+    cached = CHAIN_RESPONSES.get(key)
+
+    if cached is not None:
+        (expire, result) = cached
+
+        if time.monotonic() < expire:
+            return copy.deepcopy(result)
+
+        del CHAIN_RESPONSES[key]
+
+    task = CHAIN_CALLS.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(functools.partial(finish_chain_call, key, ttl))
+
+        CHAIN_CALLS[key] = task
+
+    # A caller that goes away must not cancel the call for the others.
+    result = await asyncio.shield(task)
+
+    # The result is never returned as is, because handlers are free to modify it.
+    return copy.deepcopy(result)
+
+def finish_chain_call(key, ttl, task):
+    if CHAIN_CALLS.get(key) is task:
+        del CHAIN_CALLS[key]
+
+    if task.cancelled() or task.exception() is not None:
+        return
+
+    if ttl is None:
+        ttl = overlord.config.get_chain_cache_ttl()
+
+    if ttl <= 0:
+        return
+
+    now = time.monotonic()
+
+    for expired in [k for k, (expire, _) in CHAIN_RESPONSES.items() if expire <= now]:
+        del CHAIN_RESPONSES[expired]
+
+    CHAIN_RESPONSES[key] = (now + ttl, task.result())
+
+async def get_active_chains():
+    if not overlord.config.get_autodisable_enabled():
+        return list(CHAINS)
+
+    chains = []
+
+    for chain in CHAINS:
+        if await check_autodisable_chain(chain):
+            logger.debug("(chain:%s) excluding chain due to smart timeouts", chain)
+            continue
+
+        chains.append(chain)
+
+    return chains
+
+async def build_chains_tree(depth):
+    chains = await get_active_chains()
+
+    node = {
+        "labels" : overlord.config.get_labels(),
+        "chains" : {}
+    }
+
+    if depth <= 0:
+        # Without "chains", the client knows that it must discover them by itself.
+        node["chains"] = { chain : {} for chain in chains }
+
+        return node
+
+    async def get_node(chain):
+        # Same as remote_call(), each chain is the tail, so its failures count for smart timeouts.
+        if overlord.config.get_autodisable_strict() and \
+                await check_autodisable_chain(chain):
+            call = None
+
+        else:
+            call = functools.partial(CHAINS[chain].get_chains_tree, depth - 1)
+
+        try:
+            return await call_chain(chain, True, call)
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.warning("(chain:%s, exception:%s) error obtaining the chains: %s",
+                           chain, error_type, error_message)
+
+            return {
+                "error" : error_type,
+                "message" : error_message
+            }
+
+    nodes = await asyncio.gather(*[get_node(chain) for chain in chains])
+
+    node["chains"] = dict(zip(chains, nodes))
+
+    return node
+
+def sum_stats(stats, other):
+    for key, value in other.items():
+        if key not in stats:
+            stats[key] = 0
+
+        stats[key] += value
+
+    return stats
+
+async def build_cluster_stats(depth):
+    jails = await overlord.aiocache.get_jails()
+
+    stats = {}
+
+    for jail_stats in (await overlord.aiocache.get_jails_stats_raw(jails)).values():
+        sum_stats(stats, overlord.aiocache.decode(jail_stats, {}))
+
+    chains = await get_active_chains()
+
+    node = {
+        "stats" : stats,
+        "total" : sum_stats({}, stats),
+        "chains" : {}
+    }
+
+    if depth <= 0:
+        # Same as the tree of chains, these chains are not part of the total.
+        node["chains"] = { chain : {} for chain in chains }
+
+        return node
+
+    async def get_node(chain):
+        # The same as build_chains_tree().
+        if overlord.config.get_autodisable_strict() and \
+                await check_autodisable_chain(chain):
+            call = None
+
+        else:
+            call = functools.partial(CHAINS[chain].get_cluster_stats, depth - 1)
+
+        try:
+            return await call_chain(chain, True, call)
+
+        except Exception as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.warning("(chain:%s, exception:%s) error obtaining the stats: %s",
+                           chain, error_type, error_message)
+
+            return {
+                "error" : error_type,
+                "message" : error_message
+            }
+
+    nodes = await asyncio.gather(*[get_node(chain) for chain in chains])
+
+    for chain_node in nodes:
+        sum_stats(node["total"], chain_node.get("total", {}))
+
+    node["chains"] = dict(zip(chains, nodes))
+
+    return node
+
+async def increase_disable_counter(chain):
+    if WORKERS > 1:
+        # After this time the chain is not disabled anymore, so the counter
+        # is useless.
+        expire = overlord.config.get_autodisable_interval() \
+                + overlord.config.get_autodisable_max_increase()
+
+        last_failure = time.time()
+
+        # Failures are counted by memcached, so concurrent workers don't lose any.
+        failures = await overlord.aiocache.incr_autodisable_counter(chain, last_failure, expire)
+
+        DIRTY_COUNTERS.add(chain)
+
+        counter = {
+            "failures" : failures,
+            "increase" : get_disable_increase(failures),
+            "last-failure" : last_failure
+        }
+
+    else:
+        counter = DISABLE_COUNTERS.get(chain)
+
+        if counter is None:
+            counter = {
+                "failures" : 0,
+                "increase" : 0
+            }
+
+        else:
+            if counter["increase"] < overlord.config.get_autodisable_max_increase():
+                counter["increase"] += overlord.config.get_autodisable_increase()
+
+        counter["failures"] += 1
+        counter["last-failure"] = time.time()
+
+        DISABLE_COUNTERS[chain] = counter
+
+    logger.debug("(entrypoint:%s, failures:%d, increase:%d, last-failure:%f) smart timeouts",
+                 chain,
+                 counter["failures"],
+                 counter["increase"],
+                 counter["last-failure"])
+
+async def delete_disable_counter(chain):
+    if WORKERS > 1:
+        # Most calls succeed, so memcached is only asked when this worker knows about a
+        # counter. The counters of the other workers expire anyway.
+        if chain in DIRTY_COUNTERS:
+            DIRTY_COUNTERS.discard(chain)
+
+            await overlord.aiocache.delete_autodisable_counter(chain)
+
+    elif chain in DISABLE_COUNTERS:
+        del DISABLE_COUNTERS[chain]
+
+async def check_autodisable_chain(chain):
+    if not await check_heartbeat_chain(chain):
+        return True
+
+    chain_info = await get_disable_counter(chain)
+
+    if chain_info is None:
+        return False
 
     failures = chain_info["failures"]
 
@@ -1547,13 +2756,13 @@ def check_autodisable_chain(chain):
 
     return True
 
-def check_heartbeat_chain(chain):
+async def check_heartbeat_chain(chain):
     heartbeat_enabled = overlord.config.get_polling_heartbeat() is not None
 
     if not heartbeat_enabled:
         return True
 
-    healthy_chains = overlord.cache.get_healthy_chains()
+    healthy_chains = await overlord.aiocache.get_healthy_chains()
 
     if chain not in healthy_chains:
         return False
@@ -1577,7 +2786,10 @@ def make_app():
         (r"/v1/ping/?", PingHandler),
         (r"/v1/jails/?", JailsHandler),
         (r"/v1/jails/logs/?", JailsLogsHandler),
+        (r"/v1/jails/details/?", JailsDetailsHandler),
+        (r"/v1/batch/?", BatchHandler),
         (r"/v1/stats/?", StatsHandler),
+        (r"/v1/stats/cluster/?", ClusterStatsHandler),
         (r"/v1/jail/log/([^/]+)/([^/]+)/([^/]+)/([^/]+)", JailLogHandler),
         (r"/v1/jail/stats/([a-zA-Z0-9_][a-zA-Z0-9_-]*)", JailStatsHandler),
         (r"/v1/jail/info/([a-zA-Z0-9_][a-zA-Z0-9_-]*)", JailInfoHandler),
@@ -1593,6 +2805,7 @@ def make_app():
         (r"/v1/projects/?", ProjectsHandler),
         (r"/v1/projects/logs/?", ProjectsLogsHandler),
         (r"/v1/projects/log/([0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]_[0-9][0-9]h[0-9][0-9]m[0-9][0-9]s)/([a-zA-Z0-9._-]+)/([a-z-]+\.log)", ProjectsLogHandler),
+        (r"/v1/events/?", EventsHandler),
         (r"/v1/project/info/([a-zA-Z0-9._-]+)", ProjectInfoHandler),
         (r"/v1/project/up/([a-zA-Z0-9._-]+)", ProjectUpHandler),
         (r"/v1/project/down/([a-zA-Z0-9._-]+)", ProjectDownHandler),
@@ -1605,6 +2818,7 @@ def make_app():
         (r"/v1/namespace/?", NamespaceListHandler),
         (r"/v1/labels/?", LabelsHandler),
         (r"/v1/chains/?", ChainsHandler),
+        (r"/v1/chains/tree/?", ChainsTreeHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/ping/?", ChainPingHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/metadata/" + overlord.metadata.REGEX_KEY, ChainMetadataHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/metadata/?", ChainMetadataListHandler),
@@ -1613,9 +2827,13 @@ def make_app():
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/vm/([a-zA-Z0-9][.a-zA-Z0-9_-]{0,229}[a-zA-Z0-9])", ChainVMHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/labels/?", ChainLabelsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/chains/?", ChainChainsHandler),
+        (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/chains/tree/?", ChainChainsTreeHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jails/?", ChainJailsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jails/logs/?", ChainJailsLogsHandler),
+        (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jails/details/?", ChainJailsDetailsHandler),
+        (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/batch/?", ChainBatchHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/stats/?", ChainStatsHandler),
+        (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/stats/cluster/?", ChainClusterStatsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jail/log/([^/]+)/([^/]+)/([^/]+)/([^/]+)", ChainJailLogHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jail/stats/([a-zA-Z0-9_][a-zA-Z0-9_-]*)", ChainJailStatsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/jail/info/([a-zA-Z0-9_][a-zA-Z0-9_-]*)", ChainJailInfoHandler),
@@ -1631,6 +2849,7 @@ def make_app():
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/projects/?", ChainProjectsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/projects/logs/?", ChainProjectsLogsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/projects/log/([0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]_[0-9][0-9]h[0-9][0-9]m[0-9][0-9]s)/([a-zA-Z0-9._-]+)/([a-z-]+\.log)", ChainProjectsLogHandler),
+        (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/events/?", ChainEventsHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/project/info/([a-zA-Z0-9._-]+)", ChainProjectInfoHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/project/up/([a-zA-Z0-9._-]+)", ChainProjectUpHandler),
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/project/down/([a-zA-Z0-9._-]+)", ChainProjectDownHandler),
@@ -1638,27 +2857,28 @@ def make_app():
         (r"/v1/chain/([a-zA-Z0-9_][a-zA-Z0-9._-]*)/project/autoscale/([a-zA-Z0-9._-]+)", ChainProjectAutoScaleHandler)
     ], **settings)
 
-async def listen():
+async def listen(sockets=None):
     app = make_app()
 
     certfile = overlord.config.get_tls_certfile()
     keyfile = overlord.config.get_tls_keyfile()
 
-    if certfile is None and keyfile is None:
-        port = overlord.config.get_port()
+    port = overlord.config.get_port()
 
+    if sockets is None:
         app.listen(port)
 
+    else:
+        server = tornado.httpserver.HTTPServer(app)
+        server.add_sockets(sockets["http"])
+
+    if certfile is None and keyfile is None:
         logger.info("Listening on *:%d", port)
 
     else:
         # For unencrypted connections, but more specifically for poll-autoscale that need
         # to make HTTP requests without involving TLS. Yes, I can change it to use TLS,
         # but it is less overhead in resource usage and configuration.
-        port = overlord.config.get_port()
-
-        app.listen(port)
-
         logger.info("Listening on *:%d (HTTP)", port)
 
         tls_port = overlord.config.get_tls_port()
@@ -1669,16 +2889,18 @@ async def listen():
             keyfile=keyfile
         )
 
-        app.listen(tls_port, ssl_options=tls_ctx)
+        if sockets is None:
+            app.listen(tls_port, ssl_options=tls_ctx)
+
+        else:
+            tls_server = tornado.httpserver.HTTPServer(app, ssl_options=tls_ctx)
+            tls_server.add_sockets(sockets["https"])
 
         logger.info("Listening on *:%d (HTTPS)", tls_port)
 
     await asyncio.Event().wait()
 
-@overlord.commands.cli.command(add_help_option=False)
-def serve():
-    overlord.trap.add(overlord.trap.exit_with_error)
-
+def init_chains():
     for chain in overlord.config.list_chains():
         is_disable = overlord.config.get_chain_disable(chain)
 
@@ -1687,4 +2909,47 @@ def serve():
 
         CHAINS[chain] = overlord.client.get_chain(chain)
 
-    asyncio.run(listen())
+def fork_workers(workers):
+    # Sockets are created before forking so that all workers share them.
+    sockets = {
+        "http" : tornado.netutil.bind_sockets(overlord.config.get_port())
+    }
+
+    if overlord.config.get_tls_certfile() is not None \
+            or overlord.config.get_tls_keyfile() is not None:
+        sockets["https"] = tornado.netutil.bind_sockets(overlord.config.get_tls_port())
+
+    parent = os.getpid()
+
+    def kill_workers(*args, **kwargs):
+        if os.getpid() == parent:
+            overlord.process.kill_child_processes(parent)
+
+    overlord.trap.add(kill_workers)
+    overlord.trap.add(overlord.trap.exit_with_error)
+
+    logger.info("Forking %d workers ...", workers)
+
+    # Only the workers return from this function.
+    tornado.process.fork_processes(workers)
+
+    return sockets
+
+@overlord.commands.cli.command(add_help_option=False)
+def serve():
+    global WORKERS
+
+    WORKERS = overlord.config.get_workers()
+
+    if WORKERS > 1:
+        sockets = fork_workers(WORKERS)
+
+    else:
+        overlord.trap.add(overlord.trap.exit_with_error)
+
+        sockets = None
+
+    # Each worker must have its own connections.
+    init_chains()
+
+    asyncio.run(listen(sockets))
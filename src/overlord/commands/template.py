@@ -144,6 +144,8 @@ async def _print_template(file, mako_directories):
                 access_token,
                 limits=httpx.Limits(**limits_settings),
                 timeout=httpx.Timeout(**timeout_settings),
+                fan_out_concurrency=overlord.spec.get_datacenter_fan_out_concurrency(main_entrypoint),
+                fan_out_timeout=overlord.spec.get_datacenter_fan_out_timeout(main_entrypoint),
                 **kwargs
             )
 
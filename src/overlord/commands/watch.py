@@ -87,11 +87,23 @@ async def _async_watch_commands():
             logger.debug("(job:%d, command:%s, args-length:%d) Executing command with args: %s",
                          job_id, command, len(args), args)
 
-            (rc, stdout, stderr) = overlord.process.run_proc([command] + args)
+            keep_alive = asyncio.create_task(overlord.queue.keep_alive_cmd(job_id))
+
+            try:
+                (rc, stdout, stderr) = await asyncio.to_thread(overlord.process.run_proc, [command] + args)
+
+            finally:
+                keep_alive.cancel()
 
             logger.debug("(job:%d, command:%s, rc:%d) stdout:%s, stderr:%s",
                          job_id, command, rc, stdout, stderr)
 
+            if rc == 0:
+                await overlord.queue.ack_cmd(job_id)
+
+            else:
+                await overlord.queue.nack_cmd(job_id)
+
     except Exception as err:
         error = overlord.util.get_error(err)
         error_type = error.get("type")
@@ -139,6 +151,9 @@ async def _async_watch_projects():
                 "args" : args
             })
 
+            # From now on, the job is the responsibility of watch-commands.
+            await overlord.queue.ack_project(job_id)
+
     except Exception as err:
         error = overlord.util.get_error(err)
         error_type = error.get("type")
@@ -178,6 +193,9 @@ async def _async_watch_vm():
                 "args" : args
             })
 
+            # From now on, the job is the responsibility of watch-commands.
+            await overlord.queue.ack_vm(job_id)
+
     except Exception as err:
         error = overlord.util.get_error(err)
         error_type = error.get("type")
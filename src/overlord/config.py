@@ -55,6 +55,7 @@ def get_config():
     config = {
         "serverid" : get_serverid(),
         "port" : get_port(),
+        "workers" : get_workers(),
         "tls" : {
             "keyfile" : get_tls_keyfile(),
             "certfile" : get_tls_certfile(),
@@ -62,6 +63,7 @@ def get_config():
         },
         "debug" : get_debug(),
         "compress_response" : get_compress_response(),
+        "prerender" : get_prerender(),
         "polling" : {
             "adaptive" : {
                 "poll_window" : get_polling_adaptive_poll_window(),
@@ -77,7 +79,9 @@ def get_config():
             "project_info" : get_polling_project_info(),
             "autoscale" : get_polling_autoscale(),
             "heartbeat" : get_polling_heartbeat(),
+            "events" : get_polling_events(),
             "skew" : get_polling_skew(),
+            "concurrency" : get_polling_concurrency(),
             "keywords" : {
                 "stats" : get_polling_keywords_stats(),
                 "jail" : get_polling_keywords_jail(),
@@ -100,12 +104,17 @@ def get_config():
             "dead_timeout" : get_memcache_dead_timeout(),
             "connect_timeout" : get_memcache_connect_timeout(),
             "timeout" : get_memcache_timeout(),
-            "no_delay" : get_memcache_no_delay()
+            "no_delay" : get_memcache_no_delay(),
+            "health_check_interval" : get_memcache_health_check_interval()
         },
         "secret_key" : get_secret_key(),
         "secret_keyfile" : get_secret_keyfile(),
+        "token_cache_size" : get_token_cache_size(),
         "log_config" : get_log_config(),
         "chains" : {},
+        "stream_chains" : get_stream_chains(),
+        "chain_cache_ttl" : get_chain_cache_ttl(),
+        "chains_tree_ttl" : get_chains_tree_ttl(),
         "labels" : get_labels(),
         "director" : {
             "logs" : get_director_logs()
@@ -115,8 +124,14 @@ def get_config():
             "logs" : get_appjail_logs(),
             "images" : get_appjail_images()
         },
+        "log_follow_timeout" : get_log_follow_timeout(),
         "beanstalkd_addr" : get_beanstalkd_addr(),
         "beanstalkd_secret" : get_beanstalkd_secret(),
+        "beanstalkd_max_pool_size" : get_beanstalkd_max_pool_size(),
+        "beanstalkd_acknowledge" : get_beanstalkd_acknowledge(),
+        "beanstalkd_ttr" : get_beanstalkd_ttr(),
+        "beanstalkd_max_retries" : get_beanstalkd_max_retries(),
+        "beanstalkd_retry_delay" : get_beanstalkd_retry_delay(),
         "execution_time" : get_execution_time(),
         "dataplaneapi" : {
             "entrypoint" : get_dataplaneapi_entrypoint(),
@@ -162,6 +177,7 @@ def get_config():
             "namespaces" : get_namespaces()
         },
         "components" : get_components(),
+        "locks" : get_locks(),
         "autodisable" : {
             "enabled" : get_autodisable_enabled(),
             "failures" : get_autodisable_failures(),
@@ -171,7 +187,8 @@ def get_config():
             "strict" : get_autodisable_strict()
         },
         "max_autoscale_logs" : get_max_autoscale_logs(),
-        "autoscale_logs_expire_time" : get_autoscale_logs_expire_time()
+        "autoscale_logs_expire_time" : get_autoscale_logs_expire_time(),
+        "events_expire_time" : get_events_expire_time()
     }
 
     for host in list_etcd_hosts():
@@ -218,6 +235,9 @@ def get_default(value, default=None):
 def get_autoscale_logs_expire_time():
     return get_default(CONFIG.get("autoscale_logs_expire_time"), overlord.default.AUTOSCALE_LOGS_EXPIRE_TIME)
 
+def get_events_expire_time():
+    return get_default(CONFIG.get("events_expire_time"), overlord.default.EVENTS_EXPIRE_TIME)
+
 def get_max_autoscale_logs():
     return get_default(CONFIG.get("max_autoscale_logs"), overlord.default.MAX_AUTOSCALE_LOGS)
 
@@ -257,6 +277,9 @@ def get_autodisable_strict():
 def get_components():
     return CONFIG.get("components", overlord.default.COMPONENTS)
 
+def get_locks():
+    return CONFIG.get("locks", overlord.default.LOCKS)
+
 def get_serverid():
     return CONFIG.get("serverid", overlord.default.SERVERID)
 
@@ -269,6 +292,21 @@ def get_beanstalkd_addr():
 def get_beanstalkd_secret():
     return get_default(CONFIG.get("beanstalkd_secret"), overlord.default.BEANSTALKD_SECRET)
 
+def get_beanstalkd_max_pool_size():
+    return get_default(CONFIG.get("beanstalkd_max_pool_size"), overlord.default.BEANSTALKD_MAX_POOL_SIZE)
+
+def get_beanstalkd_acknowledge():
+    return get_default(CONFIG.get("beanstalkd_acknowledge"), overlord.default.BEANSTALKD_ACKNOWLEDGE)
+
+def get_beanstalkd_ttr():
+    return get_default(CONFIG.get("beanstalkd_ttr"), overlord.default.BEANSTALKD_TTR)
+
+def get_beanstalkd_max_retries():
+    return get_default(CONFIG.get("beanstalkd_max_retries"), overlord.default.BEANSTALKD_MAX_RETRIES)
+
+def get_beanstalkd_retry_delay():
+    return get_default(CONFIG.get("beanstalkd_retry_delay"), overlord.default.BEANSTALKD_RETRY_DELAY)
+
 def get_director():
     return get_default(CONFIG.get("director"), overlord.default.DIRECTOR)
 
@@ -295,12 +333,23 @@ def get_appjail_images():
 
     return get_default(appjail.get("images"), overlord.default.APPJAIL["images"])
 
+def get_log_follow_timeout():
+    return get_default(CONFIG.get("log_follow_timeout"), overlord.default.LOG_FOLLOW_TIMEOUT)
+
 def get_labels():
     return get_default(CONFIG.get("labels"), overlord.default.LABELS)
 
 def get_port():
     return get_default(CONFIG.get("port"), overlord.default.PORT)
 
+def get_workers():
+    workers = get_default(CONFIG.get("workers"), overlord.default.WORKERS)
+
+    if workers == 0:
+        workers = overlord.default.CPU_COUNT
+
+    return workers
+
 def get_tls():
     return get_default(CONFIG.get("tls"), overlord.default.TLS)
 
@@ -331,6 +380,9 @@ def get_debug():
 def get_compress_response():
     return get_default(CONFIG.get("compress_response"), overlord.default.COMPRESS_RESPONSE)
 
+def get_prerender():
+    return get_default(CONFIG.get("prerender"), overlord.default.PRERENDER)
+
 def get_polling():
     return get_default(CONFIG.get("polling"), overlord.default.POLLING)
 
@@ -399,6 +451,16 @@ def get_polling_heartbeat():
 
     return get_default(polling.get("heartbeat"), overlord.default.POLLING["heartbeat"])
 
+def get_polling_events():
+    polling = get_polling()
+
+    return get_default(polling.get("events"), overlord.default.POLLING["events"])
+
+def get_polling_concurrency():
+    polling = get_polling()
+
+    return get_default(polling.get("concurrency"), overlord.default.POLLING["concurrency"])
+
 def get_polling_skew():
     polling = get_polling()
 
@@ -475,7 +537,7 @@ def get_memcache_max_pool_size():
 def get_memcache_pool_idle_timeout():
     memcache = get_memcache()
 
-    return get_default(memcache.get("pool_idle_timeout"), overlord.default.MEMCACHE["retry_attempts"])
+    return get_default(memcache.get("pool_idle_timeout"), overlord.default.MEMCACHE["pool_idle_timeout"])
 
 def get_memcache_retry_attempts():
     memcache = get_memcache()
@@ -507,9 +569,17 @@ def get_memcache_no_delay():
 
     return get_default(memcache.get("no_delay"), overlord.default.MEMCACHE["no_delay"])
 
+def get_memcache_health_check_interval():
+    memcache = get_memcache()
+
+    return get_default(memcache.get("health_check_interval"), overlord.default.MEMCACHE["health_check_interval"])
+
 def get_secret_key():
     return get_default(CONFIG.get("secret_key"), overlord.default.SECRET_KEY)
 
+def get_token_cache_size():
+    return get_default(CONFIG.get("token_cache_size"), overlord.default.TOKEN_CACHE_SIZE)
+
 def get_secret_keyfile():
     return get_default(CONFIG.get("secret_keyfile"), overlord.default.SECRET_KEYFILE)
 
@@ -525,6 +595,15 @@ def list_chains():
 def get_chain(chain):
     return get_chains().get(chain)
 
+def get_stream_chains():
+    return get_default(CONFIG.get("stream_chains"), overlord.default.STREAM_CHAINS)
+
+def get_chain_cache_ttl():
+    return get_default(CONFIG.get("chain_cache_ttl"), overlord.default.CHAIN_CACHE_TTL)
+
+def get_chains_tree_ttl():
+    return get_default(CONFIG.get("chains_tree_ttl"), overlord.default.CHAINS_TREE_TTL)
+
 def get_chain_entrypoint(chain):
     chain_conf = get_chain(chain)
 
@@ -1069,20 +1148,32 @@ def validate(document):
     keys = (
         "serverid",
         "port",
+        "workers",
         "tls",
         "debug",
         "compress_response",
+        "prerender",
         "polling",
         "memcache",
         "secret_key",
         "secret_keyfile",
+        "token_cache_size",
         "log_config",
         "chains",
+        "stream_chains",
+        "chain_cache_ttl",
+        "chains_tree_ttl",
         "labels",
         "director",
         "appjail",
+        "log_follow_timeout",
         "beanstalkd_addr",
         "beanstalkd_secret",
+        "beanstalkd_max_pool_size",
+        "beanstalkd_acknowledge",
+        "beanstalkd_ttr",
+        "beanstalkd_max_retries",
+        "beanstalkd_retry_delay",
         "execution_time",
         "dataplaneapi",
         "haproxy_stats",
@@ -1091,29 +1182,43 @@ def validate(document):
         "max_watch_commands",
         "metadata",
         "components",
+        "locks",
         "autodisable",
         "max_autoscale_logs",
-        "autoscale_logs_expire_time"
+        "autoscale_logs_expire_time",
+        "events_expire_time"
     )
 
     overlord.error.assert_parameter(_name, document, keys)
 
     validate_serverid(document)
     validate_port(document)
+    validate_workers(document)
     validate_tls(document)
     validate_debug(document)
     validate_compress_response(document)
+    validate_prerender(document)
     validate_polling(document)
     validate_memcache(document)
     validate_secret_key(document)
     validate_secret_keyfile(document)
+    validate_token_cache_size(document)
     validate_log_config(document)
     validate_chains(document)
+    validate_stream_chains(document)
+    validate_chain_cache_ttl(document)
+    validate_chains_tree_ttl(document)
     validate_labels(document)
     validate_director(document)
     validate_appjail(document)
+    validate_log_follow_timeout(document)
     validate_beanstalkd_addr(document)
     validate_beanstalkd_secret(document)
+    validate_beanstalkd_max_pool_size(document)
+    validate_beanstalkd_acknowledge(document)
+    validate_beanstalkd_ttr(document)
+    validate_beanstalkd_max_retries(document)
+    validate_beanstalkd_retry_delay(document)
     validate_execution_time(document)
     validate_dataplaneapi(document)
     validate_haproxy_stats(document)
@@ -1122,13 +1227,18 @@ def validate(document):
     validate_max_watch_commands(document)
     validate_metadata(document)
     validate_components(document)
+    validate_locks(document)
     validate_autodisable(document)
     validate_max_autoscale_logs(document)
     validate_autoscale_logs_expire_time(document)
+    validate_events_expire_time(document)
 
 def validate_autoscale_logs_expire_time(document):
     overlord.error._validate1(document, "", "autoscale_logs_expire_time", int, lambda v: v >= 1, ">= 1")
 
+def validate_events_expire_time(document):
+    overlord.error._validate1(document, "", "events_expire_time", int, lambda v: v >= 1, ">= 1")
+
 def validate_max_autoscale_logs(document):
     overlord.error._validate1(document, "", "max_autoscale_log", int, lambda v: v >= 1, ">= 1")
 
@@ -1175,6 +1285,9 @@ def validate_autodisable_enabled(document):
 def validate_components(document):
     overlord.error._validate1(document, "", "components", str)
 
+def validate_locks(document):
+    overlord.error._validate1(document, "", "locks", str)
+
 def validate_serverid(document):
     overlord.error._validate1(document, "", "serverid", str)
 
@@ -1467,6 +1580,21 @@ def validate_beanstalkd_addr(document):
 def validate_beanstalkd_secret(document):
     overlord.error._validate1(document, "", "beanstalkd_secret", str)
 
+def validate_beanstalkd_max_pool_size(document):
+    overlord.error._validate1(document, "", "beanstalkd_max_pool_size", int, lambda v: v > 0, "> 0")
+
+def validate_beanstalkd_acknowledge(document):
+    overlord.error._validate1(document, "", "beanstalkd_acknowledge", bool)
+
+def validate_beanstalkd_ttr(document):
+    overlord.error._validate1(document, "", "beanstalkd_ttr", int, lambda v: v >= 3, ">= 3")
+
+def validate_beanstalkd_max_retries(document):
+    overlord.error._validate1(document, "", "beanstalkd_max_retries", int, lambda v: v >= 0, ">= 0")
+
+def validate_beanstalkd_retry_delay(document):
+    overlord.error._validate1(document, "", "beanstalkd_retry_delay", int, lambda v: v >= 0, ">= 0")
+
 def validate_director(document):
     keys = (
         "logs"
@@ -1507,9 +1635,15 @@ def validate_appjail_images(document):
 def validate_appjail_logs(document):
     overlord.error._validate1(document, "appjail.", "logs", str)
 
+def validate_log_follow_timeout(document):
+    overlord.error._validate1(document, "", "log_follow_timeout", int, lambda v: v >= 0, ">= 0")
+
 def validate_port(document):
     overlord.error._validate1(document, "", "port", int, lambda v: v > 0 and v < 65536, "> 0 and < 65536")
 
+def validate_workers(document):
+    overlord.error._validate1(document, "", "workers", int, lambda v: v >= 0, ">= 0")
+
 def validate_tls(document):
     keys = (
         "keyfile",
@@ -1543,6 +1677,9 @@ def validate_debug(document):
 def validate_compress_response(document):
     overlord.error._validate1(document, "", "compress_response", bool)
 
+def validate_prerender(document):
+    overlord.error._validate1(document, "", "prerender", bool)
+
 def validate_polling(document):
     keys = (
         "adaptive",
@@ -1554,7 +1691,9 @@ def validate_polling(document):
         "project_info",
         "autoscale",
         "heartbeat",
+        "events",
         "skew",
+        "concurrency",
         "keywords"
     )
 
@@ -1572,7 +1711,9 @@ def validate_polling(document):
     validate_polling_project_info(_value)
     validate_polling_autoscale(_value)
     validate_polling_heartbeat(_value)
+    validate_polling_events(_value)
     validate_polling_skew(_value)
+    validate_polling_concurrency(_value)
     validate_polling_keywords(_value)
 
 def validate_polling_adaptive(document):
@@ -1629,6 +1770,9 @@ def validate_polling_autoscale(document):
 def validate_polling_heartbeat(document):
     overlord.error._validate1(document, "polling.", "heartbeat", int, lambda v: v >= 0, ">= 0")
 
+def validate_polling_events(document):
+    overlord.error._validate1(document, "polling.", "events", int, lambda v: v > 0, "> 0")
+
 def validate_polling_skew(document):
     _prefix = "polling."
     _name = "skew"
@@ -1653,6 +1797,9 @@ def validate_polling_skew(document):
     if begin > end:
         raise overlord.exceptions.InvalidSpec(f"{_prefix}{_name}: '{_prefix}{_name}.<item#0>' is greater than '{_prefix}{_name}.<item#1>'.")
 
+def validate_polling_concurrency(document):
+    overlord.error._validate1(document, "polling.", "concurrency", int, lambda v: v > 0, "> 0")
+
 def validate_polling_keywords(document):
     keys = (
         "jail",
@@ -1733,7 +1880,8 @@ def validate_memcache(document):
         "dead_timeout",
         "connect_timeout",
         "timeout",
-        "no_delay"
+        "no_delay",
+        "health_check_interval"
     )
 
     _value = overlord.error._validate2(document, "", "memcache", keys)
@@ -1750,6 +1898,10 @@ def validate_memcache(document):
     validate_memcache_connect_timeout(_value)
     validate_memcache_timeout(_value)
     validate_memcache_no_delay(_value)
+    validate_memcache_health_check_interval(_value)
+
+def validate_memcache_health_check_interval(document):
+    overlord.error._validate1(document, "memcache.", "health_check_interval", int, lambda v: v >= 0, ">= 0")
 
 def validate_memcache_no_delay(document):
     overlord.error._validate1(document, "memcache.", "no_delay", bool)
@@ -1781,6 +1933,9 @@ def validate_memcache_connections(document):
 def validate_secret_key(document):
     overlord.error._validate1(document, "", "secret_key", str)
 
+def validate_token_cache_size(document):
+    overlord.error._validate1(document, "", "token_cache_size", int, lambda v: v >= 0, ">= 0")
+
 def validate_secret_keyfile(document):
     overlord.error._validate1(document, "", "secret_keyfile", str)
 
@@ -1796,6 +1951,15 @@ def validate_chains(document):
 
     overlord.error.assert_item(_value, validate_chain)
 
+def validate_stream_chains(document):
+    overlord.error._validate1(document, "", "stream_chains", bool)
+
+def validate_chain_cache_ttl(document):
+    overlord.error._validate1(document, "", "chain_cache_ttl", int, lambda v: v >= 0, ">= 0")
+
+def validate_chains_tree_ttl(document):
+    overlord.error._validate1(document, "", "chains_tree_ttl", int, lambda v: v >= 0, ">= 0")
+
 def validate_chain(chains, chain, index):
     overlord.error.assert_type(f"chains.<item#{index}>", chain, str)
     overlord.error.assert_value(f"chains.<item#{index}>",
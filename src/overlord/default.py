@@ -32,9 +32,11 @@ import sys
 
 CONFIG = ".overlord.yml"
 PORT = 8888
+WORKERS = 1
 DEBUG = False
 ENV_FILE = ".env"
 COMPRESS_RESPONSE = True
+PRERENDER = False
 DATABASE = ".overlord.db"
 VALID_KEYWORDS = {
     "jail" : (
@@ -181,7 +183,9 @@ POLLING = {
     "project_info" : 9,
     "autoscale" : 15,
     "heartbeat" : None,
+    "events" : 1,
     "skew" : [6, 10],
+    "concurrency" : 8,
     "keywords" : {
         "jail" : [
             "name",
@@ -284,12 +288,17 @@ MEMCACHE = {
     "connect_timeout" : 5,
     "timeout" : 8,
     "no_delay" : True,
+    "health_check_interval" : 30,
     "id" : None
 }
 LABELS = ["all"]
 SECRET_KEY = None
+TOKEN_CACHE_SIZE = 1024
 LOG_CONFIG = None
 CHAINS = {}
+STREAM_CHAINS = False
+CHAIN_CACHE_TTL = 0
+CHAINS_TREE_TTL = 10
 CHAIN_TIMEOUT = 0
 CHAIN_READ_TIMEOUT = 10
 CHAIN_WRITE_TIMEOUT = 10
@@ -307,6 +316,9 @@ CLIENT_POOL_TIMEOUT = 60
 CLIENT_MAX_CONNECTIONS = 1024
 CLIENT_MAX_KEEPALIVE_CONNECTIONS = 1000
 CLIENT_KEEPALIVE_EXPIRY = 60
+CLIENT_FAN_OUT_CONCURRENCY = 16
+CLIENT_FAN_OUT_TIMEOUT = 60
+CLIENT_ETAG_CACHE_SIZE = 256
 DATAPLANEAPI_TIMEOUT = 0
 DATAPLANEAPI_READ_TIMEOUT = 30
 DATAPLANEAPI_WRITE_TIMEOUT = 30
@@ -323,7 +335,13 @@ APPJAIL = {
     "images" : "/usr/local/appjail/cache/images",
     "jails" : "/usr/local/appjail/jails"
 }
+LOG_FOLLOW_TIMEOUT = 5
 BEANSTALKD_ADDR = ("127.0.0.1", 11300)
+BEANSTALKD_MAX_POOL_SIZE = 4
+BEANSTALKD_ACKNOWLEDGE = True
+BEANSTALKD_TTR = 120
+BEANSTALKD_MAX_RETRIES = 3
+BEANSTALKD_RETRY_DELAY = 10
 EXECUTION_TIME = 60 * 60 * 3
 MAXIMUM_DEPLOYMENTS = 0
 SKYDNS = {
@@ -355,6 +373,7 @@ COMPONENTS = os.path.join(PREFIX, "components")
 SERVERID = os.path.join(PREFIX, "serverid")
 BEANSTALKD_SECRET = os.path.join(PREFIX, "beanstalkd_secret")
 SECRET_KEYFILE = os.path.join(PREFIX, "keyfile")
+LOCKS = os.path.join(PREFIX, "locks")
 METADATA_MAX_SIZE = 2**10 # 1 KiB
 CPU_COUNT = os.cpu_count()
 SCALE = {
@@ -388,3 +407,4 @@ RETRY_POLICY = {
 }
 MAX_AUTOSCALE_LOGS = 30
 AUTOSCALE_LOGS_EXPIRE_TIME = 60 * 10 # 10m
+EVENTS_EXPIRE_TIME = 60 * 5 # 5m
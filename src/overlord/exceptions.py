@@ -33,6 +33,9 @@ class InvalidSpec(Exception):
 class APIError(Exception):
     pass
 
+class ResourceNotFound(APIError):
+    pass
+
 class InvalidEntityType(Exception):
     pass
 
@@ -92,3 +95,6 @@ class InvalidQueue(Exception):
 
 class InvalidNamespaceName(Exception):
     pass
+
+class CacheError(Exception):
+    pass
@@ -27,6 +27,9 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import ctypes
+import ctypes.util
+import errno
 import logging
 import os
 import random
@@ -39,6 +42,15 @@ import overlord.config
 import overlord.process
 import overlord.util
 
+REGEX_RACCT = re.compile(r"([a-z]+)=(-?[0-9]+)")
+
+# Initial size of the buffer used by rctl_get_racct(2). It grows as needed.
+RACCT_BUFSIZ = 4096
+
+# libc handle, or False when it or rctl_get_racct(2) is not available and
+# rctl(8) must be used.
+LIBC = None
+
 logger = logging.getLogger(__name__)
 
 def check_dependency():
@@ -322,11 +334,52 @@ def list_volume(jail, volume):
     return data
 
 def info(jail):
+    keywords = overlord.config.get_polling_keywords_jail()
+
+    if len(keywords) > 1:
+        (rc, data) = get_values(jail, keywords)
+
+        if data is not None:
+            return (rc, data)
+
+        if rc != 0:
+            return (rc, None)
+
+        # Only this jail is affected, e.g. when a value contains a tab or a newline.
+        logger.warning("(jail:%s) keywords cannot be retrieved at once, falling back to getting them one by one ...", jail)
+
+    return _info(jail, keywords)
+
+def get_values(jail, keywords):
+    # All keywords are requested in a single process: without a header, a line
+    # with one tab-separated column per keyword is printed.
+    args = ["appjail", "jail", "get", "-It", "--", jail]
+    args.extend(keywords)
+
+    (rc, value) = _get_value(args)
+
+    if rc != 0:
+        return (rc, None)
+
+    values = value.split("\t")
+
+    if len(values) != len(keywords):
+        logger.debug("(jail:%s, keywords:%d, values:%d) unexpected number of columns",
+                     jail, len(keywords), len(values))
+
+        return (rc, None)
+
     data = {}
 
-    rc = 0
+    for keyword, value in zip(keywords, values):
+        data[keyword] = value
 
-    keywords = overlord.config.get_polling_keywords_jail()
+    return (rc, data)
+
+def _info(jail, keywords):
+    data = {}
+
+    rc = 0
 
     for keyword in keywords:
         (rc, value) = get_value(jail, keyword)
@@ -338,6 +391,23 @@ def info(jail):
 
     return (rc, data)
 
+def get_running():
+    # A single process to know which jails are running, instead of running
+    # `appjail status` for each one.
+    args = ["jls", "-q", "name"]
+
+    (rc, stdout, stderr) = overlord.process.run_proc(args)
+
+    if rc != 0:
+        logger.warning("(rc:%d, args:%s, stderr:1): %s", rc, repr(args), stderr.rstrip())
+
+        return None
+
+    running = set(name.strip() for name in stdout.splitlines())
+    running.discard("")
+
+    return running
+
 def stats(jail):
     rc = 0
     data = {}
@@ -347,31 +417,81 @@ def stats(jail):
     if len(keywords) == 0:
         return (rc, data)
 
-    args = ["rctl", "-u", f"jail:{jail}"]
+    raw = _get_racct(jail)
 
-    (rc, stdout, stderr) = overlord.process.run_proc(args)
-
-    if rc != 0:
-        logger.warning("(rc:%d, stderr:1): %s", rc, stderr.rstrip())
+    if raw is None:
+        args = ["rctl", "-u", f"jail:{jail}"]
 
-        return (rc, None)
+        (rc, raw, stderr) = overlord.process.run_proc(args)
 
-    raw = stdout.splitlines()
+        if rc != 0:
+            logger.warning("(rc:%d, stderr:1): %s", rc, stderr.rstrip())
 
-    for raw_line in raw:
-        (key, value) = raw_line.split("=", 1)
+            return (rc, None)
 
-        key = key.strip()
+    for match in REGEX_RACCT.finditer(raw):
+        (key, value) = match.groups()
 
         if key not in keywords:
             continue
 
-        value = int(value)
-
-        data[key] = value
+        data[key] = int(value)
         
     return (rc, data)
 
+def _get_libc():
+    global LIBC
+
+    if LIBC is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+            rctl_get_racct = libc.rctl_get_racct
+            rctl_get_racct.argtypes = (ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t)
+            rctl_get_racct.restype = ctypes.c_int
+
+            LIBC = libc
+
+        except (OSError, AttributeError) as err:
+            error = overlord.util.get_error(err)
+            error_type = error.get("type")
+            error_message = error.get("message")
+
+            logger.debug("(exception:%s) rctl_get_racct(2) is not available, rctl(8) will be used: %s",
+                         error_type, error_message)
+
+            LIBC = False
+
+    return LIBC
+
+def _get_racct(jail):
+    # Same as `rctl -u jail:<jail>` but without creating a new process. The
+    # output is a comma-separated list of resource=value pairs.
+    libc = _get_libc()
+
+    if not libc:
+        return
+
+    rule = f"jail:{jail}:".encode()
+
+    bufsiz = RACCT_BUFSIZ
+
+    while True:
+        outbuf = ctypes.create_string_buffer(bufsiz)
+
+        if libc.rctl_get_racct(rule, len(rule) + 1, outbuf, bufsiz) == 0:
+            return outbuf.value.decode()
+
+        err = ctypes.get_errno()
+
+        if err == errno.ERANGE:
+            bufsiz *= 4
+            continue
+
+        logger.debug("(jail:%s, errno:%d) rctl_get_racct(2): %s", jail, err, os.strerror(err))
+
+        return
+
 def _get_nros(args):
     (rc, stdout, stderr) = overlord.process.run_proc(args)
 
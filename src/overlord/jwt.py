@@ -27,14 +27,20 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import collections
+import hashlib
 import os
 import secrets
+import time
 
 import jwt
 
 import overlord.config
 
 SECRET_KEY = None
+# Tokens that have already been verified, keyed by their digest. Each value is
+# a tuple of the payload and the time window in which the token is valid.
+TOKENS = collections.OrderedDict()
 
 def get_secret_key():
     global SECRET_KEY
@@ -45,7 +51,9 @@ def get_secret_key():
     secret_key = overlord.config.get_secret_key()
 
     if secret_key is not None:
-        return secret_key
+        SECRET_KEY = secret_key
+
+        return SECRET_KEY
 
     keylen = 64
     secret_keyfile = overlord.config.get_secret_keyfile()
@@ -78,4 +86,47 @@ def encode(payload):
     return jwt.encode(payload, get_secret_key(), algorithm="HS256")
 
 def decode(encoded_jwt):
+    cache_size = overlord.config.get_token_cache_size()
+
+    if cache_size == 0:
+        return _decode(encoded_jwt)
+
+    key = hashlib.sha256(encoded_jwt.encode()).digest()
+
+    cached = TOKENS.get(key)
+
+    if cached is not None:
+        (payload, not_before, expiration) = cached
+
+        now = time.time()
+
+        if now >= not_before and (expiration is None or now < expiration):
+            TOKENS.move_to_end(key)
+
+            return dict(payload)
+
+        # Let PyJWT raise the appropriate exception.
+        del TOKENS[key]
+
+    payload = _decode(encoded_jwt)
+
+    not_before = max(_get_numeric_claim(payload, "nbf", 0), _get_numeric_claim(payload, "iat", 0))
+    expiration = _get_numeric_claim(payload, "exp")
+
+    TOKENS[key] = (payload, not_before, expiration)
+
+    while len(TOKENS) > cache_size:
+        TOKENS.popitem(last=False)
+
+    return dict(payload)
+
+def _decode(encoded_jwt):
     return jwt.decode(encoded_jwt, get_secret_key(), algorithms=["HS256"])
+
+def _get_numeric_claim(payload, claim, default=None):
+    value = payload.get(claim)
+
+    if isinstance(value, (int, float)):
+        return value
+
+    return default
@@ -0,0 +1,117 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import itertools
+import os
+
+# Directory listings remembered by their modification time. Creating, removing or renaming an
+# entry updates the mtime of its directory, so a listing is only read again when it changes.
+INDEX = {}
+
+def listdir(pathname):
+    try:
+        mtime = os.stat(pathname).st_mtime_ns
+
+    except (FileNotFoundError, NotADirectoryError):
+        INDEX.pop(pathname, None)
+
+        return ()
+
+    cached = INDEX.get(pathname)
+
+    if cached is not None:
+        (cached_mtime, entries) = cached
+
+        if cached_mtime == mtime:
+            return entries
+
+    entries = []
+
+    with os.scandir(pathname) as it:
+        for entry in it:
+            entries.append((entry.name, entry.is_dir()))
+
+    entries = tuple(sorted(entries))
+
+    INDEX[pathname] = (mtime, entries)
+
+    return entries
+
+def iter_logs(root, filters):
+    # There is one filter (or None) per level and the last level contains the log files.
+    last = len(filters) - 1
+
+    def walk(pathname, level, prefix):
+        name_filter = filters[level]
+
+        for (name, is_dir) in listdir(pathname):
+            if name_filter is not None and name != name_filter:
+                continue
+
+            if level == last:
+                if not is_dir:
+                    yield prefix + (name,)
+
+            elif is_dir:
+                yield from walk(os.path.join(pathname, name), level + 1, prefix + (name,))
+
+    return walk(root, 0, ())
+
+def list_logs(root, filters, offset=0, limit=None):
+    logs = iter_logs(root, filters)
+
+    if limit is None:
+        return (list(itertools.islice(logs, offset, None)), None)
+
+    page = list(itertools.islice(logs, offset, offset + limit + 1))
+
+    if len(page) > limit:
+        return (page[:limit], offset + limit)
+
+    return (page, None)
+
+def list_projects_logs(logsdir, date=None, service=None, offset=0, limit=None):
+    (page, next_offset) = list_logs(logsdir, (date, service, None), offset, limit)
+
+    logs = {}
+
+    for (date, service, log) in page:
+        logs.setdefault(date, {}).setdefault(service, []).append(log)
+
+    return (logs, next_offset)
+
+def list_jails_logs(logsdir, type=None, entity=None, subtype=None, offset=0, limit=None):
+    (page, next_offset) = list_logs(logsdir, (type, entity, subtype, None), offset, limit)
+
+    logs = {}
+
+    for (type, entity, subtype, log) in page:
+        logs.setdefault(type, {}).setdefault(entity, {}).setdefault(subtype, []).append(log)
+
+    return (logs, next_offset)
@@ -121,7 +121,7 @@ def notexit():
     EXIT = False
 
 def clean(*args, **kwargs):
-    for pid in PROCS:
+    for pid in list(PROCS):
         if psutil.pid_exists(pid):
             os.kill(pid, signal.SIGTERM)
 
@@ -28,29 +28,107 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import asyncio
+import contextlib
 import json
 import logging
+import uuid
 
 import aiostalk
 import greenstalk
 
+import overlord.codec
 import overlord.config
 import overlord.exceptions
 import overlord.util
 
+POOLS = {}
+RESERVERS = {}
+
+# Signed envelope: "<version>:<hexdigest>\n<payload>". The digest is computed
+# over the exact payload bytes, so they can be verified as-is on reception.
+ENVELOPE_VERSION = b"v2"
+ENVELOPE_SEPARATOR = b"\n"
+
 logger = logging.getLogger(__name__)
 
-async def connect():
+async def connect(use=greenstalk.DEFAULT_TUBE, watch=greenstalk.DEFAULT_TUBE):
     addr = overlord.config.get_beanstalkd_addr()
 
     logger.debug("Connecting to '%s'", str(addr))
 
-    client = aiostalk.Client(addr)
+    # Job bodies are handled as raw bytes to avoid decoding and encoding them
+    # again when signing or verifying.
+    client = aiostalk.Client(addr, encoding=None, use=use, watch=watch)
 
     await client.connect()
 
     return client
 
+async def disconnect(client):
+    try:
+        await client.close()
+
+    except Exception as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
+
+        logger.debug("(exception:%s) error closing the connection: %s", error_type, error_message)
+
+@contextlib.asynccontextmanager
+async def acquire(tube):
+    pool = POOLS.setdefault(tube, [])
+
+    if len(pool) > 0:
+        client = pool.pop()
+
+        reused = True
+
+    else:
+        logger.debug("Opening a new connection for tube '%s'", tube)
+
+        client = await connect(use=tube)
+
+        reused = False
+
+    try:
+        yield client
+
+    except BaseException:
+        await disconnect(client)
+
+        if reused:
+            # beanstalkd has probably been restarted, so the remaining idle connections are
+            # in the same state.
+            while len(pool) > 0:
+                await disconnect(pool.pop())
+
+        raise
+
+    if len(pool) < overlord.config.get_beanstalkd_max_pool_size():
+        pool.append(client)
+
+    else:
+        await disconnect(client)
+
+async def get_reserver(tube):
+    client = RESERVERS.get(tube)
+
+    if client is None:
+        logger.debug("Opening a new connection to watch tube '%s'", tube)
+
+        client = await connect(watch=tube)
+
+        RESERVERS[tube] = client
+
+    return client
+
+async def discard_reserver(tube):
+    client = RESERVERS.pop(tube, None)
+
+    if client is not None:
+        await disconnect(client)
+
 async def put(message, tube):
     while True:
         try:
@@ -73,30 +151,20 @@ async def put(message, tube):
             logger.exception("(exception:%s) %s:", error_type, error_message)
 
 async def _put(message, tube):
-    client = await connect()
-
     secret = overlord.util.get_beanstalkd_secret()
 
-    json_message = json.dumps(message)
-
-    digest = overlord.util.hmac_hexdigest(secret, json_message.encode())
-
-    message = {
-        "message" : message,
-        "digest" : digest
-    }
-
-    json_message = json.dumps(message)
+    payload = overlord.codec.encode(message)
 
-    logger.debug("Changing tube to '%s'", tube)
+    digest = overlord.util.hmac_hexdigest(secret, payload)
 
-    await client.use(tube)
+    body = ENVELOPE_VERSION + b":" + digest.encode() + ENVELOPE_SEPARATOR + payload
 
-    logger.debug("Sending %d bytes", len(json_message))
+    ttr = overlord.config.get_beanstalkd_ttr()
 
-    job_id = await client.put(json_message)
+    async with acquire(tube) as client:
+        logger.debug("Sending %d bytes to tube '%s'", len(body), tube)
 
-    await client.close()
+        job_id = await client.put(body, ttr=ttr)
 
     logger.debug("Job ID is '%d'", job_id)
 
@@ -124,40 +192,197 @@ async def reserve(tube):
             logger.exception("(exception:%s) %s:", error_type, error_message)
 
 async def _reserve(tube):
-    client = await connect()
+    client = await get_reserver(tube)
 
-    logger.debug("Watching tube '%s'", tube)
+    acknowledge = overlord.config.get_beanstalkd_acknowledge()
 
-    await client.watch(tube)
+    try:
+        job = await client.reserve()
 
-    job = await client.reserve()
+        # Without acknowledgments, the job is lost if something fails from here.
+        if not acknowledge:
+            await client.delete(job)
+
+    except BaseException:
+        await discard_reserver(tube)
+
+        raise
 
-    await client.delete(job)
-    await client.close()
-    
     job_id = job.id
-    job_body = json.loads(job.body)
 
     logger.debug("Job ID is '%d'", job_id)
 
-    if "digest" not in job_body \
+    try:
+        return _parse_job(job)
+
+    except overlord.exceptions.InvalidQueue:
+        # There is no point in processing it again.
+        if acknowledge:
+            await client.bury(job)
+
+        raise
+
+def _parse_job(job):
+    job_id = job.id
+    job_body = job.body
+
+    if job_body.startswith(b"{"):
+        return _parse_legacy_job(job)
+
+    (header, _, payload) = job_body.partition(ENVELOPE_SEPARATOR)
+    (version, _, expected) = header.partition(b":")
+
+    if version != ENVELOPE_VERSION \
+            or not expected.isalnum() \
+            or not payload:
+        raise overlord.exceptions.InvalidQueue(f"Malformed job body from job '{job_id}'")
+
+    secret = overlord.util.get_beanstalkd_secret()
+
+    if not overlord.util.hmac_validation(secret, payload, expected.decode()):
+        raise overlord.exceptions.InvalidQueue(f"Job body validation failed from job '{job_id}'")
+
+    try:
+        message = overlord.codec.decode(payload)
+
+    except overlord.codec.DecodeError:
+        raise overlord.exceptions.InvalidQueue(f"Malformed job body from job '{job_id}'")
+
+    return (job_id, message)
+
+def _parse_legacy_job(job):
+    # Jobs queued before the signed envelope was introduced: the digest was
+    # computed over the JSON-encoded message, so it must be re-encoded.
+    job_id = job.id
+
+    try:
+        job_body = overlord.codec.decode(job.body)
+
+    except overlord.codec.DecodeError:
+        raise overlord.exceptions.InvalidQueue(f"Malformed job body from job '{job_id}'")
+
+    if not isinstance(job_body, dict) \
+            or "digest" not in job_body \
             or "message" not in job_body:
         raise overlord.exceptions.InvalidQueue(f"Malformed job body from job '{job_id}'")
 
     expected = job_body["digest"]
     message = job_body["message"]
 
+    # The digest was computed over the output of the standard json module.
     json_message = json.dumps(message)
 
     secret = overlord.util.get_beanstalkd_secret()
 
-    digest = overlord.util.hmac_hexdigest(secret, json_message.encode())
-
     if not overlord.util.hmac_validation(secret, json_message.encode(), expected):
-        raise overlord.exceptions.InvalidQueue(f"Job body validation failed from job '{job_id}': {expected} != {digest}")
+        raise overlord.exceptions.InvalidQueue(f"Job body validation failed from job '{job_id}'")
 
     return (job_id, message)
 
+async def ack(tube, job_id):
+    if not overlord.config.get_beanstalkd_acknowledge():
+        return
+
+    client = RESERVERS.get(tube)
+
+    if client is None:
+        # The connection has been lost, so beanstalkd has released the job.
+        logger.warning("(job:%d, tube:%s) cannot delete the job, the connection has been lost", job_id, tube)
+        return
+
+    try:
+        await client.delete(job_id)
+
+    except (greenstalk.Error, ConnectionError, ConnectionRefusedError) as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
+
+        logger.warning("(job:%d, tube:%s, exception:%s) error deleting the job: %s",
+                       job_id, tube, error_type, error_message)
+
+        if not isinstance(err, greenstalk.NotFoundError):
+            await discard_reserver(tube)
+
+async def nack(tube, job_id):
+    if not overlord.config.get_beanstalkd_acknowledge():
+        return
+
+    client = RESERVERS.get(tube)
+
+    if client is None:
+        logger.warning("(job:%d, tube:%s) cannot release the job, the connection has been lost", job_id, tube)
+        return
+
+    try:
+        stats = await client.stats_job(job_id)
+
+        releases = int(stats.get("releases", 0))
+
+        if releases >= overlord.config.get_beanstalkd_max_retries():
+            logger.warning("(job:%d, tube:%s, releases:%d) burying the job", job_id, tube, releases)
+
+            await client.bury(job_id)
+
+        else:
+            delay = overlord.config.get_beanstalkd_retry_delay() * (2 ** releases)
+
+            logger.debug("(job:%d, tube:%s, releases:%d, delay:%d) releasing the job",
+                         job_id, tube, releases, delay)
+
+            await client.release(job_id, delay=delay)
+
+    except (greenstalk.Error, ConnectionError, ConnectionRefusedError) as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
+
+        logger.warning("(job:%d, tube:%s, exception:%s) error releasing the job: %s",
+                       job_id, tube, error_type, error_message)
+
+        if not isinstance(err, greenstalk.NotFoundError):
+            await discard_reserver(tube)
+
+async def touch(tube, job_id):
+    client = RESERVERS.get(tube)
+
+    if client is None:
+        return False
+
+    try:
+        await client.touch(job_id)
+
+    except (greenstalk.Error, ConnectionError, ConnectionRefusedError) as err:
+        error = overlord.util.get_error(err)
+        error_type = error.get("type")
+        error_message = error.get("message")
+
+        logger.warning("(job:%d, tube:%s, exception:%s) error touching the job: %s",
+                       job_id, tube, error_type, error_message)
+
+        if not isinstance(err, greenstalk.NotFoundError):
+            await discard_reserver(tube)
+
+        return False
+
+    return True
+
+async def keep_alive(tube, job_id):
+    if not overlord.config.get_beanstalkd_acknowledge():
+        return
+
+    # Touch the job well before its TTR expires, so that beanstalkd does not hand it out
+    # to another worker while it is still running.
+    interval = max(1, overlord.config.get_beanstalkd_ttr() // 3)
+
+    while True:
+        await asyncio.sleep(interval)
+
+        if not await touch(tube, job_id):
+            return
+
+        logger.debug("(job:%d, tube:%s) job touched", job_id, tube)
+
 async def reserve_project():
     return await reserve("overlord_project")
 
@@ -167,20 +392,50 @@ async def reserve_vm():
 async def reserve_cmd():
     return await reserve("overlord_cmd")
 
+async def ack_project(job_id):
+    return await ack("overlord_project", job_id)
+
+async def ack_vm(job_id):
+    return await ack("overlord_vm", job_id)
+
+async def ack_cmd(job_id):
+    return await ack("overlord_cmd", job_id)
+
+async def nack_project(job_id):
+    return await nack("overlord_project", job_id)
+
+async def nack_vm(job_id):
+    return await nack("overlord_vm", job_id)
+
+async def nack_cmd(job_id):
+    return await nack("overlord_cmd", job_id)
+
+async def keep_alive_cmd(job_id):
+    return await keep_alive("overlord_cmd", job_id)
+
 async def put_cmd(message):
     return await put(message, "overlord_cmd")
 
 async def put_create_project(message):
-    return await put({ "type" : "create", "message" : message }, "overlord_project")
+    return await put(_new_job("create", message), "overlord_project")
 
 async def put_destroy_project(message):
-    return await put({ "type" : "destroy", "message" : message }, "overlord_project")
+    return await put(_new_job("destroy", message), "overlord_project")
 
 async def put_cancel_project(message):
-    return await put({ "type" : "cancel", "message" : message }, "overlord_project")
+    return await put(_new_job("cancel", message), "overlord_project")
 
 async def put_create_vm(message):
-    return await put({ "type" : "create", "message" : message }, "overlord_vm")
+    return await put(_new_job("create", message), "overlord_vm")
 
 async def put_destroy_vm(message):
-    return await put({ "type" : "destroy", "message" : message }, "overlord_vm")
+    return await put(_new_job("destroy", message), "overlord_vm")
+
+def _new_job(type, message):
+    # The job ID assigned by beanstalkd is not unique over time, so create.py uses this one
+    # to recognize a job that it has already processed.
+    return {
+        "type" : type,
+        "message" : message,
+        "unique_id" : uuid.uuid4().hex
+    }
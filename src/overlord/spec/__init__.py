@@ -259,6 +259,22 @@ def get_datacenter_keepalive_expiry(datacenter):
 
     return get_default(datacenter.get("keepalive_expiry"), overlord.default.CLIENT_KEEPALIVE_EXPIRY)
 
+def get_datacenter_fan_out_concurrency(datacenter):
+    datacenter = get_datacenter(datacenter)
+
+    if datacenter is None:
+        return
+
+    return get_default(datacenter.get("fan_out_concurrency"), overlord.default.CLIENT_FAN_OUT_CONCURRENCY)
+
+def get_datacenter_fan_out_timeout(datacenter):
+    datacenter = get_datacenter(datacenter)
+
+    if datacenter is None:
+        return
+
+    return get_default(datacenter.get("fan_out_timeout"), overlord.default.CLIENT_FAN_OUT_TIMEOUT)
+
 def get_datacenter_cacert(datacenter):
     datacenter = get_datacenter(datacenter)
 
@@ -334,6 +350,8 @@ def validate_datacenter(datacenters, datacenter, index):
         "max_keepalive_connections",
         "max_connections",
         "keepalive_expiry",
+        "fan_out_concurrency",
+        "fan_out_timeout",
         "cacert"
     )
 
@@ -352,6 +370,8 @@ def validate_datacenter(datacenters, datacenter, index):
     validate_datacenter_max_keepalive_connections(datacenters, datacenter)
     validate_datacenter_max_connections(datacenters, datacenter)
     validate_datacenter_keepalive_expiry(datacenters, datacenter)
+    validate_datacenter_fan_out_concurrency(datacenters, datacenter)
+    validate_datacenter_fan_out_timeout(datacenters, datacenter)
     validate_datacenter_cacert(datacenters, datacenter)
 
 def validate_datacenter_cacert(datacenters, datacenter):
@@ -398,6 +418,14 @@ def validate_datacenter_keepalive_expiry(datacenters, datacenter):
     document = datacenters[datacenter]
     overlord.error._validate1(document, f"datacenters.{datacenter}.", "keepalive_expiry", int)
 
+def validate_datacenter_fan_out_concurrency(datacenters, datacenter):
+    document = datacenters[datacenter]
+    overlord.error._validate1(document, f"datacenters.{datacenter}.", "fan_out_concurrency", int, lambda v: v > 0, "> 0")
+
+def validate_datacenter_fan_out_timeout(datacenters, datacenter):
+    document = datacenters[datacenter]
+    overlord.error._validate1(document, f"datacenters.{datacenter}.", "fan_out_timeout", int, lambda v: v >= 0, ">= 0")
+
 def validate_deployIn(document):
     keys = (
         "entrypoints",
@@ -27,14 +27,13 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json
 import logging
 import traceback
 
-import tornado.escape
 import tornado.httpclient
 import tornado.web
 
+import overlord.codec
 import overlord.config
 import overlord.jwt
 
@@ -78,9 +77,9 @@ class JSONHandler(tornado.web.RequestHandler):
 
         if body:
             try:
-                json_data = tornado.escape.json_decode(body)
+                json_data = overlord.codec.decode(body)
 
-            except json.decoder.JSONDecodeError:
+            except overlord.codec.DecodeError:
                 self.write_template({
                     "message" : "Request has been received with an invalid format."
                 }, status_code=400)
@@ -210,7 +209,7 @@ class JSONHandler(tornado.web.RequestHandler):
     def write_json(self, chunk, status_code=200):
         self.set_status(status_code)
 
-        self.write(tornado.escape.json_encode(chunk))
+        self.write(overlord.codec.encode(chunk))
 
     def set_default_headers(self):
         self.set_header("Content-Type", "application/json")
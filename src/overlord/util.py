@@ -27,7 +27,10 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import contextlib
+import fcntl
+import hashlib
 import hmac
 import ipaddress
 import logging
@@ -47,6 +50,7 @@ logger = logging.getLogger(__name__)
 
 SERVERID = None
 BEANSTALKD_SECRET = None
+REGEX_ANSI = re.compile(r"(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]")
 
 def get_skew():
     (skew_begin, skew_end) = overlord.config.get_polling_skew()
@@ -55,14 +59,11 @@ def get_skew():
     return skew
 
 def sansi(content):
-    lines = []
+    return "\n".join(sansi_chunk(content).splitlines())
 
-    for line in content.splitlines():
-        line = re.sub(r"(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]", "", line)
-
-        lines.append(line)
-
-    return "\n".join(lines)
+def sansi_chunk(chunk):
+    # Unlike sansi(), line endings are preserved so that consecutive chunks can be joined.
+    return REGEX_ANSI.sub("", chunk)
 
 def get_error(err):
     info = {
@@ -97,6 +98,34 @@ def iface2ip(interface, netaddr):
         else:
             logger.debug("%s not in %s", ip, netaddr)
 
+@contextlib.asynccontextmanager
+async def file_lock(*names, interval=0.05):
+    # An exclusive lock shared by any process on this system that uses the same
+    # names. Non-blocking attempts are made so as not to block the event loop.
+    locks = overlord.config.get_locks()
+
+    os.makedirs(locks, exist_ok=True)
+
+    name = hashlib.sha256("/".join(names).encode()).hexdigest()
+
+    fd = os.open(os.path.join(locks, name), os.O_RDWR | os.O_CREAT, 0o600)
+
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+                break
+
+            except BlockingIOError:
+                await asyncio.sleep(interval)
+
+        yield
+
+    finally:
+        # The lock is released when the file descriptor is closed.
+        os.close(fd)
+
 def hmac_hexdigest(secret_key, message):
     hmac_object = hmac.new(secret_key, message, "sha256")
 
@@ -105,11 +134,9 @@ def hmac_hexdigest(secret_key, message):
     return hexdigest
 
 def hmac_validation(secret_key, message, expected_digest):
-    hmac_object = hmac.new(secret_key, message, "sha256")
-
-    hexdigest = hmac_object.hexdigest()
+    hexdigest = hmac_hexdigest(secret_key, message)
 
-    return hmac.compare_digest(hmac_object.hexdigest(), expected_digest)
+    return hmac.compare_digest(hexdigest, expected_digest)
 
 def get_beanstalkd_secret():
     global BEANSTALKD_SECRET